@@ -0,0 +1,97 @@
+"""Backtest throughput suite: bars/s per case at 10k, 100k and 1M synthetic bars.
+
+Runs the simulation engines, Backtester.run, each strategy's indicators,
+per-bar signals and signal arrays, Portfolio fills and Database CRUD. With
+--baseline, exits with status 1 when any case's rate dropped by more than
+--threshold, after re-measuring such cases (--confirm times) to rule out
+noise. A baseline only compares on the machine that recorded it; the suite
+warns when the baseline's environment differs from this one.
+
+    python benchmarks/backtest_suite.py --output baseline.json
+    python benchmarks/backtest_suite.py --sizes 10k,100k --baseline baseline.json
+    python benchmarks/backtest_suite.py --only 'simulation/.*/vectorized'
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data.candle_store import enable_copy_on_write  # noqa: E402
+from src.trading.benchmark import (  # noqa: E402
+    DATASET_SIZES, DEFAULT_CONFIRM_ATTEMPTS, DEFAULT_MIN_SAMPLE_SECONDS,
+    DEFAULT_REGRESSION_THRESHOLD, confirm_regressions, environment_differences, run_suite,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default=",".join(DATASET_SIZES),
+                        help=f"Comma-separated dataset sizes: {', '.join(DATASET_SIZES)} "
+                             "or a bar count (default: all)")
+    parser.add_argument("--only", default=None, help="Regex selecting cases by key")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Report the median of N samples per case")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SAMPLE_SECONDS,
+                        help="Re-run a case within a sample until it has taken this long")
+    parser.add_argument("--all-sizes", action="store_true",
+                        help="Also run the per-bar cases above 100k bars (slow)")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Compare against this results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed drop in rate before a case fails (fraction)")
+    parser.add_argument("--confirm", type=int, default=DEFAULT_CONFIRM_ATTEMPTS,
+                        help="Re-measure a regressed case up to N times before failing it")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+    enable_copy_on_write()  # as the app does at startup
+
+    def report(key, result):
+        print(f"{key:<55} {result['rate']:>14,.1f} {result['unit']}", file=sys.stderr, flush=True)
+
+    results = run_suite(
+        sizes=[size.strip() for size in args.sizes.split(",") if size.strip()],
+        pattern=args.only,
+        repeat=args.repeat,
+        all_sizes=args.all_sizes,
+        min_seconds=args.min_seconds,
+        progress_callback=report,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    differences = environment_differences(results, baseline)
+    if differences:
+        print(f"Warning: the baseline was recorded in another environment "
+              f"({'; '.join(differences)}); rates may not be comparable", file=sys.stderr)
+    rows = confirm_regressions(results, baseline, args.threshold, attempts=args.confirm,
+                               repeat=max(args.repeat, 3), min_seconds=args.min_seconds,
+                               progress_callback=report)
+    compared = [row for row in rows if row["status"] == "compared"]
+    for row in compared:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(f"{row['case']:<55} {row['baseline']:>14,.1f} -> {row['current']:>14,.1f} "
+              f"{row['change']:+7.1%} {flag}")
+    for row in rows:
+        if row["status"] != "compared":
+            print(f"{row['case']:<55} not compared: {row['status']}")
+    regressed = [row for row in compared if row["regressed"]]
+    if regressed:
+        print(f"{len(regressed)} of {len(compared)} cases regressed by more than "
+              f"{args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
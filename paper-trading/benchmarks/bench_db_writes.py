@@ -0,0 +1,116 @@
+"""Database write throughput: per-call connections vs the pooled WAL layer.
+
+"before" reproduces the original access pattern (a new sqlite3 connection per
+call, default rollback journal and synchronous=FULL); "after" is the current
+ConnectionManager. Each iteration performs the writes of one trading tick
+that opens a position: order insert, fill, position insert, a batch price
+update and a snapshot.
+
+    python benchmarks/bench_db_writes.py --ticks 500
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data.database import Database  # noqa: E402
+from src.data.models import (  # noqa: E402
+    Order, OrderSide, OrderStatus, OrderType, PortfolioSnapshot, Position,
+    PositionStatus,
+)
+
+WRITES_PER_TICK = 5
+
+
+class PerCallConnections:
+    """The original access pattern: connect, execute, commit, close."""
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def write(self):
+        with self._connect() as conn:
+            yield conn
+            conn.commit()
+
+    def read(self):
+        return self._connect()
+
+    def close(self):
+        pass
+
+
+def run_ticks(db: Database, ticks: int) -> float:
+    """Seconds taken by `ticks` ticks' worth of writes."""
+    started = time.perf_counter()
+    for i in range(ticks):
+        now = datetime.now()
+        price = 40000.0 + i
+        order = Order(
+            id=None, symbol="BTC/USDT", side=OrderSide.BUY, order_type=OrderType.MARKET,
+            quantity=0.01, price=price, stop_price=None, status=OrderStatus.PENDING,
+            filled_price=None, filled_at=None, fee=0.0, created_at=now,
+            strategy_name="bench",
+        )
+        order.id = db.insert_order(order)
+        db.update_order_status(order.id, OrderStatus.FILLED, price, now)
+        position = Position(
+            id=None, symbol="BTC/USDT", side=OrderSide.BUY, quantity=0.01,
+            entry_price=price, current_price=price, stop_loss_price=None,
+            take_profit_price=None, unrealized_pnl=0.0, realized_pnl=0.0,
+            status=PositionStatus.OPEN, opened_at=now, closed_at=None,
+            entry_order_id=order.id, exit_order_id=None,
+        )
+        position.id = db.insert_position(position)
+        position.current_price += 1
+        db.update_positions_batch([position])
+        db.insert_snapshot(PortfolioSnapshot(
+            id=None, timestamp=now, cash_balance=9600.0, positions_value=400.0,
+            total_value=10000.0, total_pnl=0.0, total_pnl_pct=0.0,
+        ))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--dir", default=None,
+                        help="Directory for the database files (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        results = {}
+        for label, make_connections in [
+            ("before", PerCallConnections),
+            ("after", None),
+        ]:
+            path = os.path.join(tmp, f"{label}.db")
+            connections = make_connections(path) if make_connections else None
+            db = Database(path, connections)
+            elapsed = run_ticks(db, args.ticks)
+            db.close()
+            results[label] = args.ticks * WRITES_PER_TICK / elapsed
+            print(f"{label:>6}: {results[label]:10.0f} writes/s "
+                  f"({elapsed:.2f}s for {args.ticks} ticks)")
+        print(f"speedup: {results['after'] / results['before']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Engine load test: ticks/s, tick latency and memory over N synthetic pairs.
+
+Drives TradingEngine against a deterministic random-walk exchange with no
+network and no wait between ticks; every tick closes one candle per pair.
+
+    python benchmarks/load_engine.py --pairs 500 --ticks 10000
+    python benchmarks/load_engine.py --pairs 50 --ticks 1000 --json result.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.trading.loadtest import (  # noqa: E402
+    DEFAULT_LOAD_PAIRS, DEFAULT_LOAD_TICKS, run_load_test,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pairs", type=int, default=DEFAULT_LOAD_PAIRS)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_LOAD_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategy", default=None, help="strategy.active (default: config default)")
+    parser.add_argument("--disk", action="store_true",
+                        help="Use a SQLite file in a temp dir instead of :memory:")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="database.write_behind: one background transaction per tick")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Also report the peak of Python allocations (slower)")
+    parser.add_argument("--json", default=None, help="Write the result to this file")
+    parser.add_argument("--log-level", default="ERROR", help="Engine log level (default: ERROR)")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    config = {"database.write_behind": args.write_behind}
+    if args.strategy:
+        config["strategy.active"] = args.strategy
+
+    def progress(done, total):
+        if done % max(1, total // 10) == 0:
+            print(f"  {done}/{total} ticks", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_load_test(
+            pairs=args.pairs, ticks=args.ticks, config=config, seed=args.seed,
+            db_path=os.path.join(tmp, "load.db") if args.disk else ":memory:",
+            trace_memory=args.tracemalloc, progress_callback=progress,
+        )
+
+    latency = result["latency_ms"]
+    print(f"{result['pairs']} pairs, {result['ticks']} ticks in {result['seconds']:.1f}s: "
+          f"{result['ticks_per_sec']:.1f} ticks/s")
+    print(f"tick latency ms: p50 {latency['p50']:.2f}  p95 {latency['p95']:.2f}  "
+          f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    for phase, values in result["phases_ms"].items():
+        print(f"  {phase:<22} p50 {values['p50']:8.3f}  p95 {values['p95']:8.3f}")
+    rss = result["rss_mb"]
+    print(f"RSS MB: before {rss['before']}  after {rss['after']}  peak {rss['peak']}")
+    if result["traced_peak_mb"] is not None:
+        print(f"Python allocations peak: {result['traced_peak_mb']} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from src.utils.config import Config
 from src.utils.logger import setup_logging
+from src.utils.metrics import MetricsRegistry
+from src.data.candle_store import enable_copy_on_write
 from src.data.database import Database
 from src.trading.engine import TradingEngine
 from src.dashboard.app import create_app
@@ -23,17 +25,21 @@ def main():
     dashboard_handler = setup_logging(config)
     logger = logging.getLogger(__name__)
     logger.info("Paper Trading System starting...")
+    # Indicator frames share the candles' buffers instead of copying them
+    enable_copy_on_write()
 
-    # 3. Initialize database
+    # 3. Initialize database; its write times and the engine's tick phases
+    # share one set of histograms (/api/metrics)
+    metrics = MetricsRegistry.from_config(config)
     db_path = config.get("database.path", "data/paper_trading.db")
     if not os.path.isabs(db_path):
         db_path = os.path.join(os.path.dirname(__file__), db_path)
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    db = Database(db_path)
+    db = Database.from_config(db_path, config, metrics=metrics)
     logger.info(f"Database initialized at {db_path}")
 
     # 4. Create and start trading engine
-    engine = TradingEngine(config, db)
+    engine = TradingEngine(config, db, metrics=metrics)
     engine.start()
 
     # 5. Create Flask app
@@ -49,7 +55,11 @@ def main():
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
+        app.config["backtest_jobs"].close()
+        if app.config["stream"] is not None:
+            app.config["stream"].close()
         engine.stop()
+        db.close()
 
 
 if __name__ == "__main__":
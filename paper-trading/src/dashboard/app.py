@@ -1,7 +1,10 @@
 """Flask application factory."""
 
 from flask import Flask
+from ..trading.engine import create_exchange
+from .jobs import BacktestJobQueue
 from .routes import register_routes
+from .stream import DEFAULT_KEEPALIVE_SECONDS, DeltaStream
 
 
 def create_app(engine, dashboard_handler, config):
@@ -22,6 +25,24 @@ def create_app(engine, dashboard_handler, config):
     app.config["dashboard_handler"] = dashboard_handler
     app.config["app_config"] = config
 
+    # Push channel: the engine publishes a delta after every tick
+    stream = None
+    if config.get("dashboard.stream", True):
+        stream = DeltaStream(
+            engine, dashboard_handler,
+            keepalive_seconds=config.get(
+                "dashboard.stream_keepalive_seconds", DEFAULT_KEEPALIVE_SECONDS
+            ),
+        )
+        engine.add_tick_listener(stream.publish)
+    app.config["stream"] = stream
+
+    # Backtests and sweeps run from a bounded queue, recorded in the database,
+    # in child processes with their own exchange instance
+    app.config["backtest_jobs"] = BacktestJobQueue.from_config(
+        engine._db, config, create_exchange
+    )
+
     register_routes(app)
 
     return app
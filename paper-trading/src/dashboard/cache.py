@@ -0,0 +1,92 @@
+"""Versioned response cache for dashboard GET endpoints.
+
+A response is valid for as long as the engine state version it was built at
+is current. Each one carries an ETag derived from that version, so a poll
+with a matching If-None-Match is answered 304 from the version alone, and
+other unchanged requests are served the stored body. Neither touches the
+database or pandas.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, request
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ResponseCache:
+    """LRU of {request path: (version, body, mimetype)} with ETag revalidation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Versions restart with the process; the epoch keeps old ETags from matching
+        self._epoch = uuid.uuid4().hex[:8]
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def etag(self, version) -> str:
+        if isinstance(version, tuple):
+            version = "-".join(str(v) for v in version)
+        return f"{self._epoch}-{version}"
+
+    def versioned(self, get_version):
+        """Decorator: cache the view's 200 responses under `get_version()`.
+
+        With max_entries <= 0 views are left undecorated.
+        """
+        def decorator(view):
+            if self._max_entries <= 0:
+                return view
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Read before building, so a body is never older than its version
+                version = get_version()
+                etag = self.etag(version)
+                if etag in request.if_none_match:
+                    with self._lock:
+                        self.not_modified += 1
+                    return self._finish(Response(status=304), etag)
+
+                key = request.full_path
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[0] == version:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return self._finish(Response(entry[1], mimetype=entry[2]), etag)
+                    self.misses += 1
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                with self._lock:
+                    self._entries[key] = (version, response.get_data(), response.mimetype)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+                return self._finish(response, etag)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _finish(response: Response, etag: str) -> Response:
+        response.set_etag(etag)
+        # Browsers keep the body but revalidate on every poll
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
@@ -0,0 +1,578 @@
+"""Bounded job queue for dashboard backtests and parameter sweeps.
+
+Jobs wait in a FIFO and are taken by a fixed number of worker threads, so
+concurrent requests queue up instead of each starting a thread next to the
+live engine. By default each worker hands its job to a child process of its
+own: the backtest then has its own interpreter (no GIL shared with the tick
+thread) and its own exchange instance (no rate limiter shared with the
+engine's fetches). Progress, log records and the result come back over a
+multiprocessing queue.
+
+Every job is recorded in SQLite: its parameters when submitted, its result
+or error when done. Only queued and running jobs are held in memory, and
+jobs interrupted by a restart are queued again on startup.
+"""
+
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from ..data.candle_store import enable_copy_on_write
+from ..data.database import Database
+from ..data.models import BacktestJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_WORKERS = 1
+DEFAULT_MAX_QUEUED_JOBS = 20
+DEFAULT_JOB_RETENTION_HOURS = 24 * 7
+
+# Where jobs run: "process" gives every worker a child process, "thread"
+# runs jobs on the worker thread itself, inside the dashboard process
+JOB_ISOLATION_MODES = ("process", "thread")
+DEFAULT_JOB_ISOLATION = "process"
+
+# Added to the niceness of job processes (0 = same CPU priority as the engine)
+JOB_PROCESS_NICENESS = 10
+# A cancelled job process gets this long to stop before it is terminated
+CANCEL_GRACE_SECONDS = 5.0
+# Progress is sent from a job process at most this often
+PROGRESS_INTERVAL_SECONDS = 0.25
+_POLL_SECONDS = 0.1
+
+
+class QueueFull(Exception):
+    """Raised by submit() when max_queued jobs are already waiting."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled."""
+
+
+class ActiveJob:
+    """In-memory state of a queued or running job, handed to its runner."""
+
+    def __init__(self, job_id: str, kind: str, params: dict,
+                 cancel_event=None, on_progress: Callable = None):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.status = JobStatus.QUEUED
+        self.progress = 0.0
+        self._cancelled = cancel_event if cancel_event is not None else threading.Event()
+        self._on_progress = on_progress
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def set_progress(self, pct: float):
+        self.progress = round(pct, 1)
+        if self._on_progress is not None:
+            self._on_progress(self.progress)
+
+    def report_progress(self, pct: float):
+        """set_progress(), then stop the job here if it was cancelled."""
+        self.set_progress(pct)
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+
+# ==================== RUNNERS ====================
+# runner(job, config, exchange) -> JSON-serializable result
+
+def run_backtest_job(job: ActiveJob, config, exchange) -> dict:
+    from ..trading.backtester import Backtester, DOWNLOAD_PROGRESS_SHARE, scale_progress
+    from .routes import serialize_backtest_result
+
+    params = job.params
+    backtester = Backtester(config, exchange)
+    # Download progress comes from page threads; only report it there
+    historical_data = backtester.fetch_historical_data(
+        params["symbols"], params["timeframe"], params["days"],
+        progress_callback=scale_progress(job.set_progress, 0, DOWNLOAD_PROGRESS_SHARE),
+    )
+    job.check_cancelled()
+    result = backtester.run(
+        historical_data=historical_data,
+        progress_callback=scale_progress(
+            job.report_progress, DOWNLOAD_PROGRESS_SHARE, 100 - DOWNLOAD_PROGRESS_SHARE
+        ),
+        **params,
+    )
+    return serialize_backtest_result(result)
+
+
+def run_compare_job(job: ActiveJob, config, exchange) -> dict:
+    """Several strategies on one download, in one pass; ranked by total return."""
+    from ..trading.backtester import Backtester, DOWNLOAD_PROGRESS_SHARE, scale_progress
+    from .routes import serialize_backtest_result
+
+    params = job.params
+    backtester = Backtester(config, exchange)
+    historical_data = backtester.fetch_historical_data(
+        params["symbols"], params["timeframe"], params["days"],
+        progress_callback=scale_progress(job.set_progress, 0, DOWNLOAD_PROGRESS_SHARE),
+    )
+    job.check_cancelled()
+    results = backtester.run_fanout(
+        historical_data=historical_data,
+        progress_callback=scale_progress(
+            job.report_progress, DOWNLOAD_PROGRESS_SHARE, 100 - DOWNLOAD_PROGRESS_SHARE
+        ),
+        **params,
+    )
+    leaderboard = sorted(range(len(results)),
+                         key=lambda i: results[i].total_return_pct, reverse=True)
+    return {
+        "results": [serialize_backtest_result(result) for result in results],
+        # Indexes into results, best total return first
+        "leaderboard": leaderboard,
+    }
+
+
+def run_sweep_job(job: ActiveJob, config, exchange) -> dict:
+    from ..trading.backtester import Backtester, DOWNLOAD_PROGRESS_SHARE, scale_progress
+    from ..trading.sweep import expand_param_ranges, resolve_workers, run_sweep
+
+    params = job.params
+    strategy_name = params.get("strategy_name")
+    symbols = params.get("symbols")
+    timeframe = params.get("timeframe")
+    days = params.get("days")
+
+    # Generate combinations
+    combinations = expand_param_ranges(params.get("param_ranges"))
+    total_combos = len(combinations)
+
+    backtester = Backtester(config, exchange)
+    historical_data = backtester.fetch_historical_data(
+        symbols, timeframe, days,
+        progress_callback=scale_progress(job.set_progress, 0, DOWNLOAD_PROGRESS_SHARE),
+    )
+    job.check_cancelled()
+
+    if not historical_data:
+        raise ValueError("No historical data available")
+
+    workers = resolve_workers(config, total_combos)
+    logger.info(f"Sweep started: {total_combos} combinations on {workers} worker(s)")
+
+    results, cache_stats = run_sweep(
+        config=config,
+        strategy_name=strategy_name,
+        symbols=symbols,
+        timeframe=timeframe,
+        days=days,
+        initial_balance=params.get("initial_balance"),
+        stop_loss_pct=params.get("stop_loss_pct"),
+        take_profit_pct=params.get("take_profit_pct"),
+        base_params=params.get("base_params"),
+        combinations=combinations,
+        historical_data=historical_data,
+        workers=workers,
+        progress_callback=scale_progress(
+            job.set_progress, DOWNLOAD_PROGRESS_SHARE, 100 - DOWNLOAD_PROGRESS_SHARE
+        ),
+        should_continue=lambda: not job.cancelled,
+    )
+    job.check_cancelled()
+
+    # Sort results
+    results.sort(key=lambda r: r["total_return_pct"], reverse=True)
+
+    logger.info(
+        f"Sweep complete: {total_combos} combinations tested, "
+        f"indicator cache hits={cache_stats['hits']} misses={cache_stats['misses']}"
+    )
+    if results:
+        logger.info(
+            f"Best: return={results[0]['total_return_pct']:.2f}%, "
+            f"win_rate={results[0]['win_rate']:.1f}%, "
+            f"trades={results[0]['total_trades']}, "
+            f"params={results[0]['params']}"
+        )
+        for i, r in enumerate(results[:5], 1):
+            logger.info(
+                f"  #{i}: return={r['total_return_pct']:.2f}%  "
+                f"win={r['win_rate']:.1f}%  trades={r['total_trades']}  "
+                f"dd={r['max_drawdown_pct']:.2f}%  params={r['params']}"
+            )
+
+    return {
+        "sweep_results": results,
+        "total_combinations": total_combos,
+        "strategy": strategy_name,
+        "symbols": symbols,
+        "timeframe": timeframe,
+        "days": days,
+        "indicator_cache": cache_stats,
+    }
+
+
+JOB_RUNNERS = {
+    "backtest": run_backtest_job,
+    "sweep": run_sweep_job,
+    "compare": run_compare_job,
+}
+
+
+# ==================== JOB PROCESSES ====================
+
+class _EventLogHandler(logging.handlers.QueueHandler):
+    """Sends a job process's log records to the parent as ("log", record)."""
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put(("log", record))
+
+
+class _ProgressSender:
+    """on_progress for jobs in a child process; throttled, 100% always sent."""
+
+    def __init__(self, events):
+        self._events = events
+        self._sent_at = 0.0
+
+    def __call__(self, pct: float):
+        now = time.monotonic()
+        if pct >= 100 or now - self._sent_at >= PROGRESS_INTERVAL_SECONDS:
+            self._sent_at = now
+            self._events.put(("progress", pct))
+
+
+def _job_process_main(config, exchange_factory, runners, tasks, events,
+                      cancel_event, log_level):
+    """Child process: run (id, kind, params) tasks until the None sentinel.
+
+    Each task is answered with progress and log messages, then exactly one
+    of ("completed", result), ("cancelled", None) or ("error", message).
+    """
+    # Ctrl+C reaches the whole process group; the parent decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Below the engine's priority: the tick thread wins a contended core
+    if hasattr(os, "nice"):
+        os.nice(JOB_PROCESS_NICENESS)
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    root.addHandler(_EventLogHandler(events))
+    # A spawned process starts with pandas defaults; match the app
+    enable_copy_on_write()
+
+    exchange = exchange_factory(config) if exchange_factory is not None else None
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        job_id, kind, params = task
+        job = ActiveJob(job_id, kind, params, cancel_event=cancel_event,
+                        on_progress=_ProgressSender(events))
+        try:
+            events.put(("completed", runners[kind](job, config, exchange)))
+        except JobCancelled:
+            events.put(("cancelled", None))
+        except Exception as e:
+            events.put(("error", str(e)))
+
+
+class _JobProcess:
+    """A spawned child process that runs one job at a time for a worker thread.
+
+    Started on its first job and restarted after it dies or is terminated.
+    """
+
+    def __init__(self, name: str, config, exchange_factory, runners: dict):
+        self._name = name
+        self._config = config
+        self._exchange_factory = exchange_factory
+        self._runners = runners
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            # Not a daemon: a sweep starts its own process pool from here
+            ctx = multiprocessing.get_context("spawn")
+            self._tasks = ctx.Queue()
+            self._events = ctx.Queue()
+            self._cancel = ctx.Event()
+            self._process = ctx.Process(
+                target=_job_process_main, name=self._name,
+                args=(self._config, self._exchange_factory, self._runners,
+                      self._tasks, self._events, self._cancel,
+                      logging.getLogger().getEffectiveLevel()),
+            )
+            self._process.start()
+
+    def run(self, job: ActiveJob, closing: Callable[[], bool]) -> Optional[tuple]:
+        """(status, result, error_msg) of the job, or None if the queue closed
+        before it finished."""
+        self._ensure_started()
+        self._cancel.clear()
+        self._tasks.put((job.id, job.kind, job.params))
+        cancel_deadline = None
+        while True:
+            if job.cancelled and cancel_deadline is None:
+                self._cancel.set()
+                cancel_deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+            try:
+                kind, payload = self._events.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if cancel_deadline is not None and time.monotonic() > cancel_deadline:
+                    logger.warning(f"Backtest job {job.id} did not stop; terminating its process")
+                    self.terminate()
+                    return JobStatus.CANCELLED, None, None
+                if not self._process.is_alive():
+                    if closing():
+                        return None
+                    return (JobStatus.ERROR, None,
+                            f"Job process exited unexpectedly (exit code {self._process.exitcode})")
+                continue
+
+            if kind == "log":
+                logging.getLogger(payload.name).handle(payload)
+            elif kind == "progress":
+                job.set_progress(payload)
+            elif kind == "completed":
+                return JobStatus.COMPLETED, payload, None
+            elif kind == "cancelled":
+                return None if closing() else (JobStatus.CANCELLED, None, None)
+            else:
+                return JobStatus.ERROR, None, payload
+
+    def stop(self):
+        """Ask the process to finish: cancel its job and send the sentinel."""
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                return
+            self._cancel.set()
+            self._tasks.put(None)
+
+    def join(self, timeout: float):
+        with self._lock:
+            process = self._process
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                self.terminate()
+
+    def terminate(self):
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                self._process.terminate()
+                self._process.join(1.0)
+
+
+# ==================== QUEUE ====================
+
+class BacktestJobQueue:
+    """FIFO of backtest jobs run by `workers` threads, recorded in `db`.
+
+    exchange_factory(config) builds the exchange jobs download from; in
+    process isolation it is called in each child, so it and the runners
+    must be picklable.
+    """
+
+    def __init__(self, db: Database, config, exchange_factory: Callable = None,
+                 workers: int = DEFAULT_JOB_WORKERS,
+                 max_queued: int = DEFAULT_MAX_QUEUED_JOBS,
+                 retention_hours: float = DEFAULT_JOB_RETENTION_HOURS,
+                 runners: dict = None,
+                 isolation: str = DEFAULT_JOB_ISOLATION):
+        if isolation not in JOB_ISOLATION_MODES:
+            raise ValueError(
+                f"Unknown job isolation: {isolation}. Available: {list(JOB_ISOLATION_MODES)}"
+            )
+        self._db = db
+        self._config = config
+        self._max_queued = max_queued
+        self._retention = timedelta(hours=retention_hours) if retention_hours else None
+        self._runners = runners or JOB_RUNNERS
+
+        self._pending: deque = deque()
+        self._active: dict[str, ActiveJob] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+        for job in db.requeue_unfinished_backtest_jobs():
+            if job.kind in self._runners:
+                self._enqueue(ActiveJob(job.id, job.kind, job.params))
+        if self._pending:
+            logger.info(f"Re-queued {len(self._pending)} backtest job(s) from the last run")
+
+        workers = max(1, workers)
+        if isolation == "process":
+            self._exchange = None
+            self._processes = [
+                _JobProcess(f"backtest-process-{i}", config, exchange_factory, self._runners)
+                for i in range(workers)
+            ]
+        else:
+            self._exchange = exchange_factory(config) if exchange_factory is not None else None
+            self._processes = [None] * workers
+        self._workers = [
+            threading.Thread(target=self._work, args=(process,),
+                             name=f"backtest-worker-{i}", daemon=True)
+            for i, process in enumerate(self._processes)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @classmethod
+    def from_config(cls, db: Database, config, exchange_factory: Callable) -> "BacktestJobQueue":
+        return cls(
+            db, config, exchange_factory,
+            workers=config.get("backtesting.job_workers", DEFAULT_JOB_WORKERS),
+            max_queued=config.get("backtesting.max_queued_jobs", DEFAULT_MAX_QUEUED_JOBS),
+            retention_hours=config.get(
+                "backtesting.job_retention_hours", DEFAULT_JOB_RETENTION_HOURS
+            ),
+            isolation=config.get("backtesting.job_isolation", DEFAULT_JOB_ISOLATION),
+        )
+
+    def submit(self, kind: str, params: dict) -> str:
+        """Queue a job and return its id; raises QueueFull when the queue is full."""
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}. Available: {list(self._runners)}")
+        now = datetime.now()
+        if self._retention is not None:
+            self._db.delete_backtest_jobs_before(now - self._retention)
+
+        job = ActiveJob(str(uuid.uuid4()), kind, params)
+        with self._cond:
+            if len(self._pending) >= self._max_queued:
+                raise QueueFull(f"{len(self._pending)} backtest jobs are already queued")
+            self._db.insert_backtest_job(BacktestJob(
+                id=job.id, kind=kind, status=JobStatus.QUEUED, params=params,
+                created_at=now, started_at=None, finished_at=None,
+                result=None, error_msg=None,
+            ))
+            self._enqueue(job)
+        return job.id
+
+    def _enqueue(self, job: ActiveJob):
+        with self._cond:
+            self._active[job.id] = job
+            self._pending.append(job.id)
+            self._cond.notify()
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Status of a job; queue_position is 1 for the next job to start."""
+        with self._cond:
+            job = self._active.get(job_id)
+            if job is not None:
+                position = (self._pending.index(job_id) + 1
+                            if job.status == JobStatus.QUEUED else 0)
+                return {
+                    "status": job.status.value,
+                    "progress": job.progress,
+                    "queue_position": position,
+                    "result": None,
+                    "error_msg": None,
+                }
+        stored = self._db.get_backtest_job(job_id)
+        if stored is None:
+            return None
+        return {
+            "status": stored.status.value,
+            "progress": 100 if stored.status == JobStatus.COMPLETED else 0,
+            "queue_position": 0,
+            "result": stored.result,
+            "error_msg": stored.error_msg,
+        }
+
+    def recent(self, limit: int = 50) -> list[BacktestJob]:
+        """Most recent jobs first (without results)."""
+        return self._db.get_backtest_jobs(limit=limit)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it is not active."""
+        with self._cond:
+            job = self._active.get(job_id)
+            if job is None:
+                return False
+            job.cancel()
+            if job.status != JobStatus.QUEUED:
+                return True  # the runner stops at its next check
+            self._pending.remove(job_id)
+            del self._active[job_id]
+        self._db.finish_backtest_job(job_id, JobStatus.CANCELLED, datetime.now())
+        return True
+
+    @property
+    def queued_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    @property
+    def running_count(self) -> int:
+        with self._cond:
+            return len(self._active) - len(self._pending)
+
+    def close(self, timeout: float = CANCEL_GRACE_SECONDS):
+        """Stop starting jobs; whatever is still queued or running is queued
+        again on the next start. Job processes are asked to stop and are
+        terminated after `timeout`; jobs on threads are not waited for."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        processes = [p for p in self._processes if p is not None]
+        for process in processes:
+            process.stop()
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+
+    def _work(self, process: Optional[_JobProcess]):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job = self._active[self._pending.popleft()]
+                job.status = JobStatus.RUNNING
+            self._run(job, process)
+
+    def _run(self, job: ActiveJob, process: Optional[_JobProcess]):
+        self._db.start_backtest_job(job.id, datetime.now())
+        if process is None:
+            outcome = self._run_in_thread(job)
+        else:
+            outcome = process.run(job, closing=lambda: self._closed)
+            if outcome is None:
+                return  # left running in the database: queued again on the next start
+        status, result, error_msg = outcome
+        if status == JobStatus.CANCELLED:
+            logger.info(f"Backtest job {job.id} cancelled")
+        elif status == JobStatus.ERROR:
+            logger.error(f"Backtest job {job.id} ({job.kind}) failed: {error_msg}")
+        self._db.finish_backtest_job(job.id, status, datetime.now(),
+                                     result=result, error_msg=error_msg)
+        with self._cond:
+            del self._active[job.id]
+
+    def _run_in_thread(self, job: ActiveJob) -> tuple:
+        try:
+            result = self._runners[job.kind](job, self._config, self._exchange)
+            return JobStatus.COMPLETED, result, None
+        except JobCancelled:
+            return JobStatus.CANCELLED, None, None
+        except Exception as e:
+            return JobStatus.ERROR, None, str(e)
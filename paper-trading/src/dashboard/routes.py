@@ -1,18 +1,18 @@
 """Flask routes — API endpoints and page routes."""
 
 import logging
-import threading
-import uuid
-import time
-import itertools
-from flask import render_template, jsonify, request
+from flask import Response, render_template, jsonify, request
+
+from ..trading.strategy import STRATEGIES
+from ..utils.metrics import PROMETHEUS_CONTENT_TYPE
+from .cache import DEFAULT_MAX_ENTRIES, ResponseCache
+from .jobs import QueueFull
 
 logger = logging.getLogger(__name__)
 
-# Global dictionary to store backtest/sweep tasks
-# Structure: { task_id: { "status": "running"|"completed"|"error", "progress": int, "result": dict, "error_msg": str, "timestamp": float } }
-BACKTEST_TASKS = {}
-MAX_TASK_AGE_SECONDS = 3600  # Clean up tasks older than 1 hour
+# Dashboard equity curve: 7 days at (at least) this many points
+EQUITY_CURVE_HOURS = 24 * 7
+EQUITY_CURVE_POINTS = 500
 
 
 # ==================== SERIALIZATION HELPERS ====================
@@ -85,169 +85,6 @@ def serialize_trade(trade):
     }
 
 
-# ==================== TASK RUNNERS ====================
-
-def cleanup_old_tasks():
-    now = time.time()
-    to_remove = [tid for tid, task in BACKTEST_TASKS.items() if now - task["timestamp"] > MAX_TASK_AGE_SECONDS]
-    for tid in to_remove:
-        if tid in BACKTEST_TASKS:
-            del BACKTEST_TASKS[tid]
-
-
-def run_backtest_task(task_id, config, exchange, kwargs):
-    from ..trading.backtester import Backtester
-    try:
-        backtester = Backtester(config, exchange)
-
-        def progress_cb(pct):
-            if task_id in BACKTEST_TASKS:
-                BACKTEST_TASKS[task_id]["progress"] = round(pct, 1)
-
-        # Inject callback
-        kwargs["progress_callback"] = progress_cb
-
-        result = backtester.run(**kwargs)
-
-        if task_id in BACKTEST_TASKS:
-            BACKTEST_TASKS[task_id]["status"] = "completed"
-            BACKTEST_TASKS[task_id]["progress"] = 100
-            BACKTEST_TASKS[task_id]["result"] = serialize_backtest_result(result)
-    except Exception as e:
-        logger.error(f"Backtest task {task_id} failed: {e}")
-        if task_id in BACKTEST_TASKS:
-            BACKTEST_TASKS[task_id]["status"] = "error"
-            BACKTEST_TASKS[task_id]["error_msg"] = str(e)
-
-
-def run_sweep_task(task_id, config, exchange, kwargs):
-    from ..trading.backtester import Backtester
-
-    try:
-        strategy_name = kwargs.get("strategy_name")
-        symbols = kwargs.get("symbols")
-        timeframe = kwargs.get("timeframe")
-        days = kwargs.get("days")
-        param_ranges = kwargs.get("param_ranges")
-        base_params = kwargs.get("base_params")
-
-        # Generate combinations
-        param_names = list(param_ranges.keys())
-        param_value_lists = []
-        for name in param_names:
-            r = param_ranges[name]
-            min_val = r["min"]
-            max_val = r["max"]
-            step = r["step"]
-            values = []
-            v = min_val
-            while v <= max_val + 1e-9:
-                values.append(round(v, 6))
-                v += step
-            param_value_lists.append(values)
-
-        combinations = list(itertools.product(*param_value_lists))
-        total_combos = len(combinations)
-
-        backtester = Backtester(config, exchange)
-        historical_data = backtester.fetch_historical_data(symbols, timeframe, days)
-
-        if not historical_data:
-            raise ValueError("No historical data available")
-
-        results = []
-        for i, combo in enumerate(combinations):
-            if task_id not in BACKTEST_TASKS:
-                break  # Task deleted?
-
-            # Update progress
-            progress = (i / total_combos) * 100
-            BACKTEST_TASKS[task_id]["progress"] = round(progress, 1)
-
-            # Extract params from combination
-            combo_params = dict(zip(param_names, combo))
-
-            # Helper to check if a param is a risk param (SL/TP) or strategy param
-            # Strategy params go into 'strategy_params', risk params go to arguments
-
-            current_sl = combo_params.get("stop_loss_pct", kwargs.get("stop_loss_pct"))
-            current_tp = combo_params.get("take_profit_pct", kwargs.get("take_profit_pct"))
-
-            # Construct strategy params (exclude SL/TP from here)
-            current_strat_params = base_params.copy()
-            for k, v in combo_params.items():
-                if k not in ["stop_loss_pct", "take_profit_pct"]:
-                    current_strat_params[k] = v
-
-            try:
-                # Run backtest (synchronously, no inner progress for sweep)
-                res = backtester.run(
-                    strategy_name=strategy_name,
-                    strategy_params=current_strat_params,
-                    symbols=symbols,
-                    timeframe=timeframe,
-                    days=days,
-                    initial_balance=kwargs.get("initial_balance"),
-                    stop_loss_pct=current_sl,
-                    take_profit_pct=current_tp,
-                    historical_data=historical_data,
-                    log_results=False,
-                )
-
-                # Merge SL/TP into params for result reporting
-                reported_params = current_strat_params.copy()
-                reported_params["stop_loss_pct"] = current_sl
-                reported_params["take_profit_pct"] = current_tp
-
-                results.append({
-                    "params": reported_params,
-                    "total_return_pct": res.total_return_pct,
-                    "win_rate": res.win_rate,
-                    "max_drawdown_pct": res.max_drawdown_pct,
-                    "total_trades": res.total_trades,
-                    "avg_trade_pnl": res.avg_trade_pnl,
-                    "strategy_name": strategy_name,
-                })
-            except Exception as e:
-                logger.warning(f"Sweep combination {combo_params} failed: {e}")
-
-        # Sort results
-        results.sort(key=lambda r: r["total_return_pct"], reverse=True)
-
-        logger.info(f"Sweep complete: {total_combos} combinations tested")
-        if results:
-            logger.info(
-                f"Best: return={results[0]['total_return_pct']:.2f}%, "
-                f"win_rate={results[0]['win_rate']:.1f}%, "
-                f"trades={results[0]['total_trades']}, "
-                f"params={results[0]['params']}"
-            )
-            for i, r in enumerate(results[:5], 1):
-                logger.info(
-                    f"  #{i}: return={r['total_return_pct']:.2f}%  "
-                    f"win={r['win_rate']:.1f}%  trades={r['total_trades']}  "
-                    f"dd={r['max_drawdown_pct']:.2f}%  params={r['params']}"
-                )
-
-        if task_id in BACKTEST_TASKS:
-            BACKTEST_TASKS[task_id]["status"] = "completed"
-            BACKTEST_TASKS[task_id]["progress"] = 100
-            BACKTEST_TASKS[task_id]["result"] = {
-                "sweep_results": results,
-                "total_combinations": total_combos,
-                "strategy": strategy_name,
-                "symbols": symbols,
-                "timeframe": timeframe,
-                "days": days,
-            }
-
-    except Exception as e:
-        logger.error(f"Sweep task {task_id} failed: {e}")
-        if task_id in BACKTEST_TASKS:
-            BACKTEST_TASKS[task_id]["status"] = "error"
-            BACKTEST_TASKS[task_id]["error_msg"] = str(e)
-
-
 def register_routes(app):
     """Register all routes on the Flask app."""
 
@@ -260,6 +97,16 @@ def register_routes(app):
     def _get_config():
         return app.config["app_config"]
 
+    # Responses that need the database or pandas are served from this cache
+    # until the engine state changes (a tick, a fill or a strategy change)
+    cache = ResponseCache(
+        _get_config().get("dashboard.response_cache_size", DEFAULT_MAX_ENTRIES)
+    )
+    app.config["response_cache"] = cache
+
+    def _state_version():
+        return _get_engine().state_version
+
     # ==================== PAGE ROUTES ====================
 
     @app.route("/")
@@ -268,6 +115,7 @@ def register_routes(app):
         return render_template(
             "index.html",
             polling_interval=config.get("dashboard.polling_interval_ms", 5000),
+            stream_enabled=app.config.get("stream") is not None,
         )
 
     @app.route("/backtest")
@@ -276,6 +124,19 @@ def register_routes(app):
 
     # ==================== API ROUTES ====================
 
+    @app.route("/api/stream")
+    def api_stream():
+        """Server-Sent Events: one "delta" event per engine tick."""
+        stream = app.config.get("stream")
+        if stream is None:
+            return jsonify({"error": "Streaming is disabled"}), 404
+        client = stream.subscribe()  # before returning, so no tick is missed
+        return Response(
+            stream.events(client),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     @app.route("/api/portfolio")
     def api_portfolio():
         engine = _get_engine()
@@ -290,6 +151,7 @@ def register_routes(app):
         return jsonify([serialize_position(p, prices) for p in positions])
 
     @app.route("/api/orders")
+    @cache.versioned(_state_version)
     def api_orders():
         limit = request.args.get("limit", 50, type=int)
         engine = _get_engine()
@@ -297,6 +159,7 @@ def register_routes(app):
         return jsonify([serialize_order(o) for o in orders])
 
     @app.route("/api/trades")
+    @cache.versioned(_state_version)
     def api_trades():
         symbol = request.args.get("symbol")
         limit = request.args.get("limit", 100, type=int)
@@ -310,6 +173,7 @@ def register_routes(app):
         return jsonify(engine.current_prices)
 
     @app.route("/api/chart/<path:symbol>")
+    @cache.versioned(_state_version)
     def api_chart_data(symbol):
         engine = _get_engine()
         df = engine.get_pair_data(symbol)
@@ -331,10 +195,13 @@ def register_routes(app):
         })
 
     @app.route("/api/performance")
+    @cache.versioned(_state_version)
     def api_performance():
         engine = _get_engine()
         stats = engine.portfolio.get_performance_stats()
-        snapshots = engine.portfolio._db.get_snapshots(hours=24 * 7)
+        snapshots = engine.portfolio._db.get_snapshots(
+            hours=EQUITY_CURVE_HOURS, max_points=EQUITY_CURVE_POINTS
+        )
         stats["equity_curve"] = [
             {"timestamp": s.timestamp.isoformat(), "value": s.total_value}
             for s in snapshots
@@ -375,29 +242,29 @@ def register_routes(app):
             "pairs": engine._pairs,
             "timeframe": engine._timeframe,
             "strategy": engine.strategy.name,
+            "ledger_error": engine.ledger_error,
         })
 
+    @app.route("/api/metrics")
+    def api_metrics():
+        """Tick latency histograms: JSON, or ?format=prometheus for a scraper."""
+        metrics = _get_engine().metrics
+        fmt = request.args.get("format", "json")
+        if fmt == "prometheus":
+            return Response(metrics.to_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+        if fmt != "json":
+            return jsonify({
+                "error": f"Unknown format: {fmt}. Available: ['json', 'prometheus']"
+            }), 400
+        return jsonify(metrics.snapshot())
+
     @app.route("/api/backtest", methods=["POST"])
     def api_run_backtest():
         data = request.get_json()
         if not data:
             return jsonify({"error": "Missing request body"}), 400
 
-        engine = _get_engine()
-        config = _get_config()
-
-        # Cleanup old tasks
-        cleanup_old_tasks()
-
-        task_id = str(uuid.uuid4())
-        BACKTEST_TASKS[task_id] = {
-            "status": "running",
-            "progress": 0,
-            "result": None,
-            "timestamp": time.time()
-        }
-
-        kwargs = {
+        params = {
             "strategy_name": data.get("strategy", "ema_sma_crossover"),
             "strategy_params": data.get("params", {}),
             "symbols": data.get("symbols", ["BTC/USDT"]),
@@ -407,41 +274,16 @@ def register_routes(app):
             "stop_loss_pct": data.get("stop_loss_pct"),
             "take_profit_pct": data.get("take_profit_pct"),
         }
-
-        thread = threading.Thread(
-            target=run_backtest_task,
-            args=(task_id, config, engine._exchange, kwargs),
-            daemon=True
-        )
-        thread.start()
-
-        return jsonify({"task_id": task_id, "status": "running"})
+        return _submit_job("backtest", params)
 
     @app.route("/api/backtest/sweep", methods=["POST"])
     def api_run_backtest_sweep():
         """Run backtests across multiple parameter combinations."""
-        # Note: Backtester import is handled inside run_sweep_task for safety,
-        # or we could move it to top level if circular deps allow.
-
         data = request.get_json()
         if not data:
             return jsonify({"error": "Missing request body"}), 400
 
-        engine = _get_engine()
-        config = _get_config()
-
-        # Cleanup old tasks
-        cleanup_old_tasks()
-
-        task_id = str(uuid.uuid4())
-        BACKTEST_TASKS[task_id] = {
-            "status": "running",
-            "progress": 0,
-            "result": None,
-            "timestamp": time.time()
-        }
-
-        kwargs = {
+        params = {
             "strategy_name": data.get("strategy", "ema_sma_crossover"),
             "symbols": data.get("symbols", ["BTC/USDT"]),
             "timeframe": data.get("timeframe", "1h"),
@@ -452,25 +294,89 @@ def register_routes(app):
             "param_ranges": data.get("param_ranges", {}),
             "base_params": data.get("base_params", {}),
         }
+        return _submit_job("sweep", params)
 
-        thread = threading.Thread(
-            target=run_sweep_task,
-            args=(task_id, config, engine._exchange, kwargs),
-            daemon=True
-        )
-        thread.start()
-
-        return jsonify({"task_id": task_id, "status": "running"})
+    @app.route("/api/backtest/compare", methods=["POST"])
+    def api_run_backtest_compare():
+        """Backtest several strategies over the same data in a single pass."""
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Missing request body"}), 400
+        strategies = data.get("strategies")
+        if not strategies:
+            return jsonify({"error": "Missing strategies"}), 400
+        error = _compare_entries_error(strategies)
+        if error:
+            return jsonify({"error": error}), 400
+
+        params = {
+            "runs": [
+                {"strategy_name": s.get("strategy", "ema_sma_crossover"),
+                 "strategy_params": s.get("params", {})}
+                for s in strategies
+            ],
+            "symbols": data.get("symbols", ["BTC/USDT"]),
+            "timeframe": data.get("timeframe", "1h"),
+            "days": data.get("days", 30),
+            "initial_balance": data.get("initial_balance", 10000.0),
+            "stop_loss_pct": data.get("stop_loss_pct"),
+            "take_profit_pct": data.get("take_profit_pct"),
+        }
+        return _submit_job("compare", params)
+
+    def _compare_entries_error(strategies):
+        """Why the compare request's strategies can't be run, or None."""
+        if not isinstance(strategies, list):
+            return "'strategies' must be a list"
+        for i, entry in enumerate(strategies):
+            if not isinstance(entry, dict):
+                return f"strategies[{i}] must be an object"
+            name = entry.get("strategy", "ema_sma_crossover")
+            if name not in STRATEGIES:
+                return (f"strategies[{i}]: Unknown strategy: {name}. "
+                        f"Available: {list(STRATEGIES.keys())}")
+            if not isinstance(entry.get("params", {}), dict):
+                return f"strategies[{i}]: 'params' must be an object"
+        return None
+
+    def _submit_job(kind, params):
+        jobs = app.config["backtest_jobs"]
+        try:
+            task_id = jobs.submit(kind, params)
+        except QueueFull as e:
+            return jsonify({"error": f"Backtest queue is full: {e}"}), 429
+        status = jobs.status(task_id)
+        return jsonify({
+            "task_id": task_id,
+            "status": status["status"],
+            "queue_position": status["queue_position"],
+        })
 
     @app.route("/api/backtest/status/<task_id>")
     def api_backtest_status(task_id):
-        if task_id not in BACKTEST_TASKS:
+        status = app.config["backtest_jobs"].status(task_id)
+        if status is None:
             return jsonify({"error": "Task not found"}), 404
+        return jsonify(status)
 
-        task = BACKTEST_TASKS[task_id]
-        return jsonify({
-            "status": task["status"],
-            "progress": task["progress"],
-            "result": task.get("result"),
-            "error_msg": task.get("error_msg"),
-        })
+    @app.route("/api/backtest/cancel/<task_id>", methods=["POST"])
+    def api_backtest_cancel(task_id):
+        if not app.config["backtest_jobs"].cancel(task_id):
+            return jsonify({"error": "Task not found or already finished"}), 404
+        return jsonify({"status": "ok"})
+
+    @app.route("/api/backtest/jobs")
+    def api_backtest_jobs():
+        limit = request.args.get("limit", 50, type=int)
+        return jsonify([
+            {
+                "task_id": job.id,
+                "kind": job.kind,
+                "status": job.status.value,
+                "strategy": job.params.get("strategy_name"),
+                "created_at": job.created_at.isoformat(),
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+                "error_msg": job.error_msg,
+            }
+            for job in app.config["backtest_jobs"].recent(limit)
+        ])
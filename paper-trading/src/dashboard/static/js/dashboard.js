@@ -1,4 +1,4 @@
-/* Dashboard polling and chart rendering */
+/* Dashboard updates (push stream, polling fallback) and chart rendering */
 
 const STRATEGY_PARAMS = {
     ema_sma_crossover: [
@@ -33,7 +33,194 @@ let currentChartPair = null;
 let chartInitialized = false;
 let equityInitialized = false;
 
-// ==================== POLLING ====================
+// ==================== STATE ====================
+// Full state is fetched once (and on resync); stream deltas are applied to it
+
+const MAX_TRADES = 50;
+const MAX_ORDERS = 30;
+const MAX_LOGS = 50;
+
+const latestPrices = {};
+const positionsById = new Map();
+let tradeRows = [];
+let orderRows = [];
+let logLines = [];
+let equityPoints = [];
+
+// ==================== RENDERING ====================
+
+function renderPortfolio(data) {
+    document.getElementById("total-value").textContent = "$" + data.total_value.toFixed(2);
+    document.getElementById("cash-balance").textContent = "$" + data.cash_balance.toFixed(2);
+
+    const pnlEl = document.getElementById("total-pnl");
+    pnlEl.textContent = "$" + data.total_pnl.toFixed(2);
+    pnlEl.className = "card-value " + (data.total_pnl >= 0 ? "positive" : "negative");
+
+    const pctEl = document.getElementById("total-pnl-pct");
+    pctEl.textContent = data.total_pnl_pct.toFixed(2) + "%";
+    pctEl.className = "card-value " + (data.total_pnl_pct >= 0 ? "positive" : "negative");
+}
+
+function renderPrices() {
+    const ticker = document.getElementById("price-ticker");
+    ticker.innerHTML = "";
+    for (const [symbol, price] of Object.entries(latestPrices)) {
+        ticker.innerHTML += `
+            <div class="ticker-item">
+                <div class="ticker-symbol">${symbol}</div>
+                <div class="ticker-price">$${price.toFixed(2)}</div>
+            </div>`;
+    }
+
+    // Populate chart pair selector if empty
+    const select = document.getElementById("chart-pair-select");
+    if (select.options.length === 0) {
+        for (const symbol of Object.keys(latestPrices)) {
+            const opt = document.createElement("option");
+            opt.value = symbol;
+            opt.textContent = symbol;
+            select.appendChild(opt);
+        }
+        if (!currentChartPair && select.options.length > 0) {
+            currentChartPair = select.options[0].value;
+            updateChart();
+        }
+    }
+}
+
+function renderPositions() {
+    const tbody = document.querySelector("#positions-table tbody");
+    const empty = document.getElementById("no-positions");
+    tbody.innerHTML = "";
+
+    if (positionsById.size === 0) {
+        empty.style.display = "block";
+        return;
+    }
+    empty.style.display = "none";
+
+    for (const p of positionsById.values()) {
+        const pnlClass = p.unrealized_pnl >= 0 ? "positive" : "negative";
+        tbody.innerHTML += `<tr>
+            <td>${p.symbol}</td>
+            <td>${p.side}</td>
+            <td>${p.quantity.toFixed(6)}</td>
+            <td>$${p.entry_price.toFixed(4)}</td>
+            <td>$${p.current_price.toFixed(4)}</td>
+            <td class="${pnlClass}">$${p.unrealized_pnl.toFixed(2)}</td>
+            <td>${p.stop_loss_price ? "$" + p.stop_loss_price.toFixed(4) : "-"}</td>
+            <td>${p.take_profit_price ? "$" + p.take_profit_price.toFixed(4) : "-"}</td>
+            <td>${formatTime(p.opened_at)}</td>
+        </tr>`;
+    }
+}
+
+function renderTrades() {
+    const tbody = document.querySelector("#trades-table tbody");
+    const empty = document.getElementById("no-trades");
+    tbody.innerHTML = "";
+
+    if (tradeRows.length === 0) {
+        empty.style.display = "block";
+        return;
+    }
+    empty.style.display = "none";
+
+    for (const t of tradeRows) {
+        const pnlClass = t.pnl >= 0 ? "positive" : "negative";
+        tbody.innerHTML += `<tr>
+            <td>${t.symbol}</td>
+            <td>${t.side}</td>
+            <td>$${t.entry_price.toFixed(4)}</td>
+            <td>$${t.exit_price.toFixed(4)}</td>
+            <td>${t.quantity.toFixed(6)}</td>
+            <td class="${pnlClass}">$${t.pnl.toFixed(2)}</td>
+            <td class="${pnlClass}">${t.pnl_pct.toFixed(2)}%</td>
+            <td>$${t.fees.toFixed(4)}</td>
+            <td>${t.strategy_name}</td>
+            <td>${formatDuration(t.duration_minutes)}</td>
+        </tr>`;
+    }
+}
+
+function renderOrders() {
+    const tbody = document.querySelector("#orders-table tbody");
+    const empty = document.getElementById("no-orders");
+    tbody.innerHTML = "";
+
+    if (orderRows.length === 0) {
+        empty.style.display = "block";
+        return;
+    }
+    empty.style.display = "none";
+
+    for (const o of orderRows) {
+        const statusClass = o.status === "filled" ? "positive" : o.status === "cancelled" ? "negative" : "";
+        tbody.innerHTML += `<tr>
+            <td>#${o.id}</td>
+            <td>${o.symbol}</td>
+            <td>${o.side}</td>
+            <td>${o.order_type}</td>
+            <td>${o.quantity.toFixed(6)}</td>
+            <td>${o.filled_price ? "$" + o.filled_price.toFixed(4) : (o.price ? "$" + o.price.toFixed(4) : "-")}</td>
+            <td class="${statusClass}">${o.status}</td>
+            <td>$${o.fee.toFixed(4)}</td>
+            <td>${formatTime(o.created_at)}</td>
+        </tr>`;
+    }
+}
+
+function renderMetrics(data) {
+    document.getElementById("metric-total-trades").textContent = data.total_trades;
+    document.getElementById("metric-win-rate").textContent = data.win_rate.toFixed(1) + "%";
+    document.getElementById("metric-avg-pnl").textContent = "$" + data.avg_pnl.toFixed(2);
+    document.getElementById("metric-best-trade").textContent = "$" + data.best_trade.toFixed(2);
+    document.getElementById("metric-worst-trade").textContent = "$" + data.worst_trade.toFixed(2);
+    document.getElementById("metric-total-fees").textContent = "$" + data.total_fees.toFixed(2);
+}
+
+function renderEquity() {
+    if (equityPoints.length === 0) return;
+    const trace = {
+        x: equityPoints.map(p => p.timestamp),
+        y: equityPoints.map(p => p.value),
+        type: "scatter",
+        mode: "lines",
+        line: { color: "#00d4aa", width: 2 },
+        fill: "tozeroy",
+        fillcolor: "rgba(0, 212, 170, 0.1)",
+    };
+    const layout = {
+        ...PLOTLY_LAYOUT,
+        yaxis: { ...PLOTLY_LAYOUT.yaxis, title: "Portfolio Value ($)" },
+    };
+    if (!equityInitialized) {
+        Plotly.newPlot("equity-chart", [trace], layout, { responsive: true });
+        equityInitialized = true;
+    } else {
+        Plotly.react("equity-chart", [trace], layout);
+    }
+}
+
+function renderLogs() {
+    const viewer = document.getElementById("log-viewer");
+    viewer.innerHTML = logLines
+        .map(log => `<div class="log-entry">${escapeHtml(log)}</div>`)
+        .join("");
+    viewer.scrollTop = viewer.scrollHeight;
+}
+
+function renderEngineStatus(data) {
+    const badge = document.getElementById("engine-status");
+    badge.textContent = data.running ? "Running" : "Stopped";
+    badge.className = "status-badge " + (data.running ? "online" : "offline");
+
+    document.getElementById("strategy-name").textContent = data.strategy;
+    document.getElementById("timeframe-badge").textContent = data.timeframe;
+}
+
+// ==================== FULL FETCH ====================
 
 async function fetchJSON(url) {
     const resp = await fetch(url);
@@ -42,17 +229,7 @@ async function fetchJSON(url) {
 
 async function fetchPortfolio() {
     try {
-        const data = await fetchJSON("/api/portfolio");
-        document.getElementById("total-value").textContent = "$" + data.total_value.toFixed(2);
-        document.getElementById("cash-balance").textContent = "$" + data.cash_balance.toFixed(2);
-
-        const pnlEl = document.getElementById("total-pnl");
-        pnlEl.textContent = "$" + data.total_pnl.toFixed(2);
-        pnlEl.className = "card-value " + (data.total_pnl >= 0 ? "positive" : "negative");
-
-        const pctEl = document.getElementById("total-pnl-pct");
-        pctEl.textContent = data.total_pnl_pct.toFixed(2) + "%";
-        pctEl.className = "card-value " + (data.total_pnl_pct >= 0 ? "positive" : "negative");
+        renderPortfolio(await fetchJSON("/api/portfolio"));
     } catch (e) {
         console.error("Portfolio fetch error:", e);
     }
@@ -60,31 +237,8 @@ async function fetchPortfolio() {
 
 async function fetchPrices() {
     try {
-        const data = await fetchJSON("/api/prices");
-        const ticker = document.getElementById("price-ticker");
-        ticker.innerHTML = "";
-        for (const [symbol, price] of Object.entries(data)) {
-            ticker.innerHTML += `
-                <div class="ticker-item">
-                    <div class="ticker-symbol">${symbol}</div>
-                    <div class="ticker-price">$${price.toFixed(2)}</div>
-                </div>`;
-        }
-
-        // Populate chart pair selector if empty
-        const select = document.getElementById("chart-pair-select");
-        if (select.options.length === 0) {
-            for (const symbol of Object.keys(data)) {
-                const opt = document.createElement("option");
-                opt.value = symbol;
-                opt.textContent = symbol;
-                select.appendChild(opt);
-            }
-            if (!currentChartPair && select.options.length > 0) {
-                currentChartPair = select.options[0].value;
-                updateChart();
-            }
-        }
+        Object.assign(latestPrices, await fetchJSON("/api/prices"));
+        renderPrices();
     } catch (e) {
         console.error("Prices fetch error:", e);
     }
@@ -93,30 +247,9 @@ async function fetchPrices() {
 async function fetchPositions() {
     try {
         const data = await fetchJSON("/api/positions");
-        const tbody = document.querySelector("#positions-table tbody");
-        const empty = document.getElementById("no-positions");
-        tbody.innerHTML = "";
-
-        if (data.length === 0) {
-            empty.style.display = "block";
-            return;
-        }
-        empty.style.display = "none";
-
-        for (const p of data) {
-            const pnlClass = p.unrealized_pnl >= 0 ? "positive" : "negative";
-            tbody.innerHTML += `<tr>
-                <td>${p.symbol}</td>
-                <td>${p.side}</td>
-                <td>${p.quantity.toFixed(6)}</td>
-                <td>$${p.entry_price.toFixed(4)}</td>
-                <td>$${p.current_price.toFixed(4)}</td>
-                <td class="${pnlClass}">$${p.unrealized_pnl.toFixed(2)}</td>
-                <td>${p.stop_loss_price ? "$" + p.stop_loss_price.toFixed(4) : "-"}</td>
-                <td>${p.take_profit_price ? "$" + p.take_profit_price.toFixed(4) : "-"}</td>
-                <td>${formatTime(p.opened_at)}</td>
-            </tr>`;
-        }
+        positionsById.clear();
+        for (const p of data) positionsById.set(p.id, p);
+        renderPositions();
     } catch (e) {
         console.error("Positions fetch error:", e);
     }
@@ -124,32 +257,8 @@ async function fetchPositions() {
 
 async function fetchTrades() {
     try {
-        const data = await fetchJSON("/api/trades?limit=50");
-        const tbody = document.querySelector("#trades-table tbody");
-        const empty = document.getElementById("no-trades");
-        tbody.innerHTML = "";
-
-        if (data.length === 0) {
-            empty.style.display = "block";
-            return;
-        }
-        empty.style.display = "none";
-
-        for (const t of data) {
-            const pnlClass = t.pnl >= 0 ? "positive" : "negative";
-            tbody.innerHTML += `<tr>
-                <td>${t.symbol}</td>
-                <td>${t.side}</td>
-                <td>$${t.entry_price.toFixed(4)}</td>
-                <td>$${t.exit_price.toFixed(4)}</td>
-                <td>${t.quantity.toFixed(6)}</td>
-                <td class="${pnlClass}">$${t.pnl.toFixed(2)}</td>
-                <td class="${pnlClass}">${t.pnl_pct.toFixed(2)}%</td>
-                <td>$${t.fees.toFixed(4)}</td>
-                <td>${t.strategy_name}</td>
-                <td>${formatDuration(t.duration_minutes)}</td>
-            </tr>`;
-        }
+        tradeRows = await fetchJSON("/api/trades?limit=" + MAX_TRADES);
+        renderTrades();
     } catch (e) {
         console.error("Trades fetch error:", e);
     }
@@ -157,31 +266,8 @@ async function fetchTrades() {
 
 async function fetchOrders() {
     try {
-        const data = await fetchJSON("/api/orders?limit=30");
-        const tbody = document.querySelector("#orders-table tbody");
-        const empty = document.getElementById("no-orders");
-        tbody.innerHTML = "";
-
-        if (data.length === 0) {
-            empty.style.display = "block";
-            return;
-        }
-        empty.style.display = "none";
-
-        for (const o of data) {
-            const statusClass = o.status === "filled" ? "positive" : o.status === "cancelled" ? "negative" : "";
-            tbody.innerHTML += `<tr>
-                <td>#${o.id}</td>
-                <td>${o.symbol}</td>
-                <td>${o.side}</td>
-                <td>${o.order_type}</td>
-                <td>${o.quantity.toFixed(6)}</td>
-                <td>${o.filled_price ? "$" + o.filled_price.toFixed(4) : (o.price ? "$" + o.price.toFixed(4) : "-")}</td>
-                <td class="${statusClass}">${o.status}</td>
-                <td>$${o.fee.toFixed(4)}</td>
-                <td>${formatTime(o.created_at)}</td>
-            </tr>`;
-        }
+        orderRows = await fetchJSON("/api/orders?limit=" + MAX_ORDERS);
+        renderOrders();
     } catch (e) {
         console.error("Orders fetch error:", e);
     }
@@ -190,35 +276,9 @@ async function fetchOrders() {
 async function fetchPerformance() {
     try {
         const data = await fetchJSON("/api/performance");
-        document.getElementById("metric-total-trades").textContent = data.total_trades;
-        document.getElementById("metric-win-rate").textContent = data.win_rate.toFixed(1) + "%";
-        document.getElementById("metric-avg-pnl").textContent = "$" + data.avg_pnl.toFixed(2);
-        document.getElementById("metric-best-trade").textContent = "$" + data.best_trade.toFixed(2);
-        document.getElementById("metric-worst-trade").textContent = "$" + data.worst_trade.toFixed(2);
-        document.getElementById("metric-total-fees").textContent = "$" + data.total_fees.toFixed(2);
-
-        // Equity curve
-        if (data.equity_curve && data.equity_curve.length > 0) {
-            const trace = {
-                x: data.equity_curve.map(p => p.timestamp),
-                y: data.equity_curve.map(p => p.value),
-                type: "scatter",
-                mode: "lines",
-                line: { color: "#00d4aa", width: 2 },
-                fill: "tozeroy",
-                fillcolor: "rgba(0, 212, 170, 0.1)",
-            };
-            const layout = {
-                ...PLOTLY_LAYOUT,
-                yaxis: { ...PLOTLY_LAYOUT.yaxis, title: "Portfolio Value ($)" },
-            };
-            if (!equityInitialized) {
-                Plotly.newPlot("equity-chart", [trace], layout, { responsive: true });
-                equityInitialized = true;
-            } else {
-                Plotly.react("equity-chart", [trace], layout);
-            }
-        }
+        renderMetrics(data);
+        equityPoints = data.equity_curve || [];
+        renderEquity();
     } catch (e) {
         console.error("Performance fetch error:", e);
     }
@@ -226,12 +286,9 @@ async function fetchPerformance() {
 
 async function fetchLogs() {
     try {
-        const data = await fetchJSON("/api/logs?count=50");
-        const viewer = document.getElementById("log-viewer");
-        viewer.innerHTML = data.logs
-            .map(log => `<div class="log-entry">${escapeHtml(log)}</div>`)
-            .join("");
-        viewer.scrollTop = viewer.scrollHeight;
+        const data = await fetchJSON("/api/logs?count=" + MAX_LOGS);
+        logLines = data.logs;
+        renderLogs();
     } catch (e) {
         console.error("Logs fetch error:", e);
     }
@@ -239,18 +296,52 @@ async function fetchLogs() {
 
 async function fetchEngineStatus() {
     try {
-        const data = await fetchJSON("/api/engine/status");
-        const badge = document.getElementById("engine-status");
-        badge.textContent = data.running ? "Running" : "Stopped";
-        badge.className = "status-badge " + (data.running ? "online" : "offline");
-
-        document.getElementById("strategy-name").textContent = data.strategy;
-        document.getElementById("timeframe-badge").textContent = data.timeframe;
+        renderEngineStatus(await fetchJSON("/api/engine/status"));
     } catch (e) {
         console.error("Engine status fetch error:", e);
     }
 }
 
+// ==================== PUSH UPDATES ====================
+
+function applyDelta(delta) {
+    renderPortfolio(delta.portfolio);
+    renderEngineStatus(delta.engine);
+
+    if (delta.prices) {
+        Object.assign(latestPrices, delta.prices);
+        renderPrices();
+    }
+    if (delta.positions) {
+        for (const id of delta.positions.closed) positionsById.delete(id);
+        for (const p of delta.positions.changed) positionsById.set(p.id, p);
+        renderPositions();
+    }
+    if (delta.trades) {
+        tradeRows = delta.trades.slice().reverse().concat(tradeRows).slice(0, MAX_TRADES);
+        renderTrades();
+    }
+    if (delta.orders) {
+        const byId = new Map(orderRows.map(o => [o.id, o]));
+        for (const o of delta.orders) byId.set(o.id, o);
+        orderRows = [...byId.values()].sort((a, b) => b.id - a.id).slice(0, MAX_ORDERS);
+        renderOrders();
+    }
+    if (delta.performance) {
+        renderMetrics(delta.performance);
+    }
+    equityPoints.push(delta.equity);
+    renderEquity();
+    if (delta.logs) {
+        logLines = logLines.concat(delta.logs).slice(-MAX_LOGS);
+        renderLogs();
+    }
+    // New candles only arrive with a full tick
+    if (delta.kind === "tick" && currentChartPair) {
+        updateChart();
+    }
+}
+
 // ==================== CHART ====================
 
 async function updateChart() {
@@ -413,10 +504,46 @@ async function pollAll() {
     }
 }
 
+let pollTimer = null;
+
+function startPolling() {
+    if (pollTimer === null) {
+        pollTimer = setInterval(pollAll, POLLING_INTERVAL);
+    }
+}
+
+function stopPolling() {
+    if (pollTimer !== null) {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+}
+
+// Push updates over Server-Sent Events; poll while the stream is down
+function connectStream() {
+    const source = new EventSource("/api/stream");
+    source.addEventListener("open", () => {
+        stopPolling();
+        pollAll();  // full state; deltas from here on
+    });
+    source.addEventListener("delta", (e) => applyDelta(JSON.parse(e.data)));
+    source.addEventListener("resync", () => pollAll());
+    source.addEventListener("error", () => {
+        startPolling();
+        // EventSource reconnects by itself unless the server refused the stream
+        if (source.readyState === EventSource.CLOSED) {
+            setTimeout(connectStream, POLLING_INTERVAL);
+        }
+    });
+}
+
 // Initial load
 loadCurrentStrategy();
 updateStrategyParams("ema_sma_crossover");
-pollAll();
 
-// Start polling
-setInterval(pollAll, POLLING_INTERVAL);
+if (STREAM_ENABLED && typeof EventSource !== "undefined") {
+    connectStream();  // loads the full state once connected
+} else {
+    pollAll();
+    startPolling();
+}
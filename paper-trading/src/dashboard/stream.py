@@ -0,0 +1,161 @@
+"""Server-Sent Events push channel for the dashboard.
+
+The engine calls DeltaStream.publish() at the end of every tick. The delta
+against the previous tick (changed prices and positions, new orders, trades
+and log lines) is built and encoded once and put on each connected client's
+queue, so the work per tick, and the database load, does not grow with the
+number of open dashboards. Clients load the full state once through the
+regular API endpoints and then apply deltas.
+"""
+
+import json
+import queue
+import threading
+from datetime import datetime
+
+from .routes import serialize_order, serialize_position, serialize_trade
+
+DEFAULT_KEEPALIVE_SECONDS = 15
+# Messages buffered per client; a client that falls this far behind is
+# told to resync instead of being sent the backlog
+CLIENT_QUEUE_SIZE = 64
+RECONNECT_MS = 3000
+MAX_LOG_LINES = 50
+
+
+def encode_event(event: str, data: dict, event_id: int = None) -> str:
+    """One SSE message; json.dumps keeps the payload on a single data line."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+RESYNC_MESSAGE = encode_event("resync", {})
+
+
+class DeltaStream:
+    """Publishes per-tick deltas of the engine state to SSE clients."""
+
+    def __init__(self, engine, dashboard_handler=None,
+                 keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS):
+        self._engine = engine
+        self._handler = dashboard_handler
+        self._keepalive = keepalive_seconds
+        self._clients: set[queue.Queue] = set()
+        self._clients_lock = threading.Lock()
+
+        # Last published state, to diff the next tick against
+        self._seq = 0
+        self._prices: dict[str, float] = {}
+        self._positions: dict[int, dict] = {}
+        self._log_cursor = dashboard_handler.cursor if dashboard_handler else 0
+
+    @property
+    def client_count(self) -> int:
+        with self._clients_lock:
+            return len(self._clients)
+
+    # --- Publishing (engine thread) ---
+
+    def publish(self, kind: str = "tick"):
+        """Build the delta since the last publish and send it to every client."""
+        delta = self.build_delta(kind)
+        message = encode_event("delta", delta, delta["seq"])
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            self._offer(client, message)
+
+    def build_delta(self, kind: str) -> dict:
+        engine = self._engine
+        portfolio = engine.portfolio
+        prices = engine.current_prices
+        orders, trades = portfolio.drain_activity()
+        positions = {
+            p.id: serialize_position(p, prices) for p in portfolio.get_all_positions()
+        }
+
+        self._seq += 1
+        summary = portfolio.get_portfolio_summary(prices)
+        delta = {
+            "seq": self._seq,
+            "kind": kind,
+            "portfolio": summary,
+            "equity": {"timestamp": datetime.now().isoformat(), "value": summary["total_value"]},
+            "engine": {
+                "running": engine.is_running,
+                "strategy": engine.strategy.name,
+                "timeframe": engine._timeframe,
+            },
+        }
+
+        changed_prices = {s: p for s, p in prices.items() if self._prices.get(s) != p}
+        if changed_prices:
+            delta["prices"] = changed_prices
+        changed = [p for pid, p in positions.items() if self._positions.get(pid) != p]
+        closed = [pid for pid in self._positions if pid not in positions]
+        if changed or closed:
+            delta["positions"] = {"changed": changed, "closed": closed}
+        if orders:
+            delta["orders"] = [serialize_order(o) for o in orders]
+        if trades:
+            delta["trades"] = [serialize_trade(t) for t in trades]
+            # Aggregates only move on a closed trade: one query per such tick
+            delta["performance"] = portfolio.get_performance_stats()
+        if self._handler is not None:
+            logs, self._log_cursor = self._handler.get_records_since(
+                self._log_cursor, MAX_LOG_LINES
+            )
+            if logs:
+                delta["logs"] = logs
+
+        self._prices = prices
+        self._positions = positions
+        return delta
+
+    @staticmethod
+    def _offer(client: queue.Queue, message, overflow=RESYNC_MESSAGE):
+        try:
+            client.put_nowait(message)
+        except queue.Full:
+            # Drop the backlog; the client reloads the full state instead
+            while True:
+                try:
+                    client.get_nowait()
+                except queue.Empty:
+                    break
+            client.put_nowait(overflow)
+
+    # --- Clients (request threads) ---
+
+    def subscribe(self) -> queue.Queue:
+        client = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        with self._clients_lock:
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client: queue.Queue):
+        with self._clients_lock:
+            self._clients.discard(client)
+
+    def events(self, client: queue.Queue):
+        """SSE body for one subscribed client; unsubscribes when the client goes away."""
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+            while True:
+                try:
+                    message = client.get(timeout=self._keepalive)
+                except queue.Empty:
+                    message = ": keepalive\n\n"  # comment line, detects dead connections
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(client)
+
+    def close(self):
+        """End every open stream."""
+        with self._clients_lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for client in clients:
+            self._offer(client, None, overflow=None)
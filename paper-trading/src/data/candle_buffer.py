@@ -0,0 +1,84 @@
+"""Fixed-capacity OHLCV ring buffer for the live engine.
+
+Candles are stored column-major like CandleStore (timestamp, open, high, low,
+close, volume as float64 rows). Every value is written twice, at slot i and
+i + capacity, so the newest `capacity` candles are always one contiguous
+slice and view() never has to copy or reorder.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .candle_store import OHLCV_COLUMNS
+
+
+class CandleBuffer:
+    """The most recent `capacity` candles of one pair."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("CandleBuffer capacity must be at least 1")
+        self._capacity = capacity
+        self._data = np.full((len(OHLCV_COLUMNS), 2 * capacity), np.nan)
+        self._start = 0
+        self._len = 0
+        # Bumped on every change, so readers can cache what they derive
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if self._len == 0:
+            return None
+        return int(self._data[0, self._start + self._len - 1])
+
+    def update(self, candles) -> int:
+        """Merge ccxt-style [ts, o, h, l, c, v] rows, oldest first.
+
+        A row with the newest stored timestamp overwrites that (still forming)
+        candle in place; older rows are ignored. Returns how many candles were
+        appended.
+        """
+        appended = 0
+        changed = False
+        for row in candles:
+            last = self.last_timestamp
+            ts = row[0]
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                self._write(self._len - 1, row)
+            elif self._len < self._capacity:
+                self._len += 1
+                self._write(self._len - 1, row)
+                appended += 1
+            else:
+                self._start = (self._start + 1) % self._capacity
+                self._write(self._len - 1, row)
+                appended += 1
+            changed = True
+        if changed:
+            self.version += 1
+        return appended
+
+    def _write(self, position: int, row):
+        slot = (self._start + position) % self._capacity
+        self._data[:, slot] = row
+        self._data[:, slot + self._capacity] = row
+
+    def view(self) -> np.ndarray:
+        """Read-only (6, len) view of the stored candles, oldest first."""
+        view = self._data[:, self._start:self._start + self._len]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one OHLCV column."""
+        return self.view()[OHLCV_COLUMNS.index(name)]
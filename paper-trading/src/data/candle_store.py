@@ -0,0 +1,125 @@
+"""On-disk OHLCV store for backtests.
+
+Candles are kept per exchange/symbol/timeframe as a column-major float64 .npy
+file (one row per column: timestamp, open, high, low, close, volume), so
+range queries memory-map the file and slice by timestamp. A JSON sidecar
+remembers the earliest timestamp ever requested, so a pair's listing date
+is not re-fetched on every run.
+"""
+
+import json
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def enable_copy_on_write():
+    """Turn on pandas copy-on-write, which pandas >= 3 always uses.
+
+    A process-wide pandas option, so it is set once by each entry point (the
+    app, job and sweep worker processes, the benchmark suite) rather than on
+    import. Candle frames and the indicator frames built on them then share
+    buffers; without it (pandas 2 only), pd.concat copies them instead.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def ohlcv_frame(candles: np.ndarray, copy: bool = True) -> pd.DataFrame:
+    """DataFrame of a (6, N) candle array: datetime64[ms] timestamps plus one
+    float64 block holding open..volume.
+
+    copy=False wraps candles[1:] as that block without copying it (if it is
+    already row-major float64), for arrays the caller hands over. Copy-on-write
+    (pandas >= 3, or pandas 2 after enable_copy_on_write()) keeps writes to
+    frames derived from it from reaching the array.
+    """
+    # Row-major, so every column of the block is a contiguous array
+    prices = np.array(candles[1:], dtype=np.float64, order="C") if copy else \
+        np.ascontiguousarray(candles[1:], dtype=np.float64)
+    df = pd.DataFrame(prices.T, columns=OHLCV_COLUMNS[1:], copy=False)
+    df.insert(0, "timestamp", candles[0].astype(np.int64).view("datetime64[ms]"))
+    return df
+
+
+def merge_candles(existing: Optional[np.ndarray], new: np.ndarray) -> np.ndarray:
+    """Merge two (6, N) candle arrays by timestamp; `new` wins on duplicates."""
+    if existing is None or existing.shape[1] == 0:
+        combined = new
+    else:
+        combined = np.concatenate([existing, new], axis=1)
+    order = np.argsort(combined[0], kind="stable")
+    combined = combined[:, order]
+    timestamps = combined[0]
+    keep = np.append(timestamps[1:] != timestamps[:-1], True)
+    return np.ascontiguousarray(combined[:, keep])
+
+
+class CandleStore:
+    """Local candle cache rooted at a directory."""
+
+    def __init__(self, root_dir: str):
+        self._root_dir = root_dir
+        self._lock = threading.Lock()
+
+    def _base_path(self, exchange_id: str, symbol: str, timeframe: str) -> str:
+        safe_symbol = symbol.replace("/", "-").replace(":", "_")
+        return os.path.join(self._root_dir, exchange_id, safe_symbol, timeframe)
+
+    def load(self, exchange_id: str, symbol: str, timeframe: str,
+             mmap: bool = False) -> Optional[np.ndarray]:
+        """All stored candles as a (6, N) array, or None if nothing is stored."""
+        path = self._base_path(exchange_id, symbol, timeframe) + ".npy"
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r" if mmap else None)
+
+    def get_range(self, exchange_id: str, symbol: str, timeframe: str,
+                  since_ms: int, until_ms: int) -> Optional[np.ndarray]:
+        """Stored candles with since_ms <= timestamp < until_ms, as a (6, N) array."""
+        candles = self.load(exchange_id, symbol, timeframe, mmap=True)
+        if candles is None:
+            return None
+        start, stop = np.searchsorted(candles[0], [since_ms, until_ms], side="left")
+        return np.array(candles[:, start:stop])
+
+    def coverage(self, exchange_id: str, symbol: str,
+                 timeframe: str) -> Optional[tuple[int, int, int]]:
+        """(earliest requested, first stored, last stored) timestamps in ms."""
+        candles = self.load(exchange_id, symbol, timeframe, mmap=True)
+        if candles is None or candles.shape[1] == 0:
+            return None
+        first, last = int(candles[0, 0]), int(candles[0, -1])
+        meta = self._read_meta(exchange_id, symbol, timeframe)
+        return min(meta.get("earliest_requested", first), first), first, last
+
+    def write(self, exchange_id: str, symbol: str, timeframe: str,
+              candles: np.ndarray, earliest_requested: Optional[int] = None):
+        """Merge (6, N) candles into the store."""
+        base = self._base_path(exchange_id, symbol, timeframe)
+        with self._lock:
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            merged = merge_candles(self.load(exchange_id, symbol, timeframe), candles)
+            tmp = base + ".tmp.npy"
+            np.save(tmp, merged)
+            os.replace(tmp, base + ".npy")
+
+            if earliest_requested is not None:
+                meta = self._read_meta(exchange_id, symbol, timeframe)
+                previous = meta.get("earliest_requested")
+                if previous is None or earliest_requested < previous:
+                    meta["earliest_requested"] = int(earliest_requested)
+                    with open(base + ".json", "w") as f:
+                        json.dump(meta, f)
+
+    def _read_meta(self, exchange_id: str, symbol: str, timeframe: str) -> dict:
+        path = self._base_path(exchange_id, symbol, timeframe) + ".json"
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
@@ -0,0 +1,145 @@
+"""SQLite connection management for Database.
+
+One long-lived writer connection serializes all writes; a small pool of
+reader connections serves dashboard threads. The file is opened in WAL mode,
+so readers see the last committed state without waiting for the writer, and
+commits append to the log instead of rewriting pages with a full fsync each.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from ..utils.metrics import MetricsRegistry
+
+DEFAULT_READ_POOL_SIZE = 4
+# NORMAL is durable against application crashes in WAL mode; only a power
+# loss can drop the most recent commits (the database stays consistent)
+DEFAULT_SYNCHRONOUS = "NORMAL"
+DEFAULT_CACHE_SIZE_KB = 8192
+BUSY_TIMEOUT_MS = 5000
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class ConnectionManager:
+    """Writer connection plus a bounded pool of reader connections.
+
+    ":memory:" databases exist per connection, so there one shared
+    connection serves both reads and writes.
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+                 synchronous: str = DEFAULT_SYNCHRONOUS,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+                 metrics: Optional[MetricsRegistry] = None):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode: {synchronous}. "
+                             f"Available: {list(SYNCHRONOUS_MODES)}")
+        self._db_path = db_path
+        self._synchronous = synchronous
+        self._cache_size_kb = cache_size_kb
+        self._memory = db_path == ":memory:"
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.describe("db_write_seconds",
+                             "Duration of database write transactions, commit included")
+
+        # Reentrant so a caller can group several writes into one transaction
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._commits = 0
+        self._writer = self._connect()
+        if not self._memory:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+
+        self._read_pool_size = max(1, read_pool_size)
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False,
+                               timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{int(self._cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @property
+    def journal_mode(self) -> str:
+        with self.read() as conn:
+            return conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    @property
+    def commit_count(self) -> int:
+        """Write transactions committed so far; changes whenever readers can see new data."""
+        return self._commits
+
+    @contextmanager
+    def write(self):
+        """The writer connection, inside a transaction.
+
+        Commits when the outermost write() block exits and rolls back if it
+        raises, so nested blocks share one commit.
+        """
+        with self._write_lock:
+            self._write_depth += 1
+            start = time.perf_counter()
+            try:
+                yield self._writer
+            except BaseException:
+                if self._write_depth == 1:
+                    self._writer.rollback()
+                raise
+            else:
+                if self._write_depth == 1:
+                    self._writer.commit()
+                    self._commits += 1
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0 and self._metrics is not None:
+                    self._metrics.observe("db_write_seconds", time.perf_counter() - start)
+
+    @contextmanager
+    def read(self):
+        """A pooled reader connection (blocks while all of them are in use)."""
+        if self._memory:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            # End any implicit read transaction so the WAL can be checkpointed
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self._read_pool_size:
+                self._reader_count += 1
+                return self._connect()
+        return self._readers.get()
+
+    def close(self):
+        """Close every connection; the manager cannot be used afterwards."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
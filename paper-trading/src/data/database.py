@@ -1,41 +1,76 @@
 """SQLite database layer for persisting trades, positions, and portfolio history."""
 
-import sqlite3
-import threading
-from contextlib import contextmanager
+import json
 from datetime import datetime, timedelta
 from typing import Optional
 
+from .connection import (
+    ConnectionManager, DEFAULT_CACHE_SIZE_KB, DEFAULT_READ_POOL_SIZE, DEFAULT_SYNCHRONOUS,
+)
 from .models import (
-    Order, Position, PortfolioSnapshot, TradeRecord,
-    OrderSide, OrderType, OrderStatus, PositionStatus,
+    BacktestJob, Order, Position, PortfolioSnapshot, TradeRecord,
+    JobStatus, OrderSide, OrderType, OrderStatus, PositionStatus,
 )
+from ..utils.metrics import MetricsRegistry
+
+# Snapshot rollups: OHLC of total_value per bucket, maintained as raw
+# snapshots are inserted. Tiers are listed finest first.
+SNAPSHOT_TIERS = {"15m": 900, "1h": 3600, "1d": 86400}
+# Days each tier is kept ("raw" = portfolio_snapshots); 0 keeps it forever
+DEFAULT_SNAPSHOT_RETENTION_DAYS = {"raw": 7, "15m": 90, "1h": 730, "1d": 0}
+SNAPSHOT_PRUNE_INTERVAL = timedelta(hours=1)
+
+
+def bucket_start(timestamp: datetime, seconds: int) -> datetime:
+    """Start of the `seconds`-long bucket (aligned to midnight) holding timestamp."""
+    midnight = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    elapsed = (timestamp - midnight).total_seconds()
+    return midnight + timedelta(seconds=elapsed // seconds * seconds)
 
 
 class Database:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, connections: Optional[ConnectionManager] = None,
+                 snapshot_retention_days: Optional[dict] = None):
         self._db_path = db_path
-        self._write_lock = threading.Lock()
-        self._memory_conn = None
-        if db_path == ":memory:":
-            self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
-            self._memory_conn.row_factory = sqlite3.Row
+        self._connections = connections or ConnectionManager(db_path)
+        self._snapshot_retention = {
+            **DEFAULT_SNAPSHOT_RETENTION_DAYS, **(snapshot_retention_days or {})
+        }
+        self._last_prune: Optional[datetime] = None
         self._init_tables()
+        self._backfill_rollups()
+
+    @classmethod
+    def from_config(cls, db_path: str, config,
+                    metrics: Optional[MetricsRegistry] = None) -> "Database":
+        """Database with connection settings from the `database.*` config keys.
+
+        With `metrics`, write transaction times go to its db_write_seconds.
+        """
+        connections = ConnectionManager(
+            db_path,
+            read_pool_size=config.get("database.read_pool_size", DEFAULT_READ_POOL_SIZE),
+            synchronous=config.get("database.synchronous", DEFAULT_SYNCHRONOUS),
+            cache_size_kb=config.get("database.cache_size_kb", DEFAULT_CACHE_SIZE_KB),
+            metrics=metrics,
+        )
+        return cls(db_path, connections,
+                   snapshot_retention_days=config.get("database.snapshot_retention_days"))
+
+    def transaction(self):
+        """Group the writes made inside this block into a single commit."""
+        return self._connections.write()
 
-    @contextmanager
-    def _get_connection(self):
-        if self._memory_conn:
-            yield self._memory_conn
-        else:
-            conn = sqlite3.connect(self._db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            try:
-                yield conn
-            finally:
-                conn.close()
+    @property
+    def version(self) -> int:
+        """Bumped after every commit: reads made after seeing a version are at least that new."""
+        return self._connections.commit_count
+
+    def close(self):
+        self._connections.close()
 
     def _init_tables(self):
-        with self._get_connection() as conn:
+        with self._connections.write() as conn:
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS orders (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -97,6 +132,33 @@ class Database:
                     duration_minutes INTEGER NOT NULL
                 );
 
+                CREATE TABLE IF NOT EXISTS snapshot_rollups (
+                    tier TEXT NOT NULL,
+                    bucket_start TEXT NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    cash_balance REAL NOT NULL,
+                    positions_value REAL NOT NULL,
+                    total_pnl REAL NOT NULL,
+                    total_pnl_pct REAL NOT NULL,
+                    samples INTEGER NOT NULL,
+                    PRIMARY KEY (tier, bucket_start)
+                );
+
+                CREATE TABLE IF NOT EXISTS backtest_jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    result TEXT,
+                    error_msg TEXT
+                );
+
                 CREATE INDEX IF NOT EXISTS idx_orders_symbol_status ON orders(symbol, status);
                 CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status);
                 CREATE INDEX IF NOT EXISTS idx_snapshots_timestamp ON portfolio_snapshots(timestamp);
@@ -106,44 +168,40 @@ class Database:
     # --- Order operations ---
 
     def insert_order(self, order: Order) -> int:
-        with self._write_lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """INSERT INTO orders
-                       (symbol, side, order_type, quantity, price, stop_price,
-                        status, filled_price, filled_at, fee, created_at, strategy_name)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        order.symbol, order.side.value, order.order_type.value,
-                        order.quantity, order.price, order.stop_price,
-                        order.status.value,
-                        order.filled_price,
-                        order.filled_at.isoformat() if order.filled_at else None,
-                        order.fee,
-                        order.created_at.isoformat(),
-                        order.strategy_name,
-                    ),
-                )
-                conn.commit()
-                return cursor.lastrowid
+        with self._connections.write() as conn:
+            cursor = conn.execute(
+                """INSERT INTO orders
+                   (id, symbol, side, order_type, quantity, price, stop_price,
+                    status, filled_price, filled_at, fee, created_at, strategy_name)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    order.id, order.symbol, order.side.value, order.order_type.value,
+                    order.quantity, order.price, order.stop_price,
+                    order.status.value,
+                    order.filled_price,
+                    order.filled_at.isoformat() if order.filled_at else None,
+                    order.fee,
+                    order.created_at.isoformat(),
+                    order.strategy_name,
+                ),
+            )
+            return cursor.lastrowid
 
     def update_order_status(self, order_id: int, status: OrderStatus,
                             filled_price: float = None, filled_at: datetime = None):
-        with self._write_lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """UPDATE orders SET status=?, filled_price=?, filled_at=?
-                       WHERE id=?""",
-                    (
-                        status.value, filled_price,
-                        filled_at.isoformat() if filled_at else None,
-                        order_id,
-                    ),
-                )
-                conn.commit()
+        with self._connections.write() as conn:
+            conn.execute(
+                """UPDATE orders SET status=?, filled_price=?, filled_at=?
+                   WHERE id=?""",
+                (
+                    status.value, filled_price,
+                    filled_at.isoformat() if filled_at else None,
+                    order_id,
+                ),
+            )
 
     def get_pending_orders(self, symbol: str = None) -> list[Order]:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             if symbol:
                 rows = conn.execute(
                     "SELECT * FROM orders WHERE status='pending' AND symbol=? ORDER BY created_at",
@@ -156,7 +214,7 @@ class Database:
         return [self._row_to_order(r) for r in rows]
 
     def get_orders(self, symbol: str = None, limit: int = 100) -> list[Order]:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             if symbol:
                 rows = conn.execute(
                     "SELECT * FROM orders WHERE symbol=? ORDER BY created_at DESC LIMIT ?",
@@ -172,73 +230,67 @@ class Database:
     # --- Position operations ---
 
     def insert_position(self, position: Position) -> int:
-        with self._write_lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """INSERT INTO positions
-                       (symbol, side, quantity, entry_price, current_price,
-                        stop_loss_price, take_profit_price, unrealized_pnl,
-                        realized_pnl, status, opened_at, closed_at,
-                        entry_order_id, exit_order_id)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        position.symbol, position.side.value, position.quantity,
-                        position.entry_price, position.current_price,
-                        position.stop_loss_price, position.take_profit_price,
-                        position.unrealized_pnl, position.realized_pnl,
-                        position.status.value, position.opened_at.isoformat(),
-                        position.closed_at.isoformat() if position.closed_at else None,
-                        position.entry_order_id, position.exit_order_id,
-                    ),
-                )
-                conn.commit()
-                return cursor.lastrowid
+        with self._connections.write() as conn:
+            cursor = conn.execute(
+                """INSERT INTO positions
+                   (id, symbol, side, quantity, entry_price, current_price,
+                    stop_loss_price, take_profit_price, unrealized_pnl,
+                    realized_pnl, status, opened_at, closed_at,
+                    entry_order_id, exit_order_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    position.id, position.symbol, position.side.value, position.quantity,
+                    position.entry_price, position.current_price,
+                    position.stop_loss_price, position.take_profit_price,
+                    position.unrealized_pnl, position.realized_pnl,
+                    position.status.value, position.opened_at.isoformat(),
+                    position.closed_at.isoformat() if position.closed_at else None,
+                    position.entry_order_id, position.exit_order_id,
+                ),
+            )
+            return cursor.lastrowid
 
     def update_position(self, position: Position):
-        with self._write_lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """UPDATE positions SET
-                       current_price=?, stop_loss_price=?, take_profit_price=?,
-                       unrealized_pnl=?, realized_pnl=?, status=?, closed_at=?,
-                       exit_order_id=?
-                       WHERE id=?""",
-                    (
-                        position.current_price, position.stop_loss_price,
-                        position.take_profit_price, position.unrealized_pnl,
-                        position.realized_pnl, position.status.value,
-                        position.closed_at.isoformat() if position.closed_at else None,
-                        position.exit_order_id, position.id,
-                    ),
-                )
-                conn.commit()
+        with self._connections.write() as conn:
+            conn.execute(
+                """UPDATE positions SET
+                   current_price=?, stop_loss_price=?, take_profit_price=?,
+                   unrealized_pnl=?, realized_pnl=?, status=?, closed_at=?,
+                   exit_order_id=?
+                   WHERE id=?""",
+                (
+                    position.current_price, position.stop_loss_price,
+                    position.take_profit_price, position.unrealized_pnl,
+                    position.realized_pnl, position.status.value,
+                    position.closed_at.isoformat() if position.closed_at else None,
+                    position.exit_order_id, position.id,
+                ),
+            )
 
     def update_positions_batch(self, positions: list[Position]):
         if not positions:
             return
-        with self._write_lock:
-            with self._get_connection() as conn:
-                conn.executemany(
-                    """UPDATE positions SET
-                       current_price=?, stop_loss_price=?, take_profit_price=?,
-                       unrealized_pnl=?, realized_pnl=?, status=?, closed_at=?,
-                       exit_order_id=?
-                       WHERE id=?""",
-                    [
-                        (
-                            p.current_price, p.stop_loss_price,
-                            p.take_profit_price, p.unrealized_pnl,
-                            p.realized_pnl, p.status.value,
-                            p.closed_at.isoformat() if p.closed_at else None,
-                            p.exit_order_id, p.id,
-                        )
-                        for p in positions
-                    ],
-                )
-                conn.commit()
+        with self._connections.write() as conn:
+            conn.executemany(
+                """UPDATE positions SET
+                   current_price=?, stop_loss_price=?, take_profit_price=?,
+                   unrealized_pnl=?, realized_pnl=?, status=?, closed_at=?,
+                   exit_order_id=?
+                   WHERE id=?""",
+                [
+                    (
+                        p.current_price, p.stop_loss_price,
+                        p.take_profit_price, p.unrealized_pnl,
+                        p.realized_pnl, p.status.value,
+                        p.closed_at.isoformat() if p.closed_at else None,
+                        p.exit_order_id, p.id,
+                    )
+                    for p in positions
+                ],
+            )
 
     def get_open_positions(self) -> list[Position]:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM positions WHERE status='open' ORDER BY opened_at"
             ).fetchall()
@@ -246,46 +298,153 @@ class Database:
 
     def close_position(self, position_id: int, exit_price: float,
                        exit_order_id: int, realized_pnl: float):
-        with self._write_lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """UPDATE positions SET status='closed', current_price=?,
-                       closed_at=?, exit_order_id=?, realized_pnl=?, unrealized_pnl=0
-                       WHERE id=?""",
-                    (exit_price, datetime.now().isoformat(), exit_order_id,
-                     realized_pnl, position_id),
-                )
-                conn.commit()
+        with self._connections.write() as conn:
+            conn.execute(
+                """UPDATE positions SET status='closed', current_price=?,
+                   closed_at=?, exit_order_id=?, realized_pnl=?, unrealized_pnl=0
+                   WHERE id=?""",
+                (exit_price, datetime.now().isoformat(), exit_order_id,
+                 realized_pnl, position_id),
+            )
 
     # --- Portfolio snapshots ---
 
     def insert_snapshot(self, snapshot: PortfolioSnapshot):
-        with self._write_lock:
-            with self._get_connection() as conn:
+        """Insert a raw snapshot and fold it into every rollup tier."""
+        with self._connections.write() as conn:
+            conn.execute(
+                """INSERT INTO portfolio_snapshots
+                   (timestamp, cash_balance, positions_value, total_value,
+                    total_pnl, total_pnl_pct)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    snapshot.timestamp.isoformat(),
+                    snapshot.cash_balance, snapshot.positions_value,
+                    snapshot.total_value, snapshot.total_pnl, snapshot.total_pnl_pct,
+                ),
+            )
+            self._roll_up(conn, [snapshot])
+            self._maybe_prune_snapshots(conn, snapshot.timestamp)
+
+    @staticmethod
+    def _roll_up(conn, snapshots: list[PortfolioSnapshot]):
+        """Merge snapshots (oldest first) into their rollup buckets."""
+        conn.executemany(
+            """INSERT INTO snapshot_rollups
+               (tier, bucket_start, open, high, low, close, cash_balance,
+                positions_value, total_pnl, total_pnl_pct, samples)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+               ON CONFLICT (tier, bucket_start) DO UPDATE SET
+                   high = MAX(high, excluded.high),
+                   low = MIN(low, excluded.low),
+                   close = excluded.close,
+                   cash_balance = excluded.cash_balance,
+                   positions_value = excluded.positions_value,
+                   total_pnl = excluded.total_pnl,
+                   total_pnl_pct = excluded.total_pnl_pct,
+                   samples = samples + 1""",
+            [
+                (
+                    tier, bucket_start(s.timestamp, seconds).isoformat(),
+                    s.total_value, s.total_value, s.total_value, s.total_value,
+                    s.cash_balance, s.positions_value, s.total_pnl, s.total_pnl_pct,
+                )
+                for s in snapshots
+                for tier, seconds in SNAPSHOT_TIERS.items()
+            ],
+        )
+
+    def _maybe_prune_snapshots(self, conn, now: datetime):
+        """Apply snapshot retention, at most once per SNAPSHOT_PRUNE_INTERVAL."""
+        if self._last_prune is not None and now - self._last_prune < SNAPSHOT_PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        raw_days = self._snapshot_retention["raw"]
+        if raw_days:
+            conn.execute(
+                "DELETE FROM portfolio_snapshots WHERE timestamp < ?",
+                ((now - timedelta(days=raw_days)).isoformat(),),
+            )
+        for tier in SNAPSHOT_TIERS:
+            days = self._snapshot_retention[tier]
+            if days:
                 conn.execute(
-                    """INSERT INTO portfolio_snapshots
-                       (timestamp, cash_balance, positions_value, total_value,
-                        total_pnl, total_pnl_pct)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (
-                        snapshot.timestamp.isoformat(),
-                        snapshot.cash_balance, snapshot.positions_value,
-                        snapshot.total_value, snapshot.total_pnl, snapshot.total_pnl_pct,
-                    ),
+                    "DELETE FROM snapshot_rollups WHERE tier=? AND bucket_start < ?",
+                    (tier, (now - timedelta(days=days)).isoformat()),
                 )
-                conn.commit()
 
-    def get_snapshots(self, hours: int = 24) -> list[PortfolioSnapshot]:
-        since = (datetime.now() - timedelta(hours=hours)).isoformat()
-        with self._get_connection() as conn:
+    def _backfill_rollups(self):
+        """Build rollups for snapshots recorded before rollups existed."""
+        with self._connections.write() as conn:
+            if conn.execute("SELECT 1 FROM snapshot_rollups LIMIT 1").fetchone():
+                return
+            rows = conn.execute(
+                "SELECT * FROM portfolio_snapshots ORDER BY timestamp"
+            ).fetchall()
+            self._roll_up(conn, [self._row_to_snapshot(r) for r in rows])
+
+    def snapshot_tier(self, hours: float, max_points: Optional[int] = None) -> str:
+        """Coarsest tier that covers the window and still yields max_points points.
+
+        Tiers that no longer retain the window's start are skipped. Without
+        max_points (or if no tier has enough points) the finest covering tier
+        is used; "raw" means the portfolio_snapshots rows themselves.
+        """
+        window = hours * 3600
+        retention = self._snapshot_retention
+        tiers = ["raw", *SNAPSHOT_TIERS]
+
+        def retained(tier):
+            days = retention[tier]
+            return float("inf") if not days else days * 86400
+
+        covering = [t for t in tiers if retained(t) >= window]
+        if not covering:
+            return max(tiers, key=retained)
+        if max_points:
+            enough = [t for t in covering
+                      if t == "raw" or window / SNAPSHOT_TIERS[t] >= max_points]
+            if enough:
+                return enough[-1]
+        return covering[0]
+
+    def get_snapshots(self, hours: int = 24,
+                      max_points: Optional[int] = None) -> list[PortfolioSnapshot]:
+        """Snapshots of the last `hours`, from the tier chosen by snapshot_tier().
+
+        Rollup rows come back as snapshots at their bucket start, valued at
+        the bucket's close; get_snapshot_rollups() has the full OHLC.
+        """
+        tier = self.snapshot_tier(hours, max_points)
+        since = datetime.now() - timedelta(hours=hours)
+        if tier != "raw":
+            return [self._rollup_to_snapshot(r)
+                    for r in self._query_rollups(tier, since)]
+        with self._connections.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM portfolio_snapshots WHERE timestamp >= ? ORDER BY timestamp",
-                (since,),
+                (since.isoformat(),),
             ).fetchall()
         return [self._row_to_snapshot(r) for r in rows]
 
+    def get_snapshot_rollups(self, tier: str, hours: int = 24) -> list[dict]:
+        """OHLC rows of total_value for one tier over the last `hours`."""
+        if tier not in SNAPSHOT_TIERS:
+            raise ValueError(f"Unknown snapshot tier: {tier}. "
+                             f"Available: {list(SNAPSHOT_TIERS)}")
+        since = datetime.now() - timedelta(hours=hours)
+        return [dict(r) for r in self._query_rollups(tier, since)]
+
+    def _query_rollups(self, tier: str, since: datetime) -> list:
+        with self._connections.read() as conn:
+            return conn.execute(
+                """SELECT * FROM snapshot_rollups
+                   WHERE tier=? AND bucket_start >= ? ORDER BY bucket_start""",
+                (tier, bucket_start(since, SNAPSHOT_TIERS[tier]).isoformat()),
+            ).fetchall()
+
     def get_latest_snapshot(self) -> Optional[PortfolioSnapshot]:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             row = conn.execute(
                 "SELECT * FROM portfolio_snapshots ORDER BY timestamp DESC LIMIT 1"
             ).fetchone()
@@ -294,27 +453,25 @@ class Database:
     # --- Trade records ---
 
     def insert_trade_record(self, record: TradeRecord) -> int:
-        with self._write_lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """INSERT INTO trade_records
-                       (symbol, side, entry_price, exit_price, quantity,
-                        entry_time, exit_time, pnl, pnl_pct, fees,
-                        strategy_name, duration_minutes)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        record.symbol, record.side.value, record.entry_price,
-                        record.exit_price, record.quantity,
-                        record.entry_time.isoformat(), record.exit_time.isoformat(),
-                        record.pnl, record.pnl_pct, record.fees,
-                        record.strategy_name, record.duration_minutes,
-                    ),
-                )
-                conn.commit()
-                return cursor.lastrowid
+        with self._connections.write() as conn:
+            cursor = conn.execute(
+                """INSERT INTO trade_records
+                   (id, symbol, side, entry_price, exit_price, quantity,
+                    entry_time, exit_time, pnl, pnl_pct, fees,
+                    strategy_name, duration_minutes)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    record.id, record.symbol, record.side.value, record.entry_price,
+                    record.exit_price, record.quantity,
+                    record.entry_time.isoformat(), record.exit_time.isoformat(),
+                    record.pnl, record.pnl_pct, record.fees,
+                    record.strategy_name, record.duration_minutes,
+                ),
+            )
+            return cursor.lastrowid
 
     def get_trade_records(self, symbol: str = None, limit: int = 100) -> list[TradeRecord]:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             if symbol:
                 rows = conn.execute(
                     "SELECT * FROM trade_records WHERE symbol=? ORDER BY exit_time DESC LIMIT ?",
@@ -328,7 +485,7 @@ class Database:
         return [self._row_to_trade_record(r) for r in rows]
 
     def get_performance_stats(self) -> dict:
-        with self._get_connection() as conn:
+        with self._connections.read() as conn:
             row = conn.execute(
                 """SELECT
                        COUNT(*) as total_trades,
@@ -355,6 +512,82 @@ class Database:
             "total_fees": row["total_fees"] or 0.0,
         }
 
+    # --- Backtest jobs ---
+
+    def insert_backtest_job(self, job: BacktestJob):
+        with self._connections.write() as conn:
+            conn.execute(
+                """INSERT INTO backtest_jobs (id, kind, status, params, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (job.id, job.kind, job.status.value, json.dumps(job.params),
+                 job.created_at.isoformat()),
+            )
+
+    def start_backtest_job(self, job_id: str, started_at: datetime):
+        with self._connections.write() as conn:
+            conn.execute(
+                "UPDATE backtest_jobs SET status=?, started_at=? WHERE id=?",
+                (JobStatus.RUNNING.value, started_at.isoformat(), job_id),
+            )
+
+    def finish_backtest_job(self, job_id: str, status: JobStatus, finished_at: datetime,
+                            result: dict = None, error_msg: str = None):
+        with self._connections.write() as conn:
+            conn.execute(
+                """UPDATE backtest_jobs SET status=?, finished_at=?, result=?, error_msg=?
+                   WHERE id=?""",
+                (status.value, finished_at.isoformat(),
+                 json.dumps(result) if result is not None else None, error_msg, job_id),
+            )
+
+    def requeue_unfinished_backtest_jobs(self) -> list[BacktestJob]:
+        """Reset jobs left queued or running by a previous process; oldest first."""
+        with self._connections.write() as conn:
+            conn.execute(
+                "UPDATE backtest_jobs SET status=?, started_at=NULL WHERE status=?",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            )
+            rows = conn.execute(
+                "SELECT * FROM backtest_jobs WHERE status=? ORDER BY created_at",
+                (JobStatus.QUEUED.value,),
+            ).fetchall()
+        return [self._row_to_backtest_job(r) for r in rows]
+
+    def get_backtest_job(self, job_id: str) -> Optional[BacktestJob]:
+        with self._connections.read() as conn:
+            row = conn.execute(
+                "SELECT * FROM backtest_jobs WHERE id=?", (job_id,)
+            ).fetchone()
+        return self._row_to_backtest_job(row) if row else None
+
+    def get_backtest_jobs(self, limit: int = 50) -> list[BacktestJob]:
+        """Most recent jobs first, without their results."""
+        with self._connections.read() as conn:
+            rows = conn.execute(
+                """SELECT id, kind, status, params, created_at, started_at, finished_at,
+                          NULL AS result, error_msg
+                   FROM backtest_jobs ORDER BY created_at DESC LIMIT ?""",
+                (limit,),
+            ).fetchall()
+        return [self._row_to_backtest_job(r) for r in rows]
+
+    def delete_backtest_jobs_before(self, cutoff: datetime) -> int:
+        """Drop finished jobs (and their results) that finished before cutoff."""
+        with self._connections.write() as conn:
+            cursor = conn.execute(
+                "DELETE FROM backtest_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (cutoff.isoformat(),),
+            )
+            return cursor.rowcount
+
+    def get_max_ids(self) -> dict[str, int]:
+        """Highest id in each table that hands out ids (0 when empty)."""
+        with self._connections.read() as conn:
+            return {
+                table: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                for table in ("orders", "positions", "trade_records")
+            }
+
     # --- Row-to-model converters ---
 
     @staticmethod
@@ -407,6 +640,18 @@ class Database:
             total_pnl_pct=row["total_pnl_pct"],
         )
 
+    @staticmethod
+    def _rollup_to_snapshot(row) -> PortfolioSnapshot:
+        return PortfolioSnapshot(
+            id=None,
+            timestamp=datetime.fromisoformat(row["bucket_start"]),
+            cash_balance=row["cash_balance"],
+            positions_value=row["positions_value"],
+            total_value=row["close"],
+            total_pnl=row["total_pnl"],
+            total_pnl_pct=row["total_pnl_pct"],
+        )
+
     @staticmethod
     def _row_to_trade_record(row) -> TradeRecord:
         return TradeRecord(
@@ -424,3 +669,17 @@ class Database:
             strategy_name=row["strategy_name"],
             duration_minutes=row["duration_minutes"],
         )
+
+    @staticmethod
+    def _row_to_backtest_job(row) -> BacktestJob:
+        return BacktestJob(
+            id=row["id"],
+            kind=row["kind"],
+            status=JobStatus(row["status"]),
+            params=json.loads(row["params"]),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            started_at=datetime.fromisoformat(row["started_at"]) if row["started_at"] else None,
+            finished_at=datetime.fromisoformat(row["finished_at"]) if row["finished_at"] else None,
+            result=json.loads(row["result"]) if row["result"] else None,
+            error_msg=row["error_msg"],
+        )
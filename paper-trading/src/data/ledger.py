@@ -0,0 +1,413 @@
+"""Ledgers record what Portfolio does: orders, positions, trades and snapshots.
+
+Live trading uses DatabaseLedger so state survives restarts, or
+WriteBehindLedger to take the disk writes off the trading thread. Backtests
+use InMemoryLedger, an append-only in-process record that keeps SQL and
+commits off the per-bar path and holds every trade of a run.
+"""
+
+import copy
+import itertools
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from .database import Database
+from .models import (
+    Order, Position, PortfolioSnapshot, TradeRecord,
+    OrderStatus, PositionStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+# Attempts per write-behind batch before the ledger gives up, and the delay
+# before the first retry (doubled for each further one)
+DEFAULT_WRITE_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY_SECONDS = 0.5
+
+
+class LedgerWriteError(Exception):
+    """Raised by WriteBehindLedger.commit() once a batch could not be written."""
+
+
+class Ledger(ABC):
+    """Storage interface used by Portfolio."""
+
+    @abstractmethod
+    def insert_order(self, order: Order) -> int:
+        pass
+
+    @abstractmethod
+    def update_order_status(self, order_id: int, status: OrderStatus,
+                            filled_price: float = None, filled_at: datetime = None):
+        pass
+
+    @abstractmethod
+    def get_pending_orders(self) -> list[Order]:
+        pass
+
+    @abstractmethod
+    def insert_position(self, position: Position) -> int:
+        pass
+
+    @abstractmethod
+    def update_position(self, position: Position):
+        pass
+
+    @abstractmethod
+    def update_positions_batch(self, positions: list[Position]):
+        pass
+
+    @abstractmethod
+    def get_open_positions(self) -> list[Position]:
+        pass
+
+    @abstractmethod
+    def insert_trade_record(self, record: TradeRecord) -> int:
+        pass
+
+    @abstractmethod
+    def get_trade_records(self, symbol: str = None,
+                          limit: Optional[int] = 100) -> list[TradeRecord]:
+        """Most recent trades first. limit=None returns all of them."""
+        pass
+
+    @abstractmethod
+    def insert_snapshot(self, snapshot: PortfolioSnapshot):
+        pass
+
+    @abstractmethod
+    def get_performance_stats(self) -> dict:
+        pass
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Why the ledger stopped recording, if it did. Only buffering ledgers fail later."""
+        return None
+
+    def commit(self):
+        """Mark a consistent point (end of a tick). Only buffering ledgers act on it."""
+
+    def close(self):
+        """Persist anything still buffered and release resources."""
+
+
+class DatabaseLedger(Ledger):
+    """Ledger backed by the SQLite Database (live trading)."""
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    @property
+    def db(self) -> Database:
+        return self._db
+
+    def insert_order(self, order: Order) -> int:
+        return self._db.insert_order(order)
+
+    def update_order_status(self, order_id: int, status: OrderStatus,
+                            filled_price: float = None, filled_at: datetime = None):
+        self._db.update_order_status(order_id, status, filled_price, filled_at)
+
+    def get_pending_orders(self) -> list[Order]:
+        return self._db.get_pending_orders()
+
+    def insert_position(self, position: Position) -> int:
+        return self._db.insert_position(position)
+
+    def update_position(self, position: Position):
+        self._db.update_position(position)
+
+    def update_positions_batch(self, positions: list[Position]):
+        self._db.update_positions_batch(positions)
+
+    def get_open_positions(self) -> list[Position]:
+        return self._db.get_open_positions()
+
+    def insert_trade_record(self, record: TradeRecord) -> int:
+        return self._db.insert_trade_record(record)
+
+    def get_trade_records(self, symbol: str = None,
+                          limit: Optional[int] = 100) -> list[TradeRecord]:
+        if limit is None:
+            limit = -1  # SQLite: no limit
+        return self._db.get_trade_records(symbol=symbol, limit=limit)
+
+    def insert_snapshot(self, snapshot: PortfolioSnapshot):
+        self._db.insert_snapshot(snapshot)
+
+    def get_performance_stats(self) -> dict:
+        return self._db.get_performance_stats()
+
+
+class InMemoryLedger(Ledger):
+    """Append-only in-process ledger (backtests).
+
+    Portfolio mutates the Order/Position objects it hands over, so updates
+    need no copying: the ledger keeps references and only assigns ids.
+    """
+
+    def __init__(self):
+        self._orders: list[Order] = []
+        self._positions: list[Position] = []
+        self._trades: list[TradeRecord] = []
+        self._snapshots: list[PortfolioSnapshot] = []
+
+    def insert_order(self, order: Order) -> int:
+        self._orders.append(order)
+        return len(self._orders)
+
+    def update_order_status(self, order_id: int, status: OrderStatus,
+                            filled_price: float = None, filled_at: datetime = None):
+        order = self._orders[order_id - 1]
+        order.status = status
+        order.filled_price = filled_price
+        order.filled_at = filled_at
+
+    def get_pending_orders(self) -> list[Order]:
+        return [o for o in self._orders if o.status == OrderStatus.PENDING]
+
+    def insert_position(self, position: Position) -> int:
+        self._positions.append(position)
+        return len(self._positions)
+
+    def update_position(self, position: Position):
+        pass
+
+    def update_positions_batch(self, positions: list[Position]):
+        pass
+
+    def get_open_positions(self) -> list[Position]:
+        return [p for p in self._positions if p.status == PositionStatus.OPEN]
+
+    def insert_trade_record(self, record: TradeRecord) -> int:
+        self._trades.append(record)
+        record.id = len(self._trades)
+        return record.id
+
+    def get_trade_records(self, symbol: str = None,
+                          limit: Optional[int] = 100) -> list[TradeRecord]:
+        trades = self._trades[::-1]
+        if symbol:
+            trades = [t for t in trades if t.symbol == symbol]
+        return trades if limit is None else trades[:limit]
+
+    def insert_snapshot(self, snapshot: PortfolioSnapshot):
+        self._snapshots.append(snapshot)
+
+    def get_snapshots(self) -> list[PortfolioSnapshot]:
+        return list(self._snapshots)
+
+    def get_performance_stats(self) -> dict:
+        total = len(self._trades)
+        winning = sum(1 for t in self._trades if t.pnl > 0)
+        pnls = [t.pnl for t in self._trades]
+
+        return {
+            "total_trades": total,
+            "winning_trades": winning,
+            "win_rate": (winning / total * 100) if total > 0 else 0.0,
+            "avg_pnl": (sum(pnls) / total) if total > 0 else 0.0,
+            "best_trade": max(pnls, default=0.0),
+            "worst_trade": min(pnls, default=0.0),
+            "total_pnl": sum(pnls),
+            "total_fees": sum(t.fees for t in self._trades),
+        }
+
+
+class WriteBehindLedger(Ledger):
+    """Ledger that queues writes to a background thread (live trading).
+
+    Writes are buffered in order until commit(), which hands them to the
+    writer thread as one batch; the writer applies each batch in a single
+    transaction. A crash therefore loses at most the ticks not yet written,
+    and the database always holds state as of some tick boundary.
+
+    Ids are handed out here (continuing from the database), so inserts
+    return without waiting for disk. Objects are copied when queued, since
+    Portfolio keeps mutating them. Reads go to the database and reflect the
+    batches written so far; flush() waits for everything committed. The one
+    exception is get_performance_stats(), which also counts trades not yet
+    written, so stats published right after a tick include its trades.
+
+    A batch that fails is rolled back and retried. If it keeps failing, the
+    database no longer matches what Portfolio holds in memory: the ledger
+    stops writing, and commit() raises LedgerWriteError from then on.
+    """
+
+    def __init__(self, db: Database, attempts: int = DEFAULT_WRITE_ATTEMPTS,
+                 retry_delay: float = DEFAULT_RETRY_DELAY_SECONDS):
+        self._db = db
+        self._attempts = max(1, attempts)
+        self._retry_delay = retry_delay
+        self._error: Optional[Exception] = None
+        max_ids = db.get_max_ids()
+        self._order_ids = itertools.count(max_ids["orders"] + 1)
+        self._position_ids = itertools.count(max_ids["positions"] + 1)
+        self._trade_ids = itertools.count(max_ids["trade_records"] + 1)
+
+        self._pending: list[tuple] = []
+        self._pending_lock = threading.Lock()
+        # Trades recorded but not yet on disk; a batch is written and its
+        # trades removed from here under _written_lock, in one step for readers
+        self._unwritten_trades: list[TradeRecord] = []
+        self._written_lock = threading.Lock()
+        self._batches: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="ledger-writer", daemon=True
+        )
+        self._writer.start()
+
+    @property
+    def db(self) -> Database:
+        return self._db
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The error of the batch that could not be written, if any."""
+        return self._error
+
+    def _queue(self, method, *args):
+        with self._pending_lock:
+            self._pending.append((method, args))
+
+    # --- Writes (queued) ---
+
+    def insert_order(self, order: Order) -> int:
+        order.id = next(self._order_ids)
+        self._queue(self._db.insert_order, copy.copy(order))
+        return order.id
+
+    def update_order_status(self, order_id: int, status: OrderStatus,
+                            filled_price: float = None, filled_at: datetime = None):
+        self._queue(self._db.update_order_status, order_id, status, filled_price, filled_at)
+
+    def insert_position(self, position: Position) -> int:
+        position.id = next(self._position_ids)
+        self._queue(self._db.insert_position, copy.copy(position))
+        return position.id
+
+    def update_position(self, position: Position):
+        self._queue(self._db.update_position, copy.copy(position))
+
+    def update_positions_batch(self, positions: list[Position]):
+        self._queue(self._db.update_positions_batch, [copy.copy(p) for p in positions])
+
+    def insert_trade_record(self, record: TradeRecord) -> int:
+        record.id = next(self._trade_ids)
+        queued = copy.copy(record)
+        with self._written_lock:
+            self._unwritten_trades.append(queued)
+        self._queue(self._db.insert_trade_record, queued)
+        return record.id
+
+    def insert_snapshot(self, snapshot: PortfolioSnapshot):
+        self._queue(self._db.insert_snapshot, copy.copy(snapshot))
+
+    # --- Group commit ---
+
+    def commit(self):
+        """Send the writes queued since the last commit() as one transaction.
+
+        Raises LedgerWriteError (dropping the writes) once a batch has failed.
+        """
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if self._error is not None:
+            raise LedgerWriteError(f"Write-behind ledger failed: {self._error}") from self._error
+        if batch:
+            self._batches.put(batch)
+
+    def flush(self):
+        """commit(), then wait until every batch is on disk."""
+        self.commit()
+        self._batches.join()
+        if self._error is not None:
+            raise LedgerWriteError(f"Write-behind ledger failed: {self._error}") from self._error
+
+    def close(self):
+        """Write what is still queued (unless the ledger failed) and stop the writer."""
+        try:
+            self.flush()
+        except LedgerWriteError as e:
+            logger.error(f"Closing ledger without writing pending changes: {e}")
+        self._batches.put(None)
+        self._writer.join()
+
+    def _write_loop(self):
+        while True:
+            batch = self._batches.get()
+            try:
+                if batch is None:
+                    return
+                # Later batches build on a failed one, so they are dropped too
+                if self._error is None:
+                    self._write_batch(batch)
+            finally:
+                self._batches.task_done()
+
+    def _write_batch(self, batch: list[tuple]):
+        delay = self._retry_delay
+        for attempt in range(1, self._attempts + 1):
+            try:
+                with self._written_lock:
+                    with self._db.transaction():
+                        for method, args in batch:
+                            method(*args)
+                    written = {id(args[0]) for method, args in batch
+                               if method == self._db.insert_trade_record}
+                    self._unwritten_trades = [
+                        t for t in self._unwritten_trades if id(t) not in written
+                    ]
+                return
+            except Exception as e:
+                if attempt == self._attempts:
+                    logger.error(f"Write-behind batch of {len(batch)} writes failed "
+                                 f"{attempt} times, no longer writing: {e}", exc_info=True)
+                    self._error = e
+                    return
+                logger.warning(f"Write-behind batch of {len(batch)} writes failed "
+                               f"(attempt {attempt}/{self._attempts}), retrying: {e}")
+                time.sleep(delay)
+                delay *= 2
+
+    # --- Reads (database state as of the last written batch) ---
+
+    def get_pending_orders(self) -> list[Order]:
+        return self._db.get_pending_orders()
+
+    def get_open_positions(self) -> list[Position]:
+        return self._db.get_open_positions()
+
+    def get_trade_records(self, symbol: str = None,
+                          limit: Optional[int] = 100) -> list[TradeRecord]:
+        if limit is None:
+            limit = -1  # SQLite: no limit
+        return self._db.get_trade_records(symbol=symbol, limit=limit)
+
+    def get_performance_stats(self) -> dict:
+        with self._written_lock:
+            stats = self._db.get_performance_stats()
+            unwritten = list(self._unwritten_trades)
+        if not unwritten:
+            return stats
+
+        written_total = stats["total_trades"]
+        pnls = [t.pnl for t in unwritten]
+        total = written_total + len(pnls)
+        winning = stats["winning_trades"] + sum(1 for pnl in pnls if pnl > 0)
+        total_pnl = stats["total_pnl"] + sum(pnls)
+        return {
+            "total_trades": total,
+            "winning_trades": winning,
+            "win_rate": winning / total * 100,
+            "avg_pnl": total_pnl / total,
+            "best_trade": max(pnls + ([stats["best_trade"]] if written_total else [])),
+            "worst_trade": min(pnls + ([stats["worst_trade"]] if written_total else [])),
+            "total_pnl": total_pnl,
+            "total_fees": stats["total_fees"] + sum(t.fees for t in unwritten),
+        }
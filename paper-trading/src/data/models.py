@@ -28,6 +28,14 @@ class PositionStatus(Enum):
     CLOSED = "closed"
 
 
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+
 @dataclass
 class Order:
     id: Optional[int]
@@ -91,3 +99,17 @@ class TradeRecord:
     fees: float
     strategy_name: str
     duration_minutes: int
+
+
+@dataclass
+class BacktestJob:
+    """A backtest or sweep submitted from the dashboard, with its outcome."""
+    id: str
+    kind: str
+    status: JobStatus
+    params: dict
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    result: Optional[dict]
+    error_msg: Optional[str]
@@ -0,0 +1,180 @@
+"""Synthetic market: a local stand-in for a ccxt exchange.
+
+Every pair follows its own deterministic geometric random walk, so runs are
+reproducible and need no network. Candles are generated in fixed-size
+blocks, each from an RNG seeded with (seed, symbol, block), so any window
+can be served without keeping the whole history in memory: only each
+block's starting price and the most recently used blocks are kept.
+
+The timeline starts `history` candles before the current time. Each
+advance() closes the forming candle and opens the next one, so a harness
+can move the market as fast as it likes.
+"""
+
+import threading
+import time
+import zlib
+from typing import Optional
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from .candle_store import ohlcv_frame
+
+BLOCK_SIZE = 256
+# Blocks kept per pair; a live engine only reads near the head
+CACHED_BLOCKS = 2
+DEFAULT_HISTORY = 1000
+DEFAULT_VOLATILITY = 0.002  # standard deviation of one candle's log return
+DEFAULT_FETCH_LIMIT = 500
+# End of the fixed datasets from synthetic_ohlcv(): 2024-01-01 00:00 UTC
+SYNTHETIC_EPOCH_MS = 1_704_067_200_000
+
+
+def make_pairs(count: int, quote: str = "USDT") -> list[str]:
+    """count synthetic symbols: SYN000/USDT, SYN001/USDT, ..."""
+    width = max(3, len(str(count - 1)))
+    return [f"SYN{i:0{width}d}/{quote}" for i in range(count)]
+
+
+class SyntheticExchange:
+    """Deterministic random-walk OHLCV for `pairs` at one timeframe.
+
+    Serves fetch_ohlcv() and fetch_tickers() like a ccxt exchange; the last
+    candle returned is the forming one. Rows are floats, timestamps
+    included. Thread-safe.
+    """
+
+    id = "synthetic"
+    rateLimit = 0
+
+    def __init__(self, pairs: list[str], timeframe: str = "1m", seed: int = 0,
+                 history: int = DEFAULT_HISTORY, volatility: float = DEFAULT_VOLATILITY,
+                 now_ms: Optional[int] = None):
+        self.pairs = list(pairs)
+        self.timeframe = timeframe
+        self.seed = seed
+        self.volatility = volatility
+        self._timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        head_ms = now_ms // self._timeframe_ms * self._timeframe_ms
+        self._origin_ms = head_ms - history * self._timeframe_ms
+        self._head = history  # index of the forming candle
+
+        self._keys = {symbol: zlib.crc32(symbol.encode()) for symbol in self.pairs}
+        # {symbol: [log price at the start of block 0, 1, ...]}
+        self._block_starts: dict[str, list[float]] = {}
+        # {symbol: {block: [timestamp, o, h, l, c, v] rows}}, most recent last
+        self._blocks: dict[str, dict[int, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def head_timestamp(self) -> int:
+        """Open time (ms) of the forming candle."""
+        return self._origin_ms + self._head * self._timeframe_ms
+
+    def advance(self, candles: int = 1):
+        """Close the forming candle(s): `candles` new candles become available."""
+        with self._lock:
+            self._head += candles
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: Optional[int] = None,
+                    limit: Optional[int] = None, params: dict = None) -> list[list]:
+        self._check(symbol, timeframe)
+        limit = limit or DEFAULT_FETCH_LIMIT
+        with self._lock:
+            self.requests += 1
+            head = self._head
+            if since is None:
+                start = max(0, head + 1 - limit)
+            else:
+                start = max(0, -(-(int(since) - self._origin_ms) // self._timeframe_ms))
+            stop = min(head + 1, start + limit)
+            if start >= stop:
+                return []
+            return self._rows(symbol, start, stop).tolist()
+
+    def fetch_tickers(self, symbols: list[str] = None, params: dict = None) -> dict:
+        symbols = self.pairs if symbols is None else symbols
+        with self._lock:
+            self.requests += 1
+            head = self._head
+            tickers = {}
+            for symbol in symbols:
+                self._check(symbol, self.timeframe)
+                timestamp, _, _, _, close, _ = self._rows(symbol, head, head + 1)[0]
+                tickers[symbol] = {
+                    "symbol": symbol,
+                    "timestamp": int(timestamp),
+                    "last": float(close),
+                }
+        return tickers
+
+    def _check(self, symbol: str, timeframe: str):
+        if symbol not in self._keys:
+            raise ccxt.BadSymbol(f"{self.id} does not have market symbol {symbol}")
+        if timeframe != self.timeframe:
+            raise ccxt.BadRequest(f"{self.id} only serves {self.timeframe} candles")
+
+    # --- Generation (callers hold _lock) ---
+
+    def _rows(self, symbol: str, start: int, stop: int) -> np.ndarray:
+        """OHLCV rows with timestamps for candle indexes [start, stop)."""
+        first, last = start // BLOCK_SIZE, (stop - 1) // BLOCK_SIZE
+        offset = start - first * BLOCK_SIZE
+        if first == last:
+            return self._block(symbol, first)[offset:offset + stop - start]
+        parts = [self._block(symbol, b) for b in range(first, last + 1)]
+        return np.concatenate(parts)[offset:offset + stop - start]
+
+    def _rng(self, symbol: str, block: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, self._keys[symbol], block])
+
+    def _block_start(self, symbol: str, block: int) -> float:
+        starts = self._block_starts.get(symbol)
+        if starts is None:
+            # Prices spread over 1..10,000 like a real quote-currency market
+            start_rng = np.random.default_rng([self.seed, self._keys[symbol]])
+            starts = self._block_starts[symbol] = [start_rng.uniform(0.0, 4.0) * np.log(10)]
+        while len(starts) <= block:
+            returns = self._rng(symbol, len(starts) - 1).normal(0.0, self.volatility, BLOCK_SIZE)
+            starts.append(starts[-1] + returns.sum())
+        return starts[block]
+
+    def _block(self, symbol: str, block: int) -> np.ndarray:
+        blocks = self._blocks.setdefault(symbol, {})
+        cached = blocks.pop(block, None)
+        if cached is None:
+            rng = self._rng(symbol, block)
+            returns = rng.normal(0.0, self.volatility, BLOCK_SIZE)
+            wicks = np.abs(rng.normal(0.0, self.volatility / 2, (2, BLOCK_SIZE)))
+            volume = rng.lognormal(3.0, 1.0, BLOCK_SIZE)
+
+            log_close = self._block_start(symbol, block) + np.cumsum(returns)
+            log_open = np.concatenate(([log_close[0] - returns[0]], log_close[:-1]))
+            close, open_ = np.exp(log_close), np.exp(log_open)
+            high = np.maximum(open_, close) * np.exp(wicks[0])
+            low = np.minimum(open_, close) * np.exp(-wicks[1])
+            index = block * BLOCK_SIZE + np.arange(BLOCK_SIZE)
+            timestamps = self._origin_ms + index * self._timeframe_ms
+            cached = np.column_stack([timestamps, open_, high, low, close, volume])
+        blocks[block] = cached
+        while len(blocks) > CACHED_BLOCKS:
+            del blocks[next(iter(blocks))]
+        return cached
+
+
+def synthetic_ohlcv(bars: int, symbol: str = "SYN000/USDT", timeframe: str = "1m",
+                    seed: int = 0, end_ms: int = SYNTHETIC_EPOCH_MS) -> pd.DataFrame:
+    """A fixed `bars`-candle OHLCV frame ending at `end_ms`, the same on every call.
+
+    The candles are a SyntheticExchange's history for `symbol`: datasets of
+    different sizes share the prices of their first candles.
+    """
+    exchange = SyntheticExchange([symbol], timeframe, seed=seed, history=bars, now_ms=end_ms)
+    with exchange._lock:
+        rows = exchange._rows(symbol, 0, bars)
+    return ohlcv_frame(rows.T)
@@ -1,29 +1,50 @@
 """Walk-forward backtester using the same Strategy and Portfolio classes as live trading."""
 
 import logging
-import time
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
 import ccxt
+import numpy as np
 import pandas as pd
 
 from ..data.models import OrderType, OrderSide, TradeRecord
-from ..data.database import Database
+from ..data.candle_store import CandleStore, ohlcv_frame
+from ..data.ledger import InMemoryLedger
+from ..utils.rate_limit import limiter_for
 from .portfolio import Portfolio
 from .strategy import (
-    BaseStrategy, EMASMACrossoverStrategy, RSIStrategy, CombinedStrategy,
-    DEFAULT_EMA_PERIOD, DEFAULT_SMA_PERIOD, DEFAULT_RSI_PERIOD
+    STRATEGIES, BaseStrategy, Signal, DEFAULT_EMA_PERIOD, DEFAULT_SMA_PERIOD, DEFAULT_RSI_PERIOD
 )
+from . import vectorized
+from .indicator_cache import get_shared_cache
+from .indicator_graph import IndicatorGraphs
 
 logger = logging.getLogger(__name__)
 
+# Relative data paths resolve against the app directory, like database.path in main.py
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Default Simulation Parameters
 DEFAULT_INITIAL_BALANCE = 10000.0
 DEFAULT_BACKTEST_DAYS = 30
 DEFAULT_FEE_RATE = 0.001
 DEFAULT_STOP_LOSS_PCT = 0.03
 DEFAULT_TAKE_PROFIT_PCT = 0.06
+DEFAULT_MAX_POSITION_PCT = 0.25
+DEFAULT_MAX_OPEN_POSITIONS = 4
+DEFAULT_DOWNLOAD_WORKERS = 8
+OHLCV_PAGE_LIMIT = 1000
+# Share of Backtester.run progress spent downloading when it fetches data itself
+DOWNLOAD_PROGRESS_SHARE = 30.0
+
+# Simulation engines: "loop" replays bars through Portfolio, "vectorized"
+# runs the array engine in vectorized.py
+BACKTEST_ENGINES = ("loop", "vectorized")
+DEFAULT_BACKTEST_ENGINE = "loop"
 
 
 class BacktestResult:
@@ -45,13 +66,36 @@ class BacktestResult:
         self.take_profit_pct: float = 0.0
 
 
+def scale_progress(callback, start: float, span: float):
+    """Map a 0-100 progress callback onto [start, start + span] of another one."""
+    if callback is None:
+        return None
+    return lambda pct: callback(start + pct * span / 100)
+
+
+class _DownloadProgress:
+    """Counts finished page requests across all symbols of one download."""
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._planned = 0
+        self._done = 0
+
+    def plan(self, pages: int):
+        with self._lock:
+            self._planned += pages
+
+    def advance(self):
+        with self._lock:
+            self._done += 1
+            pct = (self._done / self._planned) * 100 if self._planned else 100.0
+        if self._callback:
+            self._callback(min(pct, 100.0))
+
+
 def _create_strategy(name: str, params: dict) -> BaseStrategy:
-    strategies = {
-        "ema_sma_crossover": EMASMACrossoverStrategy,
-        "rsi": RSIStrategy,
-        "combined": CombinedStrategy,
-    }
-    cls = strategies.get(name)
+    cls = STRATEGIES.get(name)
     if cls is None:
         raise ValueError(f"Unknown strategy: {name}")
     return cls(params)
@@ -75,67 +119,54 @@ def _calculate_max_drawdown(snapshots: list[dict]) -> float:
     return max_dd
 
 
-def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: dict,
-                            symbols: list[str], timeframe: str, days: int,
-                            initial_balance: float, stop_loss_pct: float,
-                            take_profit_pct: float, historical_data: dict,
-                            progress_callback=None, log_results=True) -> BacktestResult:
-    """Execute a full backtest simulation independently of Backtester instance."""
-
-    # Resolve SL/TP values
-    sl_pct = stop_loss_pct if stop_loss_pct is not None else config.get("risk_management.stop_loss_pct", DEFAULT_STOP_LOSS_PCT)
-    tp_pct = take_profit_pct if take_profit_pct is not None else config.get("risk_management.take_profit_pct", DEFAULT_TAKE_PROFIT_PCT)
-
-    # Create strategy instance
-    strategy = _create_strategy(strategy_name, strategy_params)
-
-    if not historical_data:
-        logger.warning("No historical data available for backtest")
-        result = BacktestResult()
-        return result
-
-    # Clone historical_data so we don't modify the caller's reference
-    historical_data = historical_data.copy()
-
-    # Create temporary in-memory database and portfolio
-    db = Database(":memory:")
-    portfolio = Portfolio(
-        initial_balance=initial_balance,
-        fee_rate=config.get("trading.fee_rate", DEFAULT_FEE_RATE),
-        db=db,
-        config=config,
-    )
-
-    # Pre-calculate indicators for all symbols
-    for symbol, df in historical_data.items():
-        historical_data[symbol] = strategy.calculate_indicators(df)
-
-    # Determine the common index range
-    min_len = min(len(df) for df in historical_data.values())
-    warmup = max(
-        strategy_params.get("ema_period", DEFAULT_EMA_PERIOD),
-        strategy_params.get("sma_period", DEFAULT_SMA_PERIOD),
-        strategy_params.get("period", DEFAULT_RSI_PERIOD),
-        strategy_params.get("rsi_period", DEFAULT_RSI_PERIOD),
-    ) + 5  # Extra padding for indicator warmup
+def _signals_at(signal_arrays: dict, index: int, current_positions: dict) -> list[Signal]:
+    """The Signals generate_signals(..., index=index) would return, read from signal arrays."""
+    signals = []
+    for symbol, (entry, exit_) in signal_arrays.items():
+        has_position = current_positions.get(symbol) is not None
+        if entry[index] and not has_position:
+            signals.append(Signal(symbol, OrderSide.BUY, 1.0, "entry signal"))
+        elif exit_[index] and has_position:
+            signals.append(Signal(symbol, OrderSide.SELL, 1.0, "exit signal"))
+    return signals
 
-    if min_len <= warmup:
-        logger.warning("Not enough data for warmup period")
-        return BacktestResult()
 
-    # Walk-forward simulation
-    snapshots = []
-    total_steps = min_len - warmup
+class _LoopReplay:
+    """One strategy's Portfolio, advanced bar by bar over an in-memory ledger.
 
-    for i in range(warmup, min_len):
-        if progress_callback:
-            progress = ((i - warmup) / total_steps) * 100
-            progress_callback(progress)
+    Signals come from the strategy's signal arrays, computed once per symbol,
+    when it has them; otherwise from generate_signals() on every bar.
+    """
 
-        # Get current prices directly from DF at index i
-        current_prices = {}
-        for symbol, df in historical_data.items():
-            current_prices[symbol] = float(df.iloc[i]["close"])
+    def __init__(self, config, strategy: BaseStrategy, symbols: list[str],
+                 historical_data: dict, warmup: int, initial_balance: float,
+                 sl_pct: float, tp_pct: float):
+        self.strategy = strategy
+        self.symbols = symbols
+        self.historical_data = historical_data
+        self.warmup = warmup
+        self.sl_pct = sl_pct
+        self.tp_pct = tp_pct
+        self.ledger = InMemoryLedger()
+        self.portfolio = Portfolio(
+            initial_balance=initial_balance,
+            fee_rate=config.get("trading.fee_rate", DEFAULT_FEE_RATE),
+            config=config,
+            ledger=self.ledger,
+        )
+        self.signal_arrays = None
+        if strategy.supports_signal_arrays:
+            self.signal_arrays = {
+                symbol: strategy.generate_signal_arrays(df)
+                for symbol, df in historical_data.items()
+            }
+        self.snapshots = []
+
+    def step(self, i: int, current_prices: dict, label: str):
+        """Process bar i; bars before this strategy's warmup are skipped."""
+        if i < self.warmup:
+            return
+        portfolio = self.portfolio
 
         # Update portfolio positions
         portfolio.update_positions(current_prices)
@@ -144,11 +175,16 @@ def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: d
         # Run strategy
         current_positions = {
             symbol: portfolio.get_position(symbol)
-            for symbol in symbols
+            for symbol in self.symbols
         }
 
-        # Use optimized signal generation with pre-calculated indicators
-        signals = strategy.generate_signals(historical_data, current_positions, index=i)
+        if self.signal_arrays is not None:
+            signals = _signals_at(self.signal_arrays, i, current_positions)
+        else:
+            # Optimized signal generation with pre-calculated indicators
+            signals = self.strategy.generate_signals(
+                self.historical_data, current_positions, index=i
+            )
 
         # Execute signals
         for signal in signals:
@@ -168,31 +204,122 @@ def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: d
                 order_type=OrderType.MARKET,
                 quantity=quantity,
                 price=price,
-                strategy_name=strategy.name,
+                strategy_name=self.strategy.name,
             )
 
             # Set SL/TP for buy orders
             if (signal.side == OrderSide.BUY and order
                     and order.status.value == "filled"):
-                position = portfolio.get_position(signal.symbol)
-                if position:
-                    position.stop_loss_price = price * (1 - sl_pct)
-                    position.take_profit_price = price * (1 + tp_pct)
-                    db.update_position(position)
+                portfolio.set_exit_levels(
+                    signal.symbol, price * (1 - self.sl_pct), price * (1 + self.tp_pct)
+                )
 
         # Record snapshot
-        total_value = portfolio.get_total_value(current_prices)
-        # Use the first symbol's timestamp
-        timestamp = historical_data[symbols[0]].iloc[i]["timestamp"]
-        snapshots.append({
-            "timestamp": timestamp.isoformat() if hasattr(timestamp, "isoformat") else str(timestamp),
-            "value": total_value,
+        self.snapshots.append({
+            "timestamp": label,
+            "value": portfolio.get_total_value(current_prices),
         })
 
-    # Compile results
+    def results(self) -> tuple[list[TradeRecord], list[dict]]:
+        return self.ledger.get_trade_records(limit=None), self.snapshots
+
+
+def _replay_bars(replays: list[_LoopReplay], historical_data: dict, symbols: list[str],
+                 start: int, min_len: int, progress_callback=None):
+    """Advance every replay through bars [start, min_len) in one shared pass."""
+    closes = {
+        symbol: df["close"].to_numpy(dtype=np.float64)
+        for symbol, df in historical_data.items()
+    }
+    # Use the first symbol's timestamps
+    labels = vectorized.isoformat_timestamps(
+        historical_data[symbols[0]]["timestamp"].iloc[start:min_len]
+    )
+    total_steps = min_len - start
+
+    for i in range(start, min_len):
+        if progress_callback:
+            progress = ((i - start) / total_steps) * 100
+            progress_callback(progress)
+
+        current_prices = {symbol: float(close[i]) for symbol, close in closes.items()}
+        label = labels[i - start]
+        for replay in replays:
+            replay.step(i, current_prices, label)
+
+
+def _simulate_loop(config, strategy: BaseStrategy, symbols: list[str],
+                   historical_data: dict, warmup: int, min_len: int,
+                   initial_balance: float, sl_pct: float, tp_pct: float,
+                   progress_callback=None) -> tuple[list[TradeRecord], list[dict]]:
+    """Replay bars one at a time through a Portfolio backed by an in-memory ledger."""
+    replay = _LoopReplay(config, strategy, symbols, historical_data, warmup,
+                         initial_balance, sl_pct, tp_pct)
+    _replay_bars([replay], historical_data, symbols, warmup, min_len, progress_callback)
+    return replay.results()
+
+
+def _simulate_vectorized(config, strategy: BaseStrategy, symbols: list[str],
+                         historical_data: dict, warmup: int, min_len: int,
+                         initial_balance: float, sl_pct: float, tp_pct: float,
+                         progress_callback=None,
+                         labels: list[str] = None) -> tuple[list[TradeRecord], list[dict]]:
+    """Read closes and signals as arrays once and run the array engine.
+
+    labels: Timestamp strings of bars [warmup, min_len), if already formatted.
+    """
+    closes, timestamps, entries, exits = {}, {}, {}, {}
+    for symbol, df in historical_data.items():
+        closes[symbol] = df["close"].to_numpy(dtype=np.float64)
+        timestamps[symbol] = df["timestamp"]
+        entries[symbol], exits[symbol] = vectorized.compute_signal_arrays(strategy, df)
+
+    trades, equity = vectorized.simulate(
+        closes=closes,
+        timestamps=timestamps,
+        entries=entries,
+        exits=exits,
+        start=warmup,
+        stop=min_len,
+        initial_balance=initial_balance,
+        fee_rate=config.get("trading.fee_rate", DEFAULT_FEE_RATE),
+        max_position_pct=config.get("risk_management.max_position_pct", DEFAULT_MAX_POSITION_PCT),
+        max_open_positions=config.get("risk_management.max_open_positions", DEFAULT_MAX_OPEN_POSITIONS),
+        stop_loss_pct=sl_pct,
+        take_profit_pct=tp_pct,
+        strategy_name=strategy.name,
+        progress_callback=progress_callback,
+    )
+
+    # Use the first symbol's timestamps, newest trades first like the DB query
+    if labels is None:
+        labels = vectorized.isoformat_timestamps(
+            historical_data[symbols[0]]["timestamp"].iloc[warmup:min_len]
+        )
+    snapshots = [
+        {"timestamp": label, "value": value}
+        for label, value in zip(labels, equity.tolist())
+    ]
+    trades.reverse()
+    return trades, snapshots
+
+
+def _warmup(strategy_params: dict) -> int:
+    """Bars skipped before a strategy may trade: its longest indicator period."""
+    return max(
+        strategy_params.get("ema_period", DEFAULT_EMA_PERIOD),
+        strategy_params.get("sma_period", DEFAULT_SMA_PERIOD),
+        strategy_params.get("period", DEFAULT_RSI_PERIOD),
+        strategy_params.get("rsi_period", DEFAULT_RSI_PERIOD),
+    ) + 5  # Extra padding for indicator warmup
+
+
+def _compile_result(trades: list[TradeRecord], snapshots: list[dict], strategy_name: str,
+                    strategy_params: dict, initial_balance: float, sl_pct: float,
+                    tp_pct: float, log_results: bool) -> BacktestResult:
     result = BacktestResult()
     result.equity_curve = snapshots
-    result.trades = db.get_trade_records(limit=10000)
+    result.trades = trades
     result.total_trades = len(result.trades)
 
     if result.total_trades > 0:
@@ -220,7 +347,7 @@ def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: d
 
     if log_results:
         logger.info(
-            f"Backtest complete: {result.total_trades} trades, "
+            f"Backtest complete: {strategy_name}, {result.total_trades} trades, "
             f"return={result.total_return_pct:.2f}%, "
             f"win_rate={result.win_rate:.1f}%, "
             f"max_drawdown={result.max_drawdown_pct:.2f}%"
@@ -229,27 +356,172 @@ def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: d
     return result
 
 
+def run_backtest_simulation(config: dict, strategy_name: str, strategy_params: dict,
+                            symbols: list[str], timeframe: str, days: int,
+                            initial_balance: float, stop_loss_pct: float,
+                            take_profit_pct: float, historical_data: dict,
+                            progress_callback=None, log_results=True,
+                            engine: str = None, indicator_cache=None) -> BacktestResult:
+    """Execute a full backtest simulation independently of Backtester instance.
+
+    engine: "loop" or "vectorized". None = backtesting.engine from config.
+    indicator_cache: Cache for this run's indicators (e.g. a CountedCache).
+        None = the shared cache from config.
+    """
+    return run_fanout_simulation(
+        config, [{"strategy_name": strategy_name, "strategy_params": strategy_params}],
+        symbols, timeframe, days, initial_balance, stop_loss_pct, take_profit_pct,
+        historical_data, progress_callback=progress_callback, log_results=log_results,
+        engine=engine, indicator_cache=indicator_cache,
+    )[0]
+
+
+def run_fanout_simulation(config: dict, runs: list[dict], symbols: list[str],
+                          timeframe: str, days: int, initial_balance: float,
+                          stop_loss_pct: float, take_profit_pct: float,
+                          historical_data: dict, progress_callback=None,
+                          log_results=True, engine: str = None,
+                          indicator_cache=None) -> list[BacktestResult]:
+    """Backtest several strategies on the same data in one pass.
+
+    runs: [{"strategy_name": ..., "strategy_params": {...}}, ...]. A run may
+    also set its own "stop_loss_pct" / "take_profit_pct".
+
+    Returns one BacktestResult per run, in order, each the same as
+    run_backtest_simulation() gives for that run alone. Indicators shared by
+    several strategies are computed once per symbol, and the loop engine
+    advances every strategy's portfolio over a single pass of the bars.
+    indicator_cache is as for run_backtest_simulation().
+    """
+    if engine is None:
+        engine = config.get("backtesting.engine", DEFAULT_BACKTEST_ENGINE)
+    if engine not in BACKTEST_ENGINES:
+        raise ValueError(f"Unknown backtest engine: {engine}. Available: {list(BACKTEST_ENGINES)}")
+
+    # Create strategy instances, sharing indicator nodes between them
+    cache = indicator_cache if indicator_cache is not None else get_shared_cache(config)
+    graphs = IndicatorGraphs()
+    strategies = []
+    for run in runs:
+        strategy = _create_strategy(run["strategy_name"], run["strategy_params"])
+        strategy.indicator_cache = cache
+        strategy.indicator_graphs = graphs
+        if engine == "vectorized" and not vectorized.supports_vectorized(strategy):
+            raise ValueError(
+                f"Strategy {run['strategy_name']} does not support the vectorized engine"
+            )
+        strategies.append(strategy)
+
+    if not historical_data:
+        logger.warning("No historical data available for backtest")
+        return [BacktestResult() for _ in runs]
+
+    # Pre-calculate indicators for all symbols, without touching the caller's dict
+    frames = [
+        {symbol: strategy.calculate_indicators(df, symbol)
+         for symbol, df in historical_data.items()}
+        for strategy in strategies
+    ]
+
+    # Determine the common index range
+    min_len = min(len(df) for df in historical_data.values())
+    warmups = [_warmup(run["strategy_params"]) for run in runs]
+    active = [k for k, warmup in enumerate(warmups) if min_len > warmup]
+    if len(active) < len(runs):
+        logger.warning("Not enough data for warmup period")
+
+    risk = []
+    for run in runs:
+        # Resolve SL/TP values
+        sl = run.get("stop_loss_pct", stop_loss_pct)
+        tp = run.get("take_profit_pct", take_profit_pct)
+        risk.append((
+            sl if sl is not None else config.get("risk_management.stop_loss_pct", DEFAULT_STOP_LOSS_PCT),
+            tp if tp is not None else config.get("risk_management.take_profit_pct", DEFAULT_TAKE_PROFIT_PCT),
+        ))
+
+    outcomes = {}
+    if active and engine == "loop":
+        replays = {
+            k: _LoopReplay(config, strategies[k], symbols, frames[k], warmups[k],
+                           initial_balance, *risk[k])
+            for k in active
+        }
+        _replay_bars(list(replays.values()), historical_data, symbols,
+                     min(warmups[k] for k in active), min_len, progress_callback)
+        outcomes = {k: replay.results() for k, replay in replays.items()}
+    elif active:
+        # One set of timestamp strings, shared by every run's equity curve
+        start = min(warmups[k] for k in active)
+        labels = vectorized.isoformat_timestamps(
+            historical_data[symbols[0]]["timestamp"].iloc[start:min_len]
+        )
+        for position, k in enumerate(active):
+            outcomes[k] = _simulate_vectorized(
+                config, strategies[k], symbols, frames[k], warmups[k], min_len,
+                initial_balance, *risk[k],
+                scale_progress(progress_callback, position * 100 / len(active),
+                               100 / len(active)),
+                labels=labels[warmups[k] - start:],
+            )
+
+    results = []
+    for k, run in enumerate(runs):
+        if k not in outcomes:
+            results.append(BacktestResult())
+            continue
+        trades, snapshots = outcomes[k]
+        results.append(_compile_result(
+            trades, snapshots, run["strategy_name"], run["strategy_params"],
+            initial_balance, *risk[k], log_results,
+        ))
+    return results
+
+
 class Backtester:
     """
     Runs a strategy against historical OHLCV data.
     Uses the same Strategy classes and Portfolio logic as live trading.
     """
 
-    def __init__(self, config, exchange):
+    def __init__(self, config, exchange, candle_store: CandleStore = None):
         self._config = config
         self._exchange = exchange
+        if candle_store is None:
+            cache_dir = config.get("backtesting.candle_cache_dir")
+            if cache_dir:
+                if not os.path.isabs(cache_dir):
+                    cache_dir = os.path.join(APP_DIR, cache_dir)
+                candle_store = CandleStore(cache_dir)
+        self._candle_store = candle_store
 
     def fetch_historical_data(self, symbols: list[str], timeframe: str,
-                              days: int) -> dict:
+                              days: int, progress_callback=None) -> dict:
         """Fetch historical data for multiple symbols. Returns {symbol: DataFrame}.
 
         Public method so sweep callers can fetch once and reuse across runs.
+        Symbols download concurrently, and so do the pages of each symbol;
+        all requests share the exchange's rate-limit budget.
+
+        progress_callback: Optional callback(pct: float) as pages arrive.
         """
-        data = {}
-        for symbol in symbols:
-            df = self._fetch_historical_data(symbol, timeframe, days)
-            if df is not None and len(df) > 0:
-                data[symbol] = df
+        progress = _DownloadProgress(progress_callback)
+        workers = self._config.get("backtesting.download_workers", DEFAULT_DOWNLOAD_WORKERS)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers),
+                                thread_name_prefix="ohlcv-page") as pages, \
+                ThreadPoolExecutor(max_workers=max(1, len(symbols)),
+                                   thread_name_prefix="ohlcv-symbol") as per_symbol:
+            frames = per_symbol.map(
+                lambda symbol: self._fetch_historical_data(
+                    symbol, timeframe, days, pages=pages, progress=progress
+                ),
+                symbols,
+            )
+            data = {}
+            for symbol, df in zip(symbols, frames):
+                if df is not None and len(df) > 0:
+                    data[symbol] = df
         return data
 
     def run(self, strategy_name: str, strategy_params: dict,
@@ -259,7 +531,8 @@ class Backtester:
             take_profit_pct: float = None,
             historical_data: dict = None,
             progress_callback=None,
-            log_results=True) -> BacktestResult:
+            log_results=True,
+            engine: str = None) -> BacktestResult:
         """Execute a full backtest.
 
         Args:
@@ -268,6 +541,7 @@ class Backtester:
             historical_data: Pre-fetched {symbol: DataFrame}. None = fetch internally.
             progress_callback: Optional callback(pct: float) called during simulation.
             log_results: If False, suppress per-run INFO logs (useful for sweeps).
+            engine: "loop" or "vectorized". None = use config.
         """
         if log_results:
             logger.info(
@@ -276,9 +550,9 @@ class Backtester:
             )
 
         # Fetch historical data for all symbols (or use pre-fetched)
-        if historical_data is None:
-            historical_data = self.fetch_historical_data(symbols, timeframe, days)
-
+        historical_data, progress_callback = self._prepare_data(
+            symbols, timeframe, days, historical_data, progress_callback
+        )
         return run_backtest_simulation(
             config=self._config,
             strategy_name=strategy_name,
@@ -292,59 +566,200 @@ class Backtester:
             historical_data=historical_data,
             progress_callback=progress_callback,
             log_results=log_results,
+            engine=engine,
+        )
+
+    def run_fanout(self, runs: list[dict], symbols: list[str], timeframe: str,
+                   days: int = DEFAULT_BACKTEST_DAYS,
+                   initial_balance: float = DEFAULT_INITIAL_BALANCE,
+                   stop_loss_pct: float = None,
+                   take_profit_pct: float = None,
+                   historical_data: dict = None,
+                   progress_callback=None,
+                   log_results=True,
+                   engine: str = None) -> list[BacktestResult]:
+        """Backtest several strategies on one download of the data.
+
+        runs: [{"strategy_name": ..., "strategy_params": {...}}, ...]; see
+        run_fanout_simulation(). Other arguments are as for run().
+        Returns one BacktestResult per run, in order.
+        """
+        if log_results:
+            logger.info(
+                f"Starting fan-out backtest: "
+                f"strategies={[run['strategy_name'] for run in runs]}, "
+                f"symbols={symbols}, timeframe={timeframe}, days={days}"
+            )
+        historical_data, progress_callback = self._prepare_data(
+            symbols, timeframe, days, historical_data, progress_callback
+        )
+        return run_fanout_simulation(
+            config=self._config,
+            runs=runs,
+            symbols=symbols,
+            timeframe=timeframe,
+            days=days,
+            initial_balance=initial_balance,
+            stop_loss_pct=stop_loss_pct,
+            take_profit_pct=take_profit_pct,
+            historical_data=historical_data,
+            progress_callback=progress_callback,
+            log_results=log_results,
+            engine=engine,
+        )
+
+    def _prepare_data(self, symbols: list[str], timeframe: str, days: int,
+                      historical_data: Optional[dict], progress_callback):
+        """(historical_data, simulation progress_callback), downloading the data if
+        it was not passed in; the download then takes the first part of the progress."""
+        if historical_data is not None:
+            return historical_data, progress_callback
+        historical_data = self.fetch_historical_data(
+            symbols, timeframe, days,
+            progress_callback=scale_progress(progress_callback, 0, DOWNLOAD_PROGRESS_SHARE),
+        )
+        return historical_data, scale_progress(
+            progress_callback, DOWNLOAD_PROGRESS_SHARE, 100 - DOWNLOAD_PROGRESS_SHARE
         )
 
     def _create_strategy(self, name: str, params: dict) -> BaseStrategy:
         return _create_strategy(name, params)
 
-    def _fetch_historical_data(self, symbol: str, timeframe: str,
-                               days: int) -> Optional[pd.DataFrame]:
-        """Fetch historical OHLCV data, paginating if necessary."""
-        logger.info(f"Fetching {days} days of {timeframe} data for {symbol}")
+    def _fetch_historical_data(self, symbol: str, timeframe: str, days: int,
+                               pages: ThreadPoolExecutor = None,
+                               progress: _DownloadProgress = None) -> Optional[pd.DataFrame]:
+        """Fetch historical OHLCV data, paginating if necessary.
 
-        # Calculate how many candles we need
-        tf_minutes = self._timeframe_to_minutes(timeframe)
-        total_candles = (days * 24 * 60) // tf_minutes
-        limit_per_request = 1000
+        With a candle store, candles already on disk are served locally and
+        only the missing head/tail of the requested range is fetched.
+        """
+        logger.info(f"Fetching {days} days of {timeframe} data for {symbol}")
 
-        all_candles = []
+        until = int(datetime.now().timestamp() * 1000)
         since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
 
-        while len(all_candles) < total_candles:
-            try:
-                candles = self._exchange.fetch_ohlcv(
-                    symbol, timeframe, since=since, limit=limit_per_request
-                )
-                if not candles:
-                    break
+        if self._candle_store is not None:
+            candles = self._fetch_through_store(symbol, timeframe, since, until, pages, progress)
+        else:
+            fetched, _ = self._fetch_range(symbol, timeframe, since, until, pages, progress)
+            candles = np.array(fetched, dtype=np.float64).T if fetched else None
 
-                all_candles.extend(candles)
-                # Move since to after the last candle
-                since = candles[-1][0] + 1
+        if candles is None or candles.shape[1] == 0:
+            return None
 
-                if len(candles) < limit_per_request:
-                    break  # No more data available
+        # Drop duplicate timestamps (first wins) and sort on the array, so the
+        # frame wraps it instead of being copied by each pandas step
+        timestamps = candles[0]
+        if not (np.diff(timestamps) > 0).all():
+            _, first = np.unique(timestamps, return_index=True)
+            candles = candles[:, first]
+        df = ohlcv_frame(candles, copy=False)
 
-                time.sleep(self._exchange.rateLimit / 1000)
+        logger.info(f"Fetched {len(df)} candles for {symbol}")
+        return df
 
-            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
-                logger.warning(f"Error fetching historical data for {symbol}: {e}")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error fetching {symbol}: {e}")
-                break
+    def _fetch_through_store(self, symbol: str, timeframe: str, since: int, until: int,
+                             pages: ThreadPoolExecutor = None,
+                             progress: _DownloadProgress = None) -> Optional[np.ndarray]:
+        """Fill the store's gaps around [since, until] and read the range back."""
+        store = self._candle_store
+        exchange_id = getattr(self._exchange, "id", None) or "exchange"
+        coverage = store.coverage(exchange_id, symbol, timeframe)
+
+        if coverage is None:
+            segments = [(since, until)]
+        else:
+            earliest, first, last = coverage
+            segments = []
+            if since < earliest:
+                segments.append((since, first))
+            # Refetch from the last stored candle: it may have been incomplete
+            segments.append((last, until))
+
+        for seg_since, seg_until in segments:
+            fetched, complete = self._fetch_range(
+                symbol, timeframe, seg_since, seg_until, pages, progress
+            )
+            # Only a clean fetch proves there is nothing older than what came back
+            is_head = seg_since == since and complete
+            if fetched or is_head:
+                store.write(
+                    exchange_id, symbol, timeframe,
+                    np.array(fetched, dtype=np.float64).reshape(-1, 6).T,
+                    earliest_requested=since if is_head else None,
+                )
 
-        if not all_candles:
-            return None
+        return store.get_range(exchange_id, symbol, timeframe, since, until + 1)
 
-        df = pd.DataFrame(all_candles, columns=[
-            "timestamp", "open", "high", "low", "close", "volume"
-        ])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df = df.drop_duplicates(subset=["timestamp"]).sort_values("timestamp").reset_index(drop=True)
+    def _fetch_range(self, symbol: str, timeframe: str, since: int, until: int,
+                     pages: ThreadPoolExecutor = None,
+                     progress: _DownloadProgress = None) -> tuple[list, bool]:
+        """Fetch exchange candles from since (ms) until (ms) is reached.
 
-        logger.info(f"Fetched {len(df)} candles for {symbol}")
-        return df
+        The range is split into page-sized windows up front, so pages can be
+        requested in parallel on `pages` (or one by one without it). Exchanges
+        that cap pages below OHLCV_PAGE_LIMIT return a window in several short
+        pages, each continuing after the last candle of the one before.
+        Returns (candles, complete); complete is False if a request failed.
+        """
+        timeframe_ms = self._timeframe_to_minutes(timeframe) * 60_000
+        page_span = OHLCV_PAGE_LIMIT * timeframe_ms
+        starts = list(range(since, until, page_span))
+        if progress:
+            progress.plan(len(starts))
+        limiter = limiter_for(self._exchange)
+
+        def fetch_page(start: int) -> list:
+            end = start + page_span
+            candles = []
+            cursor = start
+            try:
+                while True:
+                    limiter.acquire()
+                    page = self._exchange.fetch_ohlcv(
+                        symbol, timeframe, since=cursor, limit=OHLCV_PAGE_LIMIT
+                    )
+                    if not page:
+                        break
+                    candles.extend(page)
+                    last = page[-1][0]
+                    # A full page, or one reaching the window end, covers the window;
+                    # a short one that stops early was capped by the exchange
+                    if (len(page) >= OHLCV_PAGE_LIMIT or last + timeframe_ms >= min(end, until)
+                            or last < cursor):
+                        break
+                    cursor = last + 1
+            finally:
+                if progress:
+                    progress.advance()
+            # Exchange gaps can push a page past its window; the next page has those
+            if end < until:
+                candles = [c for c in candles if c[0] < end]
+            return candles
+
+        if pages is None:
+            results = []
+            for start in starts:
+                try:
+                    results.append(fetch_page(start))
+                except Exception as e:
+                    results.append(e)
+        else:
+            futures = [pages.submit(fetch_page, start) for start in starts]
+            results = [f.exception() or f.result() for f in futures]
+
+        # Keep the pages before the first failure so the data has no holes
+        all_candles = []
+        for result in results:
+            if isinstance(result, (ccxt.NetworkError, ccxt.ExchangeError)):
+                logger.warning(f"Error fetching historical data for {symbol}: {result}")
+                return all_candles, False
+            if isinstance(result, Exception):
+                logger.error(f"Unexpected error fetching {symbol}: {result}")
+                return all_candles, False
+            all_candles.extend(result)
+
+        return all_candles, True
 
     @staticmethod
     def _timeframe_to_minutes(timeframe: str) -> int:
@@ -0,0 +1,503 @@
+"""Backtest throughput benchmarks, stored as JSON and compared to a baseline.
+
+Every case runs against a fixed synthetic_ohlcv() dataset (10k, 100k or 1M
+one-minute bars) and reports a rate: bars per second, or operations per
+second for the Database cases, which do not depend on the dataset size.
+Results are keyed "<case>[<size>]", e.g. "simulation/rsi/vectorized[100k]",
+so a run can be compared case by case with compare_results().
+
+Per-bar cases (the loop engine and per-bar generate_signals) stop at
+PER_BAR_MAX_BARS unless all_sizes is set: at a few thousand bars/s, 1M bars
+would take several minutes per case.
+
+A sample re-runs its case until it has taken min_seconds, so cases of a
+few milliseconds are not timed on a single noisy run, and the reported rate
+is the median of `repeat` samples. Every sample also times a fixed
+calibration workload just before and after the case; the case's
+relative_rate (units per calibration run) cancels out the host speeding up
+or slowing down between samples, which on shared or throttled machines moves
+raw rates by 20-30% within a minute. compare_results() compares relative
+rates, and confirm_regressions() re-measures the cases that look regressed
+before failing them. Rates still only compare between runs on the same
+machine: a baseline is specific to the host that recorded it.
+"""
+
+import os
+import platform
+import re
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..data.database import Database
+from ..data.ledger import InMemoryLedger
+from ..data.models import (
+    Order, OrderSide, OrderStatus, OrderType, PortfolioSnapshot, Position,
+    PositionStatus, TradeRecord,
+)
+from ..data.synthetic import SyntheticExchange, synthetic_ohlcv
+from .backtester import (
+    BACKTEST_ENGINES, DEFAULT_FEE_RATE, DEFAULT_INITIAL_BALANCE,
+    DEFAULT_MAX_OPEN_POSITIONS, Backtester,
+    _create_strategy, run_backtest_simulation, run_fanout_simulation,
+)
+from .portfolio import Portfolio
+
+DATASET_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+PER_BAR_MAX_BARS = 100_000
+DATABASE_OPS = 2000  # calls per write case; also the rows each table is seeded with
+DATABASE_READS = 200  # calls per read case
+DEFAULT_REGRESSION_THRESHOLD = 0.2  # fail when a rate drops by more than 20%
+DEFAULT_MIN_SAMPLE_SECONDS = 0.5  # a sample repeats its case for at least this long
+CALIBRATION_SECONDS = 0.1  # calibration timed before and after each sample
+DEFAULT_CONFIRM_ATTEMPTS = 2  # re-measurements of a case before it counts as regressed
+RESULTS_VERSION = 1
+BENCH_SYMBOL = "SYN000/USDT"
+BENCH_STRATEGIES = ("ema_sma_crossover", "rsi", "combined")
+
+
+@dataclass
+class BenchmarkCase:
+    """One measured workload. run(df) does the work and returns how many units it processed."""
+
+    name: str
+    unit: str  # "bars" or "ops"
+    run: Callable[[Optional[pd.DataFrame]], int]
+    per_bar: bool = False
+    sized: bool = True  # False: runs once per suite, without a dataset
+
+
+# --- Workloads ---
+
+def _simulation(strategy_name: str, engine: str):
+    def run(df):
+        run_backtest_simulation(
+            {}, strategy_name, {}, [BENCH_SYMBOL], "1m", 0, DEFAULT_INITIAL_BALANCE,
+            None, None, {BENCH_SYMBOL: df}, log_results=False, engine=engine,
+        )
+        return len(df)
+    return run
+
+
+def _fanout(engine: str):
+    """Every BENCH_STRATEGIES strategy in one run_fanout_simulation() pass."""
+    runs = [{"strategy_name": name, "strategy_params": {}} for name in BENCH_STRATEGIES]
+
+    def run(df):
+        run_fanout_simulation(
+            {}, runs, [BENCH_SYMBOL], "1m", 0, DEFAULT_INITIAL_BALANCE,
+            None, None, {BENCH_SYMBOL: df}, log_results=False, engine=engine,
+        )
+        return len(df)
+    return run
+
+
+def _backtester_run(df):
+    """Backtester.run end to end, downloading len(df) bars from a SyntheticExchange."""
+    bars = len(df)
+    exchange = SyntheticExchange([BENCH_SYMBOL], "1m", history=bars)
+    config = {"backtesting.candle_cache_dir": "", "backtesting.engine": "vectorized"}
+    days = -(-bars // 1440)
+    Backtester(config, exchange).run(
+        "ema_sma_crossover", {}, [BENCH_SYMBOL], "1m", days=days, log_results=False,
+    )
+    return bars
+
+
+def _indicators(strategy_name: str):
+    def run(df):
+        _create_strategy(strategy_name, {}).calculate_indicators(df)
+        return len(df)
+    return run
+
+
+def _signals(strategy_name: str):
+    def run(df):
+        strategy = _create_strategy(strategy_name, {})
+        data = {BENCH_SYMBOL: strategy.calculate_indicators(df)}
+        for i in range(2, len(df)):
+            strategy.generate_signals(data, {}, index=i)
+        return len(df)
+    return run
+
+
+def _signal_arrays(strategy_name: str):
+    def run(df):
+        strategy = _create_strategy(strategy_name, {})
+        strategy.generate_signal_arrays(strategy.calculate_indicators(df))
+        return len(df)
+    return run
+
+
+def _portfolio_fills(df):
+    """Market entries with SL/TP, limit entries, market exits and auto-closes, one bar at a time."""
+    portfolio = Portfolio(DEFAULT_INITIAL_BALANCE, DEFAULT_FEE_RATE, config={},
+                          ledger=InMemoryLedger())
+    for i, price in enumerate(df["close"].tolist()):
+        prices = {BENCH_SYMBOL: price}
+        portfolio.update_positions(prices)
+        portfolio.check_pending_orders(prices)
+        position = portfolio.get_position(BENCH_SYMBOL)
+        if position is None and not portfolio._pending_orders:
+            quantity = portfolio.calculate_position_size(BENCH_SYMBOL, OrderSide.BUY, price)
+            if i % 2:
+                portfolio.submit_order(BENCH_SYMBOL, OrderSide.BUY, OrderType.MARKET,
+                                       quantity, price, strategy_name="bench")
+                portfolio.set_exit_levels(BENCH_SYMBOL, price * 0.995, price * 1.005)
+            else:
+                portfolio.submit_order(BENCH_SYMBOL, OrderSide.BUY, OrderType.LIMIT,
+                                       quantity, price * 0.999, strategy_name="bench")
+        elif position is not None and i % 32 == 0:
+            portfolio.submit_order(BENCH_SYMBOL, OrderSide.SELL, OrderType.MARKET,
+                                   position.quantity, price, strategy_name="bench")
+    return len(df)
+
+
+def _database_cases() -> list[BenchmarkCase]:
+    """One case per Database CRUD method, timed on a seeded file database.
+
+    Every table holds DATABASE_OPS rows, DEFAULT_MAX_OPEN_POSITIONS of the
+    positions still open, as after a long live run.
+    """
+
+    def order(i, now):
+        return Order(
+            id=None, symbol=BENCH_SYMBOL, side=OrderSide.BUY, order_type=OrderType.MARKET,
+            quantity=0.01, price=100.0 + i, stop_price=None, status=OrderStatus.PENDING,
+            filled_price=None, filled_at=None, fee=0.0, created_at=now, strategy_name="bench",
+        )
+
+    def position(i, now):
+        return Position(
+            id=None, symbol=f"SYN{i:06d}/USDT", side=OrderSide.BUY, quantity=0.01,
+            entry_price=100.0, current_price=100.0, stop_loss_price=None,
+            take_profit_price=None, unrealized_pnl=0.0, realized_pnl=0.0,
+            status=PositionStatus.OPEN, opened_at=now, closed_at=None,
+            entry_order_id=i, exit_order_id=None,
+        )
+
+    def trade(i, now):
+        return TradeRecord(
+            id=None, symbol=BENCH_SYMBOL, side=OrderSide.BUY, entry_price=100.0,
+            exit_price=101.0, quantity=0.01, entry_time=now, exit_time=now, pnl=0.01,
+            pnl_pct=1.0, fees=0.0002, strategy_name="bench", duration_minutes=1,
+        )
+
+    def snapshot(i, now):
+        return PortfolioSnapshot(
+            id=None, timestamp=now + timedelta(seconds=i), cash_balance=9000.0,
+            positions_value=1000.0, total_value=10000.0, total_pnl=0.0, total_pnl_pct=0.0,
+        )
+
+    def seeded(db, now):
+        """Rows for the update and read cases to work on."""
+        ids = [db.insert_order(order(i, now)) for i in range(DATABASE_OPS)]
+        positions = []
+        for i in range(DATABASE_OPS):
+            p = position(i, now)
+            p.id = db.insert_position(p)
+            positions.append(p)
+        for i in range(DATABASE_OPS):
+            db.insert_trade_record(trade(i, now))
+            db.insert_snapshot(snapshot(i, now))
+        for i, p in enumerate(positions[:-DEFAULT_MAX_OPEN_POSITIONS]):
+            db.close_position(p.id, 101.0, ids[i], 0.01)
+        return ids, positions
+
+    def calls(method, count=DATABASE_OPS):
+        """A case that calls method(db, i, rows, now) `count` times."""
+        def run(_df):
+            with tempfile.TemporaryDirectory() as tmp:
+                db = Database(os.path.join(tmp, "bench.db"))
+                try:
+                    now = datetime.now()
+                    rows = seeded(db, now)
+                    started = time.perf_counter()
+                    for i in range(count):
+                        method(db, i, rows, now)
+                    return count, time.perf_counter() - started
+                finally:
+                    db.close()
+        return run
+
+    def update_position(db, i, rows, now):
+        p = rows[1][i]
+        p.current_price += 1
+        db.update_position(p)
+
+    def update_positions_batch(db, i, rows, now):
+        batch = rows[1][i % 100 * 20:i % 100 * 20 + 20]
+        for p in batch:
+            p.current_price += 1
+        db.update_positions_batch(batch)
+
+    writes = {
+        "insert_order": lambda db, i, rows, now: db.insert_order(order(i, now)),
+        "update_order_status": lambda db, i, rows, now: db.update_order_status(
+            rows[0][i], OrderStatus.FILLED, 100.0, now),
+        "insert_position": lambda db, i, rows, now: db.insert_position(position(i, now)),
+        "update_position": update_position,
+        "update_positions_batch": update_positions_batch,
+        "close_position": lambda db, i, rows, now: db.close_position(
+            rows[1][i].id, 101.0, rows[0][i], 0.01),
+        "insert_snapshot": lambda db, i, rows, now: db.insert_snapshot(
+            snapshot(DATABASE_OPS + i, now)),
+        "insert_trade_record": lambda db, i, rows, now: db.insert_trade_record(trade(i, now)),
+    }
+    reads = {
+        "get_orders": lambda db, i, rows, now: db.get_orders(limit=100),
+        "get_open_positions": lambda db, i, rows, now: db.get_open_positions(),
+        "get_trade_records": lambda db, i, rows, now: db.get_trade_records(limit=100),
+        "get_snapshots": lambda db, i, rows, now: db.get_snapshots(hours=24),
+        "get_performance_stats": lambda db, i, rows, now: db.get_performance_stats(),
+    }
+    return [
+        BenchmarkCase(f"database/{name}", "ops", calls(method), sized=False)
+        for name, method in writes.items()
+    ] + [
+        BenchmarkCase(f"database/{name}", "ops", calls(method, DATABASE_READS), sized=False)
+        for name, method in reads.items()
+    ]
+
+
+def benchmark_cases() -> list[BenchmarkCase]:
+    cases = []
+    for strategy in BENCH_STRATEGIES:
+        for engine in BACKTEST_ENGINES:
+            cases.append(BenchmarkCase(f"simulation/{strategy}/{engine}", "bars",
+                                       _simulation(strategy, engine),
+                                       per_bar=engine == "loop"))
+    for engine in BACKTEST_ENGINES:
+        cases.append(BenchmarkCase(f"simulation/fanout/{engine}", "bars", _fanout(engine),
+                                   per_bar=engine == "loop"))
+    cases.append(BenchmarkCase("backtester_run/ema_sma_crossover/vectorized", "bars",
+                               _backtester_run))
+    for strategy in BENCH_STRATEGIES:
+        cases.append(BenchmarkCase(f"indicators/{strategy}", "bars", _indicators(strategy)))
+        cases.append(BenchmarkCase(f"signals/{strategy}", "bars", _signals(strategy),
+                                   per_bar=True))
+        cases.append(BenchmarkCase(f"signal_arrays/{strategy}", "bars",
+                                   _signal_arrays(strategy)))
+    cases.append(BenchmarkCase("portfolio/fills", "bars", _portfolio_fills, per_bar=True))
+    return cases + _database_cases()
+
+
+# --- Running and comparing ---
+
+_CALIBRATION_DATA = np.linspace(1.0, 2.0, 50_000)
+
+
+def _calibration_run() -> float:
+    """Fixed CPU work, an interpreter loop plus NumPy passes, like the cases."""
+    total = 0.0
+    for value in _CALIBRATION_DATA[:5000].tolist():
+        total += value * value
+    return total + float(np.cumsum(np.sqrt(_CALIBRATION_DATA))[-1])
+
+
+def _calibration_rate(seconds: float) -> float:
+    """Calibration runs per second, over at least one run and `seconds`."""
+    runs = 0
+    started = time.perf_counter()
+    while runs == 0 or time.perf_counter() - started < seconds:
+        _calibration_run()
+        runs += 1
+    return runs / (time.perf_counter() - started)
+
+
+def _sample(case: BenchmarkCase, df: Optional[pd.DataFrame],
+            min_seconds: float) -> tuple[int, float, int, float]:
+    """(units, timed seconds, runs, calibration runs/s) of running the case
+    until min_seconds have passed.
+
+    A run may return (units, seconds) to time only part of itself.
+    """
+    calibration_seconds = min(CALIBRATION_SECONDS, min_seconds)
+    calibration = _calibration_rate(calibration_seconds)
+    units = runs = 0
+    seconds = 0.0
+    deadline = time.perf_counter() + min_seconds
+    while runs == 0 or time.perf_counter() < deadline:
+        started = time.perf_counter()
+        outcome = case.run(df)
+        if isinstance(outcome, tuple):
+            run_units, run_seconds = outcome
+        else:
+            run_units, run_seconds = outcome, time.perf_counter() - started
+        units += run_units
+        seconds += run_seconds
+        runs += 1
+    calibration = (calibration + _calibration_rate(calibration_seconds)) / 2
+    return units, seconds, runs, calibration
+
+
+def _measure(case: BenchmarkCase, df: Optional[pd.DataFrame], repeat: int,
+             min_seconds: float = DEFAULT_MIN_SAMPLE_SECONDS) -> dict:
+    """Median rate and relative rate of `repeat` samples; seconds and units
+    are per run of the median sample."""
+    samples = sorted(
+        (_sample(case, df, min_seconds) for _ in range(max(1, repeat))),
+        key=lambda sample: sample[0] / sample[1],
+    )
+    units, seconds, runs, _ = samples[len(samples) // 2]
+    rate = statistics.median(sample[0] / sample[1] for sample in samples)
+    relative = statistics.median(sample[0] / sample[1] / sample[3] for sample in samples)
+    return {
+        "unit": f"{case.unit}/s",
+        "rate": round(rate, 1),
+        "relative_rate": float(f"{relative:.6g}"),
+        "seconds": round(seconds / runs, 4),
+        "units": units // runs,
+    }
+
+
+def run_suite(sizes: list[str] = None, pattern: str = None, repeat: int = 1,
+              all_sizes: bool = False, min_seconds: float = DEFAULT_MIN_SAMPLE_SECONDS,
+              progress_callback: Callable[[str, dict], None] = None) -> dict:
+    """Run the cases matching `pattern` (a regex searched in "<case>[<size>]")
+    at each of `sizes` (keys of DATASET_SIZES, or bar counts as strings).
+
+    Returns {"version", "created_at", "environment", "selection",
+    "results": {key: {"unit", "rate", "relative_rate", "seconds", "units"}}}.
+    """
+    sizes = list(DATASET_SIZES) if sizes is None else sizes
+    for label in sizes:
+        if label not in DATASET_SIZES and not label.isdigit():
+            raise ValueError(f"Unknown dataset size: {label}. Available: {list(DATASET_SIZES)}")
+    matcher = re.compile(pattern) if pattern else None
+    cases = benchmark_cases()
+
+    results = {}
+
+    def record(key, case, df):
+        if matcher and not matcher.search(key):
+            return
+        results[key] = _measure(case, df, repeat, min_seconds)
+        if progress_callback:
+            progress_callback(key, results[key])
+
+    for label in sizes:
+        bars = DATASET_SIZES.get(label) or int(label)
+        df = None
+        for case in cases:
+            if not case.sized or (case.per_bar and bars > PER_BAR_MAX_BARS and not all_sizes):
+                continue
+            if df is None:
+                df = synthetic_ohlcv(bars, BENCH_SYMBOL)
+            record(f"{case.name}[{label}]", case, df)
+    for case in cases:
+        if not case.sized:
+            record(case.name, case, None)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+        },
+        "selection": {"sizes": sizes, "pattern": pattern, "all_sizes": all_sizes},
+        "results": results,
+    }
+
+
+def environment_differences(current: dict, baseline: dict) -> list[str]:
+    """The environment fields (python, numpy, machine, ...) that differ between two runs."""
+    ours, theirs = current.get("environment", {}), baseline.get("environment", {})
+    return [
+        f"{name}: {theirs.get(name)} -> {ours.get(name)}"
+        for name in sorted(set(ours) | set(theirs))
+        if ours.get(name) != theirs.get(name)
+    ]
+
+
+def _size_label(key: str) -> Optional[str]:
+    return key[key.index("[") + 1:-1] if key.endswith("]") else None
+
+
+def _selected(key: str, selection: Optional[dict]) -> bool:
+    """Whether a run with this selection would have measured the case key."""
+    if selection is None:
+        return True
+    label = _size_label(key)
+    if label is not None and label not in selection["sizes"]:
+        return False
+    return not selection.get("pattern") or re.search(selection["pattern"], key) is not None
+
+
+def compare_results(current: dict, baseline: dict,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list[dict]:
+    """Every case of either run, with its rate change if both have it.
+
+    Returns [{"case", "status", "baseline", "current", "change", "regressed"}].
+    change is a fraction of relative_rate (of rate for results without one).
+    status is "compared", "new" (not in the baseline), "missing" (in the
+    baseline and selected by this run, but not measured) or "unit changed".
+    Only compared cases can regress, when they dropped by more than `threshold`.
+    """
+    if baseline.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported baseline version: {baseline.get('version')}. "
+                         f"Available: [{RESULTS_VERSION}]")
+    rows = [
+        _compare_case(key, result, baseline["results"].get(key), threshold)
+        for key, result in current["results"].items()
+    ]
+    for key, base in baseline["results"].items():
+        if key not in current["results"] and _selected(key, current.get("selection")):
+            rows.append({"case": key, "status": "missing", "baseline": base["rate"],
+                         "current": None, "change": None, "regressed": False})
+    return rows
+
+
+def _compare_case(key: str, result: dict, base: Optional[dict], threshold: float) -> dict:
+    row = {"case": key, "status": "compared", "baseline": None,
+           "current": result["rate"], "change": None, "regressed": False}
+    if base is None:
+        row["status"] = "new"
+    elif base["unit"] != result["unit"]:
+        row.update(status="unit changed", baseline=base["rate"])
+    else:
+        field = "relative_rate" if "relative_rate" in base and "relative_rate" in result \
+            else "rate"
+        change = result[field] / base[field] - 1 if base[field] else 0.0
+        row.update(baseline=base["rate"], change=round(change, 4),
+                   regressed=change < -threshold)
+    return row
+
+
+def confirm_regressions(current: dict, baseline: dict,
+                        threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+                        attempts: int = DEFAULT_CONFIRM_ATTEMPTS, repeat: int = 3,
+                        min_seconds: float = DEFAULT_MIN_SAMPLE_SECONDS,
+                        progress_callback: Callable[[str, dict], None] = None) -> list[dict]:
+    """compare_results(), re-measuring each regressed case up to `attempts` times.
+
+    A case only stays regressed if every re-measurement is also beyond the
+    threshold; otherwise its best measurement replaces it in `current`.
+    """
+    rows = compare_results(current, baseline, threshold)
+    for i, row in enumerate(rows):
+        key = row["case"]
+        label = _size_label(key)
+        for _ in range(attempts):
+            if not rows[i]["regressed"]:
+                break
+            rerun = run_suite(sizes=[label] if label else [], pattern=f"^{re.escape(key)}$",
+                              repeat=repeat, all_sizes=True, min_seconds=min_seconds,
+                              progress_callback=progress_callback)
+            retried = _compare_case(key, rerun["results"][key], baseline["results"][key],
+                                    threshold)
+            if retried["change"] > rows[i]["change"]:
+                rows[i] = retried
+                current["results"][key] = rerun["results"][key]
+    return rows
@@ -1,22 +1,67 @@
 """Core trading engine — orchestrates data fetching, strategy execution, and order flow."""
 
 import ccxt
+import numpy as np
 import pandas as pd
 import logging
 import time
 import threading
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from datetime import datetime, timezone
+from typing import Callable, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from ..data.models import OrderType, OrderSide
 from ..data.database import Database
+from ..data.candle_buffer import CandleBuffer
+from ..data.candle_store import ohlcv_frame
+from ..data.ledger import LedgerWriteError, WriteBehindLedger
+from ..utils.metrics import MetricsRegistry
+from ..utils.rate_limit import limiter_for
 from .portfolio import Portfolio
+from .indicator_graph import IndicatorGraphs
 from .strategy import BaseStrategy, create_strategy
 
 logger = logging.getLogger(__name__)
 
+# Candles kept per pair (and fetched on the first tick)
+DEFAULT_CANDLE_BUFFER_SIZE = 100
+
+# Scheduler modes: "interval" runs the full tick every interval_seconds;
+# "candle_close" runs it once per candle close and a price-only tick between
+SCHEDULER_MODES = ("interval", "candle_close")
+DEFAULT_SCHEDULER_MODE = "interval"
+DEFAULT_SETTLE_SECONDS = 5
+DEFAULT_PRICE_INTERVAL_SECONDS = 60
+
+# Market data fetch: pairs are fetched concurrently, each within its own
+# timeout; a failing pair is skipped for a doubling backoff instead of being
+# retried in place
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_FETCH_TIMEOUT_SECONDS = 10.0
+DEFAULT_FETCH_BACKOFF_SECONDS = 5.0
+MAX_FETCH_BACKOFF_SECONDS = 300.0
+
+
+def next_candle_close(timeframe_seconds: int, settle_seconds: float,
+                      now: float) -> datetime:
+    """The first candle close (UTC-aligned) plus settle delay that is after `now`."""
+    boundary = (now - settle_seconds) // timeframe_seconds * timeframe_seconds
+    return datetime.fromtimestamp(
+        boundary + timeframe_seconds + settle_seconds, tz=timezone.utc
+    )
+
+
+def create_exchange(config):
+    """The ccxt exchange named by exchange.name: public API, spot markets."""
+    timeout = config.get("trading.fetch_timeout_seconds", DEFAULT_FETCH_TIMEOUT_SECONDS)
+    return getattr(ccxt, config.get("exchange.name", "binance"))({
+        "enableRateLimit": True,
+        "timeout": int(timeout * 1000),
+        "options": {"defaultType": "spot"},
+    })
+
 
 class TradingEngine:
     """
@@ -24,61 +69,134 @@ class TradingEngine:
     and order management via APScheduler.
     """
 
-    def __init__(self, config, db: Database):
+    def __init__(self, config, db: Database, metrics: Optional[MetricsRegistry] = None):
         self._config = config
         self._db = db
         self._running = False
         self._lock = threading.Lock()
 
+        # Latency histograms for /api/metrics: tick phases, per-pair fetches,
+        # and (through the portfolio) lock waits
+        self._metrics = metrics or MetricsRegistry.from_config(config)
+        self._metrics.describe("tick_seconds", "Duration of a trading tick, by kind")
+        self._metrics.describe("tick_phase_seconds", "Duration of each phase of a trading tick")
+        self._metrics.describe("fetch_seconds", "Duration of an OHLCV request, by pair")
+
         # CCXT exchange — public API only (no keys needed for Binance market data)
-        exchange_name = config.get("exchange.name", "binance")
-        self._exchange = getattr(ccxt, exchange_name)({
-            "enableRateLimit": True,
-            "options": {"defaultType": "spot"},
-        })
+        self._fetch_timeout = config.get(
+            "trading.fetch_timeout_seconds", DEFAULT_FETCH_TIMEOUT_SECONDS
+        )
+        self._exchange = create_exchange(config)
 
-        # Virtual portfolio
+        # Virtual portfolio; with write-behind, each tick's records are
+        # written by a background thread in one transaction. If the writes
+        # fail for good, trading halts and ledger_error reports why.
+        self._ledger_error: Optional[str] = None
         self._portfolio = Portfolio(
             initial_balance=config.get("trading.initial_balance", 10000.0),
             fee_rate=config.get("trading.fee_rate", 0.001),
             db=db,
             config=config,
+            ledger=WriteBehindLedger(db) if config.get("database.write_behind", False) else None,
+            metrics=self._metrics,
         )
 
-        # Active strategy
+        # Active strategy. Indicator nodes are shared per frame between the
+        # tick's signals, charting and whichever strategy is swapped in next
+        self._indicator_graphs = IndicatorGraphs()
         self._strategy = create_strategy(config)
+        self._strategy.indicator_graphs = self._indicator_graphs
 
         # Trading pairs and timeframe
         self._pairs = config.get("trading.pairs", ["BTC/USDT"])
         self._timeframe = config.get("trading.default_timeframe", "15m")
 
-        # Market data cache
+        # Market data: one ring buffer per pair, refreshed incrementally.
+        # _data_lock guards buffer writes against dashboard reads.
+        self._buffer_size = config.get("trading.candle_buffer_size", DEFAULT_CANDLE_BUFFER_SIZE)
+        self._buffers: dict[str, CandleBuffer] = {}
+        self._data_lock = threading.Lock()
         self._current_prices: dict[str, float] = {}
-        self._ohlcv_data: dict[str, pd.DataFrame] = {}
+        # DataFrames built from the buffers: {symbol: (buffer version, df)} and,
+        # with indicators for charting, {symbol: (buffer version, strategy, df)}
+        self._frames: dict[str, tuple] = {}
+        self._pair_data: dict[str, tuple] = {}
+
+        # Concurrent fetching: requests still running past their timeout, and
+        # {symbol: (consecutive failures, monotonic time of next attempt)}
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(1, min(len(self._pairs),
+                                   config.get("trading.fetch_workers", DEFAULT_FETCH_WORKERS))),
+            thread_name_prefix="ohlcv-fetch",
+        )
+        self._backoff_base = config.get(
+            "trading.fetch_backoff_seconds", DEFAULT_FETCH_BACKOFF_SECONDS
+        )
+        self._inflight: dict[str, Future] = {}
+        self._fetch_failures: dict[str, tuple[int, float]] = {}
 
-        # APScheduler
+        # Streaming indicators: timestamp of the last closed candle fed per symbol
+        self._streaming = config.get("trading.streaming_indicators", True)
+        self._streamed_until: dict[str, float] = {}
+
+        # APScheduler; ticks of either kind never overlap
         self._scheduler = BackgroundScheduler()
+        self._tick_lock = threading.Lock()
+
+        # Called with "tick" or "price" at the end of every tick (dashboard push)
+        self._tick_listeners: list[Callable[[str], None]] = []
+        # Bumped at the end of every tick and on a strategy change; see state_version
+        self._version = 0
 
     def start(self):
         """Start the trading engine."""
         logger.info("Starting trading engine...")
+
+        # Schedule periodic ticks; an invalid mode fails before anything runs
+        mode = self._config.get("scheduler.mode", DEFAULT_SCHEDULER_MODE)
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"Unknown scheduler mode: {mode}. "
+                             f"Available: {list(SCHEDULER_MODES)}")
+        if mode == "candle_close":
+            schedule = self._schedule_candle_close()
+        else:
+            interval = self._config.get("scheduler.interval_seconds", 60)
+            self._scheduler.add_job(
+                self._tick, "interval", seconds=interval, id="trading_tick",
+                max_instances=1, coalesce=True,
+            )
+            schedule = f"interval: {interval}s"
+
         self._running = True
 
         # Initial data fetch
         self._tick()
 
-        # Schedule periodic ticks
-        interval = self._config.get("scheduler.interval_seconds", 60)
-        self._scheduler.add_job(
-            self._tick, "interval", seconds=interval, id="trading_tick",
-            max_instances=1, coalesce=True,
-        )
         self._scheduler.start()
         logger.info(
             f"Trading engine started. Strategy: {self._strategy.name}, "
             f"pairs: {self._pairs}, timeframe: {self._timeframe}, "
-            f"interval: {interval}s"
+            f"{schedule}"
+        )
+
+    def _schedule_candle_close(self) -> str:
+        """Strategy tick at every candle close, price-only ticks in between."""
+        timeframe_seconds = ccxt.Exchange.parse_timeframe(self._timeframe)
+        settle = self._config.get("scheduler.settle_seconds", DEFAULT_SETTLE_SECONDS)
+        price_interval = self._config.get(
+            "scheduler.price_interval_seconds", DEFAULT_PRICE_INTERVAL_SECONDS
         )
+        self._scheduler.add_job(
+            self._tick, "interval", seconds=timeframe_seconds,
+            start_date=next_candle_close(timeframe_seconds, settle, time.time()),
+            id="trading_tick", max_instances=1, coalesce=True,
+        )
+        self._scheduler.add_job(
+            self._price_tick, "interval", seconds=price_interval, id="price_tick",
+            max_instances=1, coalesce=True,
+        )
+        return (f"strategy at each {self._timeframe} close +{settle}s, "
+                f"prices every {price_interval}s")
 
     def stop(self):
         """Stop the trading engine gracefully."""
@@ -86,6 +204,8 @@ class TradingEngine:
         self._running = False
         if self._scheduler.running:
             self._scheduler.shutdown(wait=True)
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._portfolio.close()
         logger.info("Trading engine stopped.")
 
     def _tick(self):
@@ -93,77 +213,246 @@ class TradingEngine:
         if not self._running:
             return
 
-        try:
-            # 1. Fetch current prices and OHLCV data
-            self._fetch_all_data()
-
-            if not self._current_prices:
-                logger.warning("No price data available, skipping tick")
-                return
-
-            # 2. Update portfolio positions with latest prices
-            self._portfolio.update_positions(self._current_prices)
-
-            # 3. Check pending limit/stop-loss orders
-            self._portfolio.check_pending_orders(self._current_prices)
-
-            # 4. Run strategy to generate signals
-            current_positions = {
-                symbol: self._portfolio.get_position(symbol)
-                for symbol in self._pairs
-            }
-            signals = self._strategy.generate_signals(
-                self._ohlcv_data, current_positions
-            )
+        with self._tick_lock, self._metrics.timer("tick_seconds", kind="tick"):
+            phase = self._phase_timer("tick")
+            try:
+                # 1. Fetch current prices and OHLCV data
+                with phase("fetch"):
+                    self._fetch_all_data()
+
+                if not self._current_prices:
+                    logger.warning("No price data available, skipping tick")
+                    return
+
+                # 2. Update portfolio positions with latest prices
+                with phase("update_positions"):
+                    self._portfolio.update_positions(self._current_prices)
+
+                # 3. Check pending limit/stop-loss orders
+                with phase("check_pending_orders"):
+                    self._portfolio.check_pending_orders(self._current_prices)
+
+                # 4. Run strategy to generate signals
+                with phase("generate_signals"):
+                    current_positions = {
+                        symbol: self._portfolio.get_position(symbol)
+                        for symbol in self._pairs
+                    }
+                    if self._streaming and self._strategy.supports_streaming:
+                        signals = self._stream_signals(current_positions)
+                    else:
+                        signals = self._strategy.generate_signals(
+                            self.ohlcv_data, current_positions
+                        )
+
+                # 5. Execute signals
+                with phase("execute"):
+                    for signal in signals:
+                        self._execute_signal(signal)
+
+                # 6. Take portfolio snapshot
+                with phase("snapshot"):
+                    self._portfolio.take_snapshot(self._current_prices)
 
-            # 5. Execute signals
-            for signal in signals:
-                self._execute_signal(signal)
+            except Exception as e:
+                logger.error(f"Error in trading tick: {e}", exc_info=True)
+            finally:
+                with phase("commit"):
+                    self._commit()
+                self._version += 1
+                with phase("notify"):
+                    self._notify_listeners("tick")
+
+    def _price_tick(self):
+        """Price-only pass between candle closes: SL/TP, pending orders, snapshot.
+
+        One ticker request covers every pair, instead of a candle fetch per pair.
+        """
+        if not self._running:
+            return
 
-            # 6. Take portfolio snapshot
-            self._portfolio.take_snapshot(self._current_prices)
+        with self._tick_lock, self._metrics.timer("tick_seconds", kind="price"):
+            phase = self._phase_timer("price")
+            try:
+                with phase("fetch"):
+                    self._fetch_prices()
+                if not self._current_prices:
+                    return
+                with phase("update_positions"):
+                    self._portfolio.update_positions(self._current_prices)
+                with phase("check_pending_orders"):
+                    self._portfolio.check_pending_orders(self._current_prices)
+                with phase("snapshot"):
+                    self._portfolio.take_snapshot(self._current_prices)
+            except Exception as e:
+                logger.error(f"Error in price tick: {e}", exc_info=True)
+            finally:
+                with phase("commit"):
+                    self._commit()
+                self._version += 1
+                with phase("notify"):
+                    self._notify_listeners("price")
+
+    def _commit(self):
+        """End the tick's ledger transaction; stop trading if it can no longer be saved."""
+        try:
+            self._portfolio.commit()
+        except LedgerWriteError as e:
+            if self._running:
+                logger.critical(f"Portfolio can no longer be saved, trading halted: {e}")
+            self._ledger_error = str(e)
+            self._running = False
+
+    def _phase_timer(self, kind: str) -> Callable:
+        """phase(name) -> a `with` block timed as tick_phase_seconds{kind, phase}."""
+        return lambda name: self._metrics.timer("tick_phase_seconds", kind=kind, phase=name)
+
+    def add_tick_listener(self, listener: Callable[[str], None]):
+        """Call `listener(kind)` after every tick ("tick" or "price").
+
+        Listeners run on the engine thread while the tick lock is held, so they
+        see the state the tick left behind; keep them cheap.
+        """
+        self._tick_listeners.append(listener)
+
+    def _notify_listeners(self, kind: str):
+        for listener in self._tick_listeners:
+            try:
+                listener(kind)
+            except Exception as e:
+                logger.error(f"Error in tick listener: {e}", exc_info=True)
 
-        except Exception as e:
-            logger.error(f"Error in trading tick: {e}", exc_info=True)
+    def _fetch_prices(self):
+        """Update current prices from the exchange's last traded prices."""
+        try:
+            limiter_for(self._exchange).acquire()
+            tickers = self._exchange.fetch_tickers(self._pairs)
+        except ccxt.BaseError as e:
+            logger.warning(f"Error fetching tickers: {e}")
+            return
+        for symbol in self._pairs:
+            last = (tickers.get(symbol) or {}).get("last")
+            if last is not None:
+                self._current_prices[symbol] = float(last)
+
+    def _stream_signals(self, current_positions: dict) -> list:
+        """Signals from the strategy's streaming indicators.
+
+        The last buffered candle is still forming, so only the candles before
+        it are fed to the strategy, each closed candle exactly once. The stream
+        is reseeded from the buffer on first use, or when candles were missed.
+        """
+        signals = []
+        for symbol, buffer in self._buffers.items():
+            if len(buffer) < 3:
+                continue
+            timestamps = buffer.column("timestamp")[:-1]
+            closes = buffer.column("close")[:-1]
+            seen = self._streamed_until.get(symbol)
+
+            if seen is None or seen < timestamps[0]:
+                self._strategy.reset_stream(symbol)
+                start = 0
+            else:
+                start = int(np.searchsorted(timestamps, seen, side="right"))
+
+            if start == len(closes):
+                signals.extend(self._strategy.stream_signals(symbol, current_positions))
+                continue
+
+            self._strategy.update_stream(symbol, closes[start:-1])
+            signals.extend(self._strategy.on_candle(symbol, closes[-1], current_positions))
+            self._streamed_until[symbol] = float(timestamps[-1])
+        return signals
 
     def _fetch_all_data(self):
-        """Fetch OHLCV data for all configured pairs."""
+        """Refresh every pair's candle buffer with the candles since its last one.
+
+        Pairs are fetched concurrently and each gets fetch_timeout_seconds, so
+        a tick takes as long as its slowest healthy pair. A pair that fails or
+        times out keeps its previous data and is skipped until its backoff
+        expires; one that is still stuck on an earlier request is skipped too.
+        """
+        deadline = time.monotonic() + self._fetch_timeout
+        futures = {}
         for symbol in self._pairs:
-            df = self._fetch_ohlcv(symbol, self._timeframe)
-            if df is not None:
-                self._ohlcv_data[symbol] = df
-                self._current_prices[symbol] = float(df.iloc[-1]["close"])
-
-    def _fetch_ohlcv(self, symbol: str, timeframe: str,
-                     limit: int = 100, retries: int = 3,
-                     delay: float = 5.0) -> Optional[pd.DataFrame]:
-        """Fetch OHLCV data with retry logic (adapted from v1 pattern)."""
-        for attempt in range(retries):
+            if symbol in self._inflight or self._backing_off(symbol):
+                continue
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._buffers[symbol] = CandleBuffer(self._buffer_size)
+
+            since = buffer.last_timestamp
+            if since is not None and self._is_stale(since):
+                since = None  # too far behind to catch up; refill the buffer
+            futures[symbol] = self._inflight[symbol] = self._fetch_pool.submit(
+                self._fetch_ohlcv, symbol, self._timeframe, since,
+                self._buffer_size if since is None else None,
+            )
+
+        for symbol, future in futures.items():
             try:
+                candles = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except TimeoutError:
+                logger.warning(f"Timed out fetching {symbol} after {self._fetch_timeout}s")
+                self._record_fetch_failure(symbol)
+                # Keep the pair out of later ticks until this request returns
+                future.add_done_callback(lambda _, s=symbol: self._inflight.pop(s, None))
+                continue
+            self._inflight.pop(symbol, None)
+
+            if not candles:
+                self._record_fetch_failure(symbol)
+                continue
+            self._fetch_failures.pop(symbol, None)
+            buffer = self._buffers[symbol]
+            with self._data_lock:
+                buffer.update(candles)
+            self._current_prices[symbol] = float(buffer.column("close")[-1])
+
+    def _backing_off(self, symbol: str) -> bool:
+        failure = self._fetch_failures.get(symbol)
+        return failure is not None and time.monotonic() < failure[1]
+
+    def _record_fetch_failure(self, symbol: str):
+        """Skip the pair for backoff seconds, doubling with each consecutive failure."""
+        failures = self._fetch_failures.get(symbol, (0, 0.0))[0] + 1
+        backoff = min(self._backoff_base * 2 ** (failures - 1), MAX_FETCH_BACKOFF_SECONDS)
+        self._fetch_failures[symbol] = (failures, time.monotonic() + backoff)
+        logger.warning(f"Backing off {symbol} for {backoff:.0f}s "
+                       f"({failures} consecutive failures)")
+
+    def _is_stale(self, since_ms: float) -> bool:
+        """Whether more than a full buffer of candles has closed since since_ms."""
+        timeframe_ms = ccxt.Exchange.parse_timeframe(self._timeframe) * 1000
+        return time.time() * 1000 - since_ms > self._buffer_size * timeframe_ms
+
+    def _fetch_ohlcv(self, symbol: str, timeframe: str, since: Optional[int] = None,
+                     limit: Optional[int] = DEFAULT_CANDLE_BUFFER_SIZE) -> Optional[list]:
+        """Fetch raw OHLCV rows in one attempt; None on failure.
+
+        since: Only candles from this timestamp (ms) on, including the last
+               stored one so a still-forming candle gets its final values.
+        Retrying is left to the caller's backoff so no worker sleeps.
+        """
+        try:
+            limiter_for(self._exchange).acquire()
+            # Timed after the rate limiter: the exchange's time, not our pacing
+            with self._metrics.timer("fetch_seconds", symbol=symbol):
                 candles = self._exchange.fetch_ohlcv(
-                    symbol, timeframe, limit=limit
+                    symbol, timeframe, since=since, limit=limit
                 )
-                if not candles:
-                    logger.warning(f"No data received for {symbol}")
-                    return None
-
-                df = pd.DataFrame(candles, columns=[
-                    "timestamp", "open", "high", "low", "close", "volume"
-                ])
-                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-                return df
-
-            except ccxt.NetworkError as e:
-                logger.warning(f"Network error fetching {symbol}: {e}")
-            except ccxt.ExchangeError as e:
-                logger.error(f"Exchange error fetching {symbol}: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error fetching {symbol}: {e}")
-
-            if attempt < retries - 1:
-                time.sleep(delay)
-
-        logger.error(f"Max retries reached fetching {symbol}")
+            if not candles:
+                logger.warning(f"No data received for {symbol}")
+                return None
+            return candles
+
+        except ccxt.NetworkError as e:
+            logger.warning(f"Network error fetching {symbol}: {e}")
+        except ccxt.ExchangeError as e:
+            logger.error(f"Exchange error fetching {symbol}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching {symbol}: {e}")
         return None
 
     def _execute_signal(self, signal):
@@ -200,11 +489,10 @@ class TradingEngine:
         if signal.side == OrderSide.BUY and order and order.status.value == "filled":
             sl_pct = self._config.get("risk_management.stop_loss_pct", 0.03)
             tp_pct = self._config.get("risk_management.take_profit_pct", 0.06)
-            position = self._portfolio.get_position(signal.symbol)
+            position = self._portfolio.set_exit_levels(
+                signal.symbol, current_price * (1 - sl_pct), current_price * (1 + tp_pct)
+            )
             if position:
-                position.stop_loss_price = current_price * (1 - sl_pct)
-                position.take_profit_price = current_price * (1 + tp_pct)
-                self._db.update_position(position)
                 logger.info(
                     f"Set SL={position.stop_loss_price:.4f}, "
                     f"TP={position.take_profit_price:.4f} for {signal.symbol}"
@@ -212,6 +500,10 @@ class TradingEngine:
 
     # --- Public accessors for dashboard ---
 
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
     @property
     def portfolio(self) -> Portfolio:
         return self._portfolio
@@ -224,19 +516,62 @@ class TradingEngine:
     def is_running(self) -> bool:
         return self._running
 
+    @property
+    def ledger_error(self) -> Optional[str]:
+        """Why the portfolio's writes failed and trading halted, if they did."""
+        return self._ledger_error
+
+    @property
+    def state_version(self) -> tuple[int, int]:
+        """(ticks and strategy changes, database commits): changes with anything the dashboard shows.
+
+        Fills reach the second half when their writes are committed, so with
+        write-behind it moves once they are readable.
+        """
+        return self._version, self._db.version
+
     @property
     def current_prices(self) -> dict[str, float]:
         return dict(self._current_prices)
 
     @property
     def ohlcv_data(self) -> dict[str, pd.DataFrame]:
-        return dict(self._ohlcv_data)
+        frames = {symbol: self._frame(symbol) for symbol in self._buffers}
+        return {symbol: frame[1] for symbol, frame in frames.items() if frame is not None}
+
+    def _frame(self, symbol: str) -> Optional[tuple[int, pd.DataFrame]]:
+        """(buffer version, OHLCV DataFrame) of a pair, built once per buffer version."""
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return None
+        with self._data_lock:
+            cached = self._frames.get(symbol)
+            if cached is not None and cached[0] == buffer.version:
+                return cached
+            if len(buffer) == 0:
+                return None
+            # One copy of the candles, so the frame stays valid as the buffer
+            # moves on; indicator frames built from it share its columns
+            df = ohlcv_frame(buffer.view())
+            self._frames[symbol] = (buffer.version, df)
+            return self._frames[symbol]
 
     def get_pair_data(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Get OHLCV data with indicators computed (for charting)."""
-        df = self._ohlcv_data.get(symbol)
-        if df is not None:
-            df = self._strategy.calculate_indicators(df.copy())
+        """Get OHLCV data with indicators computed (for charting).
+
+        Served from the pair's buffer and recomputed only when a tick has
+        changed it (or the strategy was swapped); treat the result as read-only.
+        """
+        frame = self._frame(symbol)
+        if frame is None:
+            return None
+        version, df = frame
+        strategy = self._strategy
+        cached = self._pair_data.get(symbol)
+        if cached is not None and cached[0] == version and cached[1] is strategy:
+            return cached[2]
+        df = strategy.calculate_indicators(df, symbol)
+        self._pair_data[symbol] = (version, strategy, df)
         return df
 
     def change_strategy(self, strategy_name: str, params: dict = None):
@@ -248,4 +583,7 @@ class TradingEngine:
             if params:
                 self._config._data["strategy"][strategy_name] = params
             self._strategy = create_strategy(self._config)
+            self._strategy.indicator_graphs = self._indicator_graphs
+            self._streamed_until.clear()
+            self._version += 1
             logger.info(f"Strategy changed to {strategy_name}")
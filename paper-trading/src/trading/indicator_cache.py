@@ -0,0 +1,133 @@
+"""LRU memoization of indicator series across backtest runs.
+
+Sweep combinations re-run the same strategy over the same candles with
+different parameters, so an EMA(10) over BTC/USDT is identical for every
+combination that shares ema_period=10. Entries are keyed by
+(symbol, data fingerprint, indicator name, params) and bounded by total bytes.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_MB = 256
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the candles an indicator is computed from."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(df)).encode())
+    h.update(np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64)).tobytes())
+    if "timestamp" in df:
+        h.update(np.ascontiguousarray(df["timestamp"].to_numpy(dtype="datetime64[ns]")).tobytes())
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """Thread-safe LRU cache of read-only indicator arrays."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, symbol: str, data_fingerprint: str, name: str,
+                       params: dict, compute: Callable[[], pd.Series]) -> np.ndarray:
+        """Return the cached array for this key, computing and storing it on a miss."""
+        key = (symbol, data_fingerprint, name, tuple(sorted(params.items())))
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+
+        values = np.asarray(compute(), dtype=np.float64)
+        values.flags.writeable = False
+
+        with self._lock:
+            if key not in self._entries and values.nbytes <= self._max_bytes:
+                self._entries[key] = values
+                self._bytes += values.nbytes
+                while self._bytes > self._max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+                    self.evictions += 1
+        return values
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class CountedCache:
+    """A view of an IndicatorCache that counts only its own lookups.
+
+    The shared cache's counters include every concurrent backtest; a sweep
+    hands each of its runs one of these to report just its own hits/misses.
+    """
+
+    def __init__(self, cache: IndicatorCache):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, symbol: str, data_fingerprint: str, name: str,
+                       params: dict, compute: Callable[[], pd.Series]) -> np.ndarray:
+        computed = []
+
+        def counted_compute():
+            computed.append(True)
+            return compute()
+
+        values = self._cache.get_or_compute(symbol, data_fingerprint, name, params,
+                                            counted_compute)
+        with self._lock:
+            if computed:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return values
+
+
+def get_shared_cache(config=None) -> Optional[IndicatorCache]:
+    """Process-wide cache used by backtests. None if disabled in config.
+
+    Sized from backtesting.indicator_cache_mb on first use; 0 disables it.
+    """
+    global _shared_cache
+    size_mb = DEFAULT_CACHE_MB
+    if config is not None:
+        size_mb = config.get("backtesting.indicator_cache_mb", DEFAULT_CACHE_MB)
+    if not size_mb:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = IndicatorCache(max_bytes=int(size_mb * 1024 * 1024))
+        return _shared_cache
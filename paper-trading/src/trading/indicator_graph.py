@@ -0,0 +1,191 @@
+"""Declarative indicator specs, computed once per OHLCV frame.
+
+Strategies declare the indicators they read as {column: IndicatorSpec}
+instead of computing them. An IndicatorGraph over one frame resolves those
+specs into nodes keyed by (kind, window, source), so an EMA(10) requested by
+two strategies, or by signal generation and then by charting, is computed
+once. A spec's source is a frame column or another spec, which makes
+indicators of indicators (e.g. an SMA of RSI) nodes of the same graph.
+
+IndicatorGraphs keeps the latest graph per symbol: the live engine shares
+it between the tick and the dashboard, and it survives strategy swaps.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .indicator_cache import IndicatorCache, fingerprint
+
+KERNELS = {
+    "ema": indicators.ema,
+    "sma": indicators.sma,
+    "rsi": indicators.rsi,
+    "wilder": indicators.wilder,
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """An indicator kernel over a frame column or over another spec's output."""
+
+    kind: str
+    window: int
+    source: Union[str, "IndicatorSpec"] = "close"
+
+    def __post_init__(self):
+        if self.kind not in KERNELS:
+            raise ValueError(f"Unknown indicator: {self.kind}. "
+                             f"Available: {list(KERNELS.keys())}")
+        if self.window < 1:
+            raise ValueError(f"Indicator window must be at least 1, got {self.window}")
+
+    @property
+    def column(self) -> str:
+        """The frame column at the root of this spec's sources."""
+        return self.source if isinstance(self.source, str) else self.source.column
+
+    @property
+    def label(self) -> str:
+        """Readable node name, e.g. "sma(rsi(close, 14), 5)"."""
+        source = self.source if isinstance(self.source, str) else self.source.label
+        return f"{self.kind}({source}, {self.window})"
+
+    def cache_params(self) -> dict:
+        """Params identifying this node in an IndicatorCache (window, plus any non-close source)."""
+        params = {"window": self.window}
+        if self.source != "close":
+            params["source"] = self.source if isinstance(self.source, str) else self.source.label
+        return params
+
+
+def _apply(spec: IndicatorSpec, source: np.ndarray) -> np.ndarray:
+    """Run the spec's kernel from the source's first non-NaN value onwards.
+
+    Indicator sources (e.g. an RSI) start with NaN warmup values the kernels
+    do not accept; like pandas rolling/ewm, the output starts where they end.
+    """
+    kernel = KERNELS[spec.kind]
+    valid = ~np.isnan(source)
+    if len(source) == 0 or valid[0]:
+        return kernel(source, spec.window)
+    out = np.full(len(source), np.nan)
+    if valid.any():
+        start = int(np.argmax(valid))
+        kernel(source[start:], spec.window, out=out[start:])
+    return out
+
+
+class IndicatorGraph:
+    """Indicator nodes over one OHLCV frame, each computed at most once.
+
+    Values are read-only float64 arrays shared by every caller. With an
+    IndicatorCache and a symbol, nodes rooted at the close column are also
+    looked up in (and stored to) the cache, which is keyed by a fingerprint of
+    the closes, so they carry over between frames with identical candles.
+    """
+
+    def __init__(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                 cache: Optional[IndicatorCache] = None):
+        self.frame = df
+        self.symbol = symbol
+        self._cache = cache if symbol is not None else None
+        self._fingerprint: Optional[str] = None
+        self._nodes: dict[IndicatorSpec, np.ndarray] = {}
+        # Series over the nodes, kept so copy-on-write sees frames built from
+        # them as sharing the (read-only) arrays and copies before a write
+        self._series: dict[IndicatorSpec, pd.Series] = {}
+        # Reentrant: resolving a spec resolves its source spec first
+        self._lock = threading.RLock()
+        self.computed = 0
+        self.reused = 0
+
+    def values(self, spec: IndicatorSpec) -> np.ndarray:
+        """The node's values, computing it (and its sources) on first use."""
+        with self._lock:
+            values = self._nodes.get(spec)
+            if values is not None:
+                self.reused += 1
+                return values
+            source = self._source(spec.source)
+            if self._cache is None or spec.column != "close":
+                values = _apply(spec, source)
+                values.flags.writeable = False
+            else:
+                if self._fingerprint is None:
+                    self._fingerprint = fingerprint(self.frame)
+                values = self._cache.get_or_compute(
+                    self.symbol, self._fingerprint, spec.kind, spec.cache_params(),
+                    lambda: _apply(spec, source),
+                )
+            self._nodes[spec] = values
+            self.computed += 1
+            return values
+
+    def _source(self, source) -> np.ndarray:
+        if isinstance(source, IndicatorSpec):
+            return self.values(source)
+        return self.frame[source].to_numpy(dtype=np.float64)
+
+    def columns(self, specs: dict) -> dict[str, np.ndarray]:
+        """{column: values} for a {column: IndicatorSpec} declaration."""
+        return {column: self.values(spec) for column, spec in specs.items()}
+
+    def with_indicators(self, specs: dict) -> pd.DataFrame:
+        """A new DataFrame: the frame's columns plus an overlay of the declared specs.
+
+        With copy-on-write (pandas >= 3, or pandas 2 after the entry point
+        called candle_store.enable_copy_on_write()) neither side is copied:
+        the OHLCV columns are the frame's own buffers and the indicator columns
+        are the graph's node arrays, so frames for several strategies cost
+        only the nodes they share, and writes to the result copy first.
+        Without it, pd.concat copies both into the result.
+        """
+        overlay = [self._node_series(spec).rename(column) for column, spec in specs.items()]
+        base = self.frame
+        replaced = base.columns.intersection(list(specs))
+        if len(replaced):
+            base = base.drop(columns=replaced)
+        return pd.concat([base, *overlay], axis=1)
+
+    def _node_series(self, spec: IndicatorSpec) -> pd.Series:
+        values = self.values(spec)
+        with self._lock:
+            series = self._series.get(spec)
+            if series is None:
+                series = pd.Series(values, index=self.frame.index, copy=False)
+                self._series[spec] = series
+            return series
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"nodes": len(self._nodes), "computed": self.computed, "reused": self.reused}
+
+
+class IndicatorGraphs:
+    """The latest IndicatorGraph per symbol.
+
+    A graph is reused for as long as callers pass the very frame object it was
+    built on; a new frame (e.g. after a tick moved the candle buffer) replaces it.
+    """
+
+    def __init__(self):
+        self._graphs: dict[Optional[str], IndicatorGraph] = {}
+        self._lock = threading.Lock()
+
+    def get(self, df: pd.DataFrame, symbol: Optional[str] = None,
+            cache: Optional[IndicatorCache] = None) -> IndicatorGraph:
+        with self._lock:
+            graph = self._graphs.get(symbol)
+            if graph is None or graph.frame is not df:
+                graph = IndicatorGraph(df, symbol, cache)
+                self._graphs[symbol] = graph
+            return graph
+
+    def clear(self):
+        with self._lock:
+            self._graphs.clear()
@@ -0,0 +1,178 @@
+"""Batch indicator kernels on float64 NumPy arrays.
+
+The whole-series counterparts of streaming.py, used by calculate_indicators
+for live ticks, backtests and sweeps. Outputs follow the same `ta` batch
+definitions, NaN until `window` values have been seen:
+
+- EMA: ewm(span=window, adjust=False), seeded with the first value
+- SMA: rolling(window).mean()
+- Wilder smoothing: ewm(alpha=1/window, adjust=False)
+- RSI: Wilder-smoothed gains/losses, 100 when there are no losses
+
+Every kernel takes an optional `out` array of the input's length and writes
+into it instead of allocating, so repeated runs (sweeps, the live buffer)
+can reuse their buffers. `out` must not overlap the input. Inputs must be
+finite: unlike pandas, NaNs are not skipped.
+
+Running sums are computed in blocks to avoid per-element Python loops.
+Within a block, the exponential recursion y[j] = d^(j+1) * carry +
+alpha * sum(d^(j-k) * x[k]) is one cumsum scaled by powers of d; only the
+block carries are chained in Python. Each block is summed relative to its
+first value, so rounding scales with how far prices move within a block
+rather than with the price level, and blocks are short enough that the
+powers of d stay far from overflow.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+# Longest block of one cumsum; bounds the accumulated rounding error
+BLOCK_SIZE = 256
+# Largest d^-k used within a block (well inside float64 range)
+_MAX_POWER_LOG = 300.0
+
+
+def _prepare(values, out: Optional[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise ValueError(f"Indicator input must be 1-D, got shape {values.shape}")
+    if out is None:
+        return values, np.empty(len(values))
+    if out.shape != values.shape or out.dtype != np.float64:
+        raise ValueError(
+            f"Output buffer must be float64 with shape {values.shape}, "
+            f"got {out.dtype} {out.shape}"
+        )
+    if np.shares_memory(values, out):
+        raise ValueError("Output buffer must not overlap the input")
+    return values, out
+
+
+def _check_window(window: int):
+    if window < 1:
+        raise ValueError(f"Indicator window must be at least 1, got {window}")
+
+
+def exponential_smoothing(values, alpha: float, min_periods: int = 1,
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+    """y[0] = x[0], y[t] = alpha * x[t] + (1 - alpha) * y[t-1]; NaN before min_periods values."""
+    values, out = _prepare(values, out)
+    n = len(values)
+    if n == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+    else:
+        block = int(min(BLOCK_SIZE, n, max(1, _MAX_POWER_LOG // -math.log(decay))))
+        powers = np.exp(-math.log(decay) * np.arange(block))  # d^-k
+        full = n - n % block
+        carry = values[0]  # d * x[0] + alpha * x[0] == x[0]
+        if full:
+            grid = out[:full].reshape(-1, block)
+            centers = values[:full:block]
+            np.subtract(values[:full].reshape(-1, block), centers[:, None], out=grid)
+            grid *= powers
+            np.cumsum(grid, axis=1, out=grid)
+            grid *= alpha
+            # A block's values are center + d^(j+1) * (carry - center) + its own part
+            ends = (grid[:, -1] / powers[-1]).tolist()
+            carries = np.empty(len(ends))
+            chained = decay ** block
+            for row, (end, center) in enumerate(zip(ends, centers.tolist())):
+                carries[row] = carry
+                carry = center + chained * (carry - center) + end
+            grid += decay * (carries - centers)[:, None]
+            grid /= powers
+            grid += centers[:, None]
+        if full < n:
+            center = values[full]
+            tail = out[full:]
+            np.subtract(values[full:], center, out=tail)
+            tail *= powers[:n - full]
+            np.cumsum(tail, out=tail)
+            tail *= alpha
+            tail += decay * (carry - center)
+            tail /= powers[:n - full]
+            tail += center
+    out[:min(max(min_periods - 1, 0), n)] = np.nan
+    return out
+
+
+def ema(values, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    _check_window(window)
+    return exponential_smoothing(values, 2.0 / (window + 1), window, out)
+
+
+def wilder(values, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    _check_window(window)
+    return exponential_smoothing(values, 1.0 / window, window, out)
+
+
+def sma(values, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rolling mean: differences of cumsums restarted every BLOCK_SIZE values."""
+    _check_window(window)
+    values, out = _prepare(values, out)
+    n = len(values)
+    out[:min(window - 1, n)] = np.nan
+    if n < window:
+        return out
+    block = max(BLOCK_SIZE, window)
+    full = n - n % block
+    rows = full // block
+    centers = values[::block]
+    # local[i] = sum of (value - block center) from the start of i's block through i
+    local = np.empty(n)
+    if full:
+        grid = local[:full].reshape(-1, block)
+        np.subtract(values[:full].reshape(-1, block), centers[:rows, None], out=grid)
+        np.cumsum(grid, axis=1, out=grid)
+    if full < n:
+        np.subtract(values[full:], centers[-1], out=local[full:])
+        np.cumsum(local[full:], out=local[full:])
+    totals = local[block - 1::block]
+
+    sums = out[window - 1:]
+    sums[:] = local[window - 1:]
+    out[window:] -= local[:n - window]
+    # The first `window` sums of each later block reach back into the previous
+    # block: add back that block's total, moved from its center to this one
+    # for the w - 1 - j values taken from it
+    taken = np.arange(window - 1, -1, -1, dtype=np.float64)
+    if rows > 1:
+        shift = (centers[:rows - 1] - centers[1:rows])[:, None] * taken
+        out[block:full].reshape(-1, block)[:, :window] += totals[:rows - 1, None] + shift
+    if rows and full < n:
+        size = min(window, n - full)
+        out[full:full + size] += totals[rows - 1] + (centers[rows - 1] - centers[rows]) * taken[:size]
+    sums /= window
+    if full:
+        out[:full].reshape(-1, block)[:, :] += centers[:rows, None]
+    out[full:] += centers[-1] if full < n else 0.0
+    return out
+
+
+def rsi(values, window: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    _check_window(window)
+    values, out = _prepare(values, out)
+    n = len(values)
+    if n == 0:
+        return out
+    # ta treats the first (undefined) change as no gain and no loss
+    change = np.empty(n)
+    change[0] = 0.0
+    np.subtract(values[1:], values[:-1], out=change[1:])
+    gain = wilder(np.maximum(change, 0.0), window)
+    np.negative(change, out=change)
+    np.maximum(change, 0.0, out=change)
+    loss = wilder(change, window, out=out)
+    no_loss = loss == 0
+    # out holds the average loss: 100 - 100 / (1 + gain / loss), in place
+    np.divide(gain, loss, out=out, where=~no_loss)
+    out += 1.0
+    np.divide(100.0, out, out=out)
+    np.subtract(100.0, out, out=out)
+    out[no_loss] = 100.0
+    return out
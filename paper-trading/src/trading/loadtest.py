@@ -0,0 +1,130 @@
+"""Engine load test: TradingEngine against a SyntheticExchange at full speed.
+
+Every iteration closes one candle on every pair and runs one full tick,
+with no wait in between, so a run of N ticks covers N candles of market
+time in however long the engine needs. Nothing touches the network.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..data.connection import ConnectionManager
+from ..data.database import Database
+from ..data.synthetic import SyntheticExchange, make_pairs
+from ..utils.metrics import MetricsRegistry
+from .engine import DEFAULT_CANDLE_BUFFER_SIZE, TradingEngine
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+DEFAULT_LOAD_PAIRS = 50
+DEFAULT_LOAD_TICKS = 1000
+LOAD_TIMEFRAME = "1m"
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux), else None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Highest resident set size of this process so far in MB, else None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KB elsewhere
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _ms(values) -> dict:
+    return {key: round(value * 1000, 3) for key, value in values.items()}
+
+
+def run_load_test(pairs: int = DEFAULT_LOAD_PAIRS, ticks: int = DEFAULT_LOAD_TICKS,
+                  config: dict = None, seed: int = 0, db_path: str = ":memory:",
+                  trace_memory: bool = False,
+                  progress_callback: Callable[[int, int], None] = None) -> dict:
+    """Run `ticks` engine ticks over `pairs` synthetic pairs and report:
+
+    ticks_per_sec, tick latency percentiles (ms, over every tick), the p50
+    and p95 of each tick phase (ms, over the last metrics window), RSS
+    before/after/peak (MB) and, with trace_memory, the peak of Python
+    allocations (MB; tracing slows the run down).
+
+    config: dotted-key overrides of the engine settings.
+    """
+    symbols = make_pairs(pairs)
+    settings = {
+        "trading.pairs": symbols,
+        "trading.default_timeframe": LOAD_TIMEFRAME,
+        **(config or {}),
+    }
+    buffer_size = settings.get("trading.candle_buffer_size", DEFAULT_CANDLE_BUFFER_SIZE)
+    exchange = SyntheticExchange(symbols, LOAD_TIMEFRAME, seed=seed, history=buffer_size)
+
+    metrics = MetricsRegistry.from_config(settings)
+    db = Database(db_path, ConnectionManager(db_path, metrics=metrics))
+    engine = TradingEngine(settings, db, metrics=metrics)
+    engine._exchange = exchange
+    engine._running = True
+
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = rss_mb()
+    latencies = np.empty(ticks)
+    started = time.perf_counter()
+    try:
+        for i in range(ticks):
+            exchange.advance()
+            tick_start = time.perf_counter()
+            engine._tick()
+            latencies[i] = time.perf_counter() - tick_start
+            if progress_callback:
+                progress_callback(i + 1, ticks)
+        elapsed = time.perf_counter() - started
+        rss_after, rss_peak = rss_mb(), peak_rss_mb()
+        traced_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        engine.stop()
+        db.close()
+
+    phases = {}
+    for entry in metrics.snapshot()["metrics"]["tick_phase_seconds"]["series"]:
+        if entry["labels"]["kind"] == "tick":
+            phases[entry["labels"]["phase"]] = _ms({"p50": entry["p50"], "p95": entry["p95"]})
+
+    return {
+        "pairs": pairs,
+        "ticks": ticks,
+        "seconds": round(elapsed, 3),
+        "ticks_per_sec": round(ticks / elapsed, 2),
+        "latency_ms": _ms({
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(latencies.max()),
+        }),
+        "phases_ms": phases,
+        "exchange_requests": exchange.requests,
+        "open_positions": len(engine.portfolio.get_all_positions()),
+        "rss_mb": {
+            "before": rss_before and round(rss_before, 1),
+            "after": rss_after and round(rss_after, 1),
+            "peak": rss_peak and round(rss_peak, 1),
+        },
+        "traced_peak_mb": traced_peak and round(traced_peak, 1),
+    }
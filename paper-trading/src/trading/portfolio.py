@@ -2,6 +2,7 @@
 
 import logging
 import threading
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
@@ -10,36 +11,58 @@ from ..data.models import (
     OrderSide, OrderType, OrderStatus, PositionStatus,
 )
 from ..data.database import Database
+from ..data.ledger import DatabaseLedger, Ledger
+from ..utils.metrics import MetricsRegistry, TimedLock
 
 logger = logging.getLogger(__name__)
 
+# Order/trade changes kept for drain_activity() between two drains
+ACTIVITY_BUFFER_SIZE = 500
+
 
 class Portfolio:
     """
     Virtual portfolio that simulates exchange order execution.
     All paper-trade orders go through this class instead of the real exchange.
     Thread-safe: the engine thread writes, Flask threads read.
+
+    Records go to `ledger`; by default a DatabaseLedger over `db`. With
+    `metrics`, the wait for every acquisition of the portfolio lock is
+    observed as portfolio_lock_wait_seconds.
     """
 
     def __init__(self, initial_balance: float, fee_rate: float,
-                 db: Database, config):
+                 db: Database = None, config=None, ledger: Ledger = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        if ledger is None:
+            if db is None:
+                raise ValueError("Portfolio needs a db or a ledger")
+            ledger = DatabaseLedger(db)
         self._initial_balance = initial_balance
         self._cash_balance = initial_balance
         self._fee_rate = fee_rate
         self._db = db
+        self._ledger = ledger
         self._config = config
         self._positions: dict[str, Position] = {}  # symbol -> Position
         self._pending_orders: list[Order] = []
+        # Orders created or changed and trades recorded since the last drain
+        self._order_activity: deque = deque(maxlen=ACTIVITY_BUFFER_SIZE)
+        self._trade_activity: deque = deque(maxlen=ACTIVITY_BUFFER_SIZE)
         self._lock = threading.RLock()
+        if metrics is not None:
+            metrics.describe("portfolio_lock_wait_seconds",
+                             "Time spent waiting to acquire the portfolio lock")
+            self._lock = TimedLock(self._lock, metrics.histogram("portfolio_lock_wait_seconds"))
         self._restore_state()
 
     def _restore_state(self):
         """Reload open positions and pending orders from DB on restart."""
-        open_positions = self._db.get_open_positions()
+        open_positions = self._ledger.get_open_positions()
         for pos in open_positions:
             self._positions[pos.symbol] = pos
 
-        pending = self._db.get_pending_orders()
+        pending = self._ledger.get_pending_orders()
         self._pending_orders = pending
 
         # Recalculate cash: initial - cost of open positions
@@ -81,7 +104,8 @@ class Portfolio:
                 strategy_name=strategy_name,
             )
 
-            order.id = self._db.insert_order(order)
+            order.id = self._ledger.insert_order(order)
+            self._order_activity.append(order)
 
             if order_type == OrderType.MARKET:
                 if price is None:
@@ -104,7 +128,7 @@ class Portfolio:
         order.fee = fee
         order.status = OrderStatus.FILLED
 
-        self._db.update_order_status(
+        self._ledger.update_order_status(
             order.id, OrderStatus.FILLED, fill_price, order.filled_at
         )
 
@@ -116,7 +140,7 @@ class Portfolio:
                     f"need {cost:.2f}, have {self._cash_balance:.2f}"
                 )
                 order.status = OrderStatus.CANCELLED
-                self._db.update_order_status(order.id, OrderStatus.CANCELLED)
+                self._ledger.update_order_status(order.id, OrderStatus.CANCELLED)
                 return order
 
             self._cash_balance -= cost
@@ -131,7 +155,7 @@ class Portfolio:
             if position is None:
                 logger.warning(f"No open position to sell for {order.symbol}")
                 order.status = OrderStatus.CANCELLED
-                self._db.update_order_status(order.id, OrderStatus.CANCELLED)
+                self._ledger.update_order_status(order.id, OrderStatus.CANCELLED)
                 return order
 
             proceeds = fill_price * order.quantity - fee
@@ -163,7 +187,7 @@ class Portfolio:
             entry_order_id=order.id,
             exit_order_id=None,
         )
-        position.id = self._db.insert_position(position)
+        position.id = self._ledger.insert_position(position)
         self._positions[order.symbol] = position
 
     def _close_position(self, position: Position, exit_order: Order,
@@ -191,7 +215,8 @@ class Portfolio:
             strategy_name=exit_order.strategy_name,
             duration_minutes=duration,
         )
-        self._db.insert_trade_record(record)
+        record.id = self._ledger.insert_trade_record(record)
+        self._trade_activity.append(record)
 
         position.status = PositionStatus.CLOSED
         position.closed_at = now
@@ -199,10 +224,32 @@ class Portfolio:
         position.realized_pnl = pnl
         position.unrealized_pnl = 0.0
         position.current_price = exit_price
-        self._db.update_position(position)
+        self._ledger.update_position(position)
 
         del self._positions[position.symbol]
 
+    def set_exit_levels(self, symbol: str, stop_loss_price: Optional[float],
+                        take_profit_price: Optional[float]) -> Optional[Position]:
+        """Attach stop-loss/take-profit prices to the open position for symbol."""
+        with self._lock:
+            position = self._positions.get(symbol)
+            if position is None:
+                return None
+            position.stop_loss_price = stop_loss_price
+            position.take_profit_price = take_profit_price
+            self._ledger.update_position(position)
+            return position
+
+    def commit(self):
+        """Mark the end of a tick; a buffering ledger persists the tick's writes together."""
+        with self._lock:
+            self._ledger.commit()
+
+    def close(self):
+        """Persist everything still buffered by the ledger."""
+        with self._lock:
+            self._ledger.close()
+
     # --- Position sizing ---
 
     def calculate_position_size(self, symbol: str, side: OrderSide,
@@ -266,6 +313,7 @@ class Portfolio:
                     f"Pending order #{order.id} triggered at {price:.4f}"
                 )
                 self._execute_fill(order, price)
+                self._order_activity.append(order)
 
     # --- Position updates ---
 
@@ -290,7 +338,7 @@ class Portfolio:
                     updated_positions.append(position)
 
             if updated_positions:
-                self._db.update_positions_batch(updated_positions)
+                self._ledger.update_positions_batch(updated_positions)
 
     def _check_stop_loss_take_profit(self, position: Position, current_price: float):
         """Auto-close position if SL or TP is hit."""
@@ -325,15 +373,33 @@ class Portfolio:
             created_at=datetime.now(),
             strategy_name=f"auto_{reason}",
         )
-        order.id = self._db.insert_order(order)
+        order.id = self._ledger.insert_order(order)
+        self._order_activity.append(order)
         self._execute_fill(order, price)
 
     def cancel_order(self, order_id: int):
         with self._lock:
+            for order in self._pending_orders:
+                if order.id == order_id:
+                    order.status = OrderStatus.CANCELLED
+                    self._order_activity.append(order)
             self._pending_orders = [
                 o for o in self._pending_orders if o.id != order_id
             ]
-            self._db.update_order_status(order_id, OrderStatus.CANCELLED)
+            self._ledger.update_order_status(order_id, OrderStatus.CANCELLED)
+
+    def drain_activity(self) -> tuple[list[Order], list[TradeRecord]]:
+        """Orders created or changed and trades closed since the last call, oldest first.
+
+        An order changed several times appears once, in its current state.
+        Only the most recent ACTIVITY_BUFFER_SIZE of each are kept in between.
+        """
+        with self._lock:
+            orders = list({o.id: o for o in self._order_activity}.values())
+            trades = list(self._trade_activity)
+            self._order_activity.clear()
+            self._trade_activity.clear()
+        return orders, trades
 
     # --- Portfolio state ---
 
@@ -372,7 +438,7 @@ class Portfolio:
             total_pnl=total_pnl,
             total_pnl_pct=total_pnl_pct,
         )
-        self._db.insert_snapshot(snapshot)
+        self._ledger.insert_snapshot(snapshot)
 
     def get_portfolio_summary(self, current_prices: dict[str, float]) -> dict:
         positions_value = self.get_positions_value(current_prices)
@@ -391,7 +457,7 @@ class Portfolio:
         }
 
     def get_trade_history(self, limit=100) -> list[TradeRecord]:
-        return self._db.get_trade_records(limit=limit)
+        return self._ledger.get_trade_records(limit=limit)
 
     def get_performance_stats(self) -> dict:
-        return self._db.get_performance_stats()
+        return self._ledger.get_performance_stats()
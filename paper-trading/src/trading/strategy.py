@@ -2,11 +2,13 @@
 
 from abc import ABC, abstractmethod
 from typing import Optional
+import numpy as np
 import pandas as pd
-from ta.trend import EMAIndicator, SMAIndicator
-from ta.momentum import RSIIndicator
 
 from ..data.models import OrderSide
+from .indicator_cache import IndicatorCache
+from .indicator_graph import IndicatorGraph, IndicatorGraphs, IndicatorSpec
+from .streaming import StreamingEMA, StreamingRSI, StreamingSMA
 
 # Default Strategy Parameters
 DEFAULT_EMA_PERIOD = 10
@@ -31,12 +33,38 @@ class Signal:
         return f"Signal({self.side.value} {self.symbol}, strength={self.strength}, reason={self.reason})"
 
 
+def _has_position(current_positions: dict, symbol: str) -> bool:
+    return symbol in current_positions and current_positions[symbol] is not None
+
+
+def _lagged(df: pd.DataFrame, column: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return (last, prev) arrays where last[i] = x[i-1] and prev[i] = x[i-2]."""
+    values = df[column].to_numpy(dtype=np.float64)
+    last = np.full(len(values), np.nan)
+    prev = np.full(len(values), np.nan)
+    last[1:] = values[:-1]
+    prev[2:] = values[:-2]
+    return last, prev
+
+
+def _owner(cls: type, attribute: str) -> type:
+    """The class in cls's MRO that defines `attribute`."""
+    return next(klass for klass in cls.__mro__ if attribute in klass.__dict__)
+
+
 class BaseStrategy(ABC):
     """Abstract base strategy. Subclass and implement generate_signals()."""
 
     def __init__(self, name: str, config: dict):
         self.name = name
         self._config = config
+        # Optional shared cache for indicator series (set by the backtester)
+        self.indicator_cache: Optional[IndicatorCache] = None
+        # Optional per-symbol indicator graphs shared with other consumers of
+        # the same frames (set by the engine), so common nodes are computed once
+        self.indicator_graphs: Optional[IndicatorGraphs] = None
+        # Per-symbol streaming state for on_candle(): indicators + last two rows
+        self._streams: dict[str, dict] = {}
 
     @abstractmethod
     def generate_signals(self, data: dict, current_positions: dict, index: Optional[int] = None) -> list:
@@ -51,39 +79,47 @@ class BaseStrategy(ABC):
         """
         pass
 
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Override to add strategy-specific indicators to the DataFrame."""
-        return df
+    def indicator_specs(self) -> dict:
+        """{column: IndicatorSpec} of the indicators this strategy reads.
 
+        Override to declare indicators; calculate_indicators() adds them.
+        """
+        return {}
 
-class EMASMACrossoverStrategy(BaseStrategy):
-    """
-    EMA/SMA crossover strategy.
-    BUY when EMA crosses above SMA on completed candles.
-    SELL when EMA crosses below SMA.
-    Ported from v1 Bybit/MEXC bot patterns.
-    """
+    def calculate_indicators(self, df: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Return a new DataFrame with the declared indicator columns added.
 
-    def __init__(self, config: dict):
-        super().__init__("ema_sma_crossover", config)
-        self._ema_period = config.get("ema_period", DEFAULT_EMA_PERIOD)
-        self._sma_period = config.get("sma_period", DEFAULT_SMA_PERIOD)
+        symbol: Identifies the data for indicator caching. None = no caching.
+        """
+        specs = self.indicator_specs()
+        if not specs:
+            return df
+        return self.indicator_graph(df, symbol).with_indicators(specs)
 
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        ema = EMAIndicator(df["close"], window=self._ema_period)
-        sma = SMAIndicator(df["close"], window=self._sma_period)
-        df["ema"] = ema.ema_indicator()
-        df["sma"] = sma.sma_indicator()
-        return df
+    def indicator_graph(self, df: pd.DataFrame, symbol: Optional[str] = None) -> IndicatorGraph:
+        """The graph of df's indicator nodes: the shared one if indicator_graphs is set."""
+        if self.indicator_graphs is None:
+            return IndicatorGraph(df, symbol, self.indicator_cache)
+        return self.indicator_graphs.get(df, symbol, self.indicator_cache)
 
-    def generate_signals(self, data, current_positions, index: Optional[int] = None) -> list:
+    # --- Shared signal evaluation ---
+
+    def _evaluate(self, symbol: str, last, prev, has_position: bool) -> Optional[Signal]:
+        """Decide on a signal from the last two completed candles' indicator values.
+
+        last/prev: DataFrame rows or plain dicts keyed by indicator column.
+        """
+        raise NotImplementedError
+
+    def _signals_from_data(self, data: dict, current_positions: dict,
+                           index: Optional[int] = None) -> list:
+        """generate_signals() for strategies that implement _evaluate()."""
         signals = []
         for symbol, df in data.items():
             if index is None:
-                df = self.calculate_indicators(df)
                 if len(df) < 3:
                     continue
+                df = self.calculate_indicators(df, symbol)
                 # Use last two completed candles (skip current incomplete candle)
                 last = df.iloc[-2]
                 prev = df.iloc[-3]
@@ -94,34 +130,137 @@ class EMASMACrossoverStrategy(BaseStrategy):
                 last = df.iloc[index - 1]
                 prev = df.iloc[index - 2]
 
-            if pd.isna(last["ema"]) or pd.isna(last["sma"]):
-                continue
-            if pd.isna(prev["ema"]) or pd.isna(prev["sma"]):
-                continue
-
-            has_position = (
-                symbol in current_positions
-                and current_positions[symbol] is not None
-            )
-
-            # Bullish crossover: EMA was below SMA, now above
-            if prev["ema"] < prev["sma"] and last["ema"] > last["sma"]:
-                if not has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.BUY, 1.0,
-                        f"EMA{self._ema_period} crossed above SMA{self._sma_period}"
-                    ))
-
-            # Bearish crossover: EMA was above SMA, now below
-            elif prev["ema"] > prev["sma"] and last["ema"] < last["sma"]:
-                if has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.SELL, 1.0,
-                        f"EMA{self._ema_period} crossed below SMA{self._sma_period}"
-                    ))
-
+            signal = self._evaluate(symbol, last, prev, _has_position(current_positions, symbol))
+            if signal is not None:
+                signals.append(signal)
         return signals
 
+    # --- Whole-frame (backtest) path ---
+
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """int8 (entry, exit) arrays for every bar of a calculate_indicators() frame.
+
+        entry[i] / exit[i] are 1 where generate_signals(..., index=i) would
+        BUY / SELL, before position filtering (a BUY needs no position, a
+        SELL an open one). Override to let the backtester skip the per-bar path.
+        """
+        raise NotImplementedError(f"{self.name} does not generate signal arrays")
+
+    @property
+    def supports_signal_arrays(self) -> bool:
+        """True if generate_signal_arrays() is implemented and still describes the
+        per-bar rules: a subclass that overrides generate_signals() or _evaluate()
+        without also overriding generate_signal_arrays() falls back to the per-bar path.
+        """
+        cls = type(self)
+        arrays = _owner(cls, "generate_signal_arrays")
+        if arrays is BaseStrategy:
+            return False
+        return all(issubclass(arrays, _owner(cls, name))
+                   for name in ("generate_signals", "_evaluate"))
+
+    # --- Streaming (live) path ---
+
+    def _new_indicator_stream(self) -> dict:
+        """Fresh streaming indicators keyed by column name. Override to support on_candle()."""
+        raise NotImplementedError(f"{self.name} does not support streaming indicators")
+
+    @property
+    def supports_streaming(self) -> bool:
+        return type(self)._new_indicator_stream is not BaseStrategy._new_indicator_stream
+
+    def reset_stream(self, symbol: Optional[str] = None):
+        """Drop streaming state for one symbol, or for all of them."""
+        if symbol is None:
+            self._streams.clear()
+        else:
+            self._streams.pop(symbol, None)
+
+    def update_stream(self, symbol: str, closes):
+        """Feed closed candles' close prices into the symbol's streaming indicators."""
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = {"indicators": self._new_indicator_stream(), "last": None, "prev": None}
+            self._streams[symbol] = stream
+        streaming = stream["indicators"]
+        for close in closes:
+            values = {name: ind.update(float(close)) for name, ind in streaming.items()}
+            stream["prev"], stream["last"] = stream["last"], values
+
+    def on_candle(self, symbol: str, close: float, current_positions: dict) -> list:
+        """Update indicators with a newly closed candle and return its signals.
+
+        Each update is O(1), so the live tick does not recompute indicators
+        over the whole fetched window.
+        """
+        self.update_stream(symbol, (close,))
+        return self.stream_signals(symbol, current_positions)
+
+    def stream_signals(self, symbol: str, current_positions: dict) -> list:
+        """Signals for the last two candles already fed to the stream."""
+        stream = self._streams.get(symbol)
+        if stream is None or stream["prev"] is None:
+            return []
+        signal = self._evaluate(symbol, stream["last"], stream["prev"],
+                                _has_position(current_positions, symbol))
+        return [] if signal is None else [signal]
+
+
+class EMASMACrossoverStrategy(BaseStrategy):
+    """
+    EMA/SMA crossover strategy.
+    BUY when EMA crosses above SMA on completed candles.
+    SELL when EMA crosses below SMA.
+    Ported from v1 Bybit/MEXC bot patterns.
+    """
+
+    def __init__(self, config: dict):
+        super().__init__("ema_sma_crossover", config)
+        self._ema_period = config.get("ema_period", DEFAULT_EMA_PERIOD)
+        self._sma_period = config.get("sma_period", DEFAULT_SMA_PERIOD)
+
+    def indicator_specs(self) -> dict:
+        return {"ema": IndicatorSpec("ema", self._ema_period),
+                "sma": IndicatorSpec("sma", self._sma_period)}
+
+    def _new_indicator_stream(self) -> dict:
+        return {"ema": StreamingEMA(self._ema_period), "sma": StreamingSMA(self._sma_period)}
+
+    def generate_signals(self, data, current_positions, index: Optional[int] = None) -> list:
+        return self._signals_from_data(data, current_positions, index)
+
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        last_ema, prev_ema = _lagged(df, "ema")
+        last_sma, prev_sma = _lagged(df, "sma")
+        # NaN comparisons are False, so warmup bars never signal
+        entry = (prev_ema < prev_sma) & (last_ema > last_sma)
+        exit_ = ~entry & (prev_ema > prev_sma) & (last_ema < last_sma)
+        return entry.astype(np.int8), exit_.astype(np.int8)
+
+    def _evaluate(self, symbol, last, prev, has_position) -> Optional[Signal]:
+        if pd.isna(last["ema"]) or pd.isna(last["sma"]):
+            return None
+        if pd.isna(prev["ema"]) or pd.isna(prev["sma"]):
+            return None
+
+        # Bullish crossover: EMA was below SMA, now above
+        if prev["ema"] < prev["sma"] and last["ema"] > last["sma"]:
+            if not has_position:
+                return Signal(
+                    symbol, OrderSide.BUY, 1.0,
+                    f"EMA{self._ema_period} crossed above SMA{self._sma_period}"
+                )
+
+        # Bearish crossover: EMA was above SMA, now below
+        elif prev["ema"] > prev["sma"] and last["ema"] < last["sma"]:
+            if has_position:
+                return Signal(
+                    symbol, OrderSide.SELL, 1.0,
+                    f"EMA{self._ema_period} crossed below SMA{self._sma_period}"
+                )
+
+        return None
+
 
 class RSIStrategy(BaseStrategy):
     """
@@ -136,52 +275,42 @@ class RSIStrategy(BaseStrategy):
         self._overbought = config.get("overbought", DEFAULT_RSI_OVERBOUGHT)
         self._oversold = config.get("oversold", DEFAULT_RSI_OVERSOLD)
 
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        rsi = RSIIndicator(df["close"], window=self._rsi_period)
-        df["rsi"] = rsi.rsi()
-        return df
+    def indicator_specs(self) -> dict:
+        return {"rsi": IndicatorSpec("rsi", self._rsi_period)}
+
+    def _new_indicator_stream(self) -> dict:
+        return {"rsi": StreamingRSI(self._rsi_period)}
 
     def generate_signals(self, data, current_positions, index: Optional[int] = None) -> list:
-        signals = []
-        for symbol, df in data.items():
-            if index is None:
-                df = self.calculate_indicators(df)
-                if len(df) < 3:
-                    continue
-                last = df.iloc[-2]
-                prev = df.iloc[-3]
-            else:
-                if index < 2:
-                    continue
-                last = df.iloc[index - 1]
-                prev = df.iloc[index - 2]
+        return self._signals_from_data(data, current_positions, index)
 
-            if pd.isna(last["rsi"]) or pd.isna(prev["rsi"]):
-                continue
-
-            has_position = (
-                symbol in current_positions
-                and current_positions[symbol] is not None
-            )
-
-            # RSI crosses up through oversold — buy signal
-            if prev["rsi"] < self._oversold and last["rsi"] >= self._oversold:
-                if not has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.BUY, 1.0,
-                        f"RSI crossed above {self._oversold} (oversold exit)"
-                    ))
-
-            # RSI crosses down through overbought — sell signal
-            elif prev["rsi"] > self._overbought and last["rsi"] <= self._overbought:
-                if has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.SELL, 1.0,
-                        f"RSI crossed below {self._overbought} (overbought exit)"
-                    ))
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        last_rsi, prev_rsi = _lagged(df, "rsi")
+        entry = (prev_rsi < self._oversold) & (last_rsi >= self._oversold)
+        exit_ = ~entry & (prev_rsi > self._overbought) & (last_rsi <= self._overbought)
+        return entry.astype(np.int8), exit_.astype(np.int8)
 
-        return signals
+    def _evaluate(self, symbol, last, prev, has_position) -> Optional[Signal]:
+        if pd.isna(last["rsi"]) or pd.isna(prev["rsi"]):
+            return None
+
+        # RSI crosses up through oversold — buy signal
+        if prev["rsi"] < self._oversold and last["rsi"] >= self._oversold:
+            if not has_position:
+                return Signal(
+                    symbol, OrderSide.BUY, 1.0,
+                    f"RSI crossed above {self._oversold} (oversold exit)"
+                )
+
+        # RSI crosses down through overbought — sell signal
+        elif prev["rsi"] > self._overbought and last["rsi"] <= self._overbought:
+            if has_position:
+                return Signal(
+                    symbol, OrderSide.SELL, 1.0,
+                    f"RSI crossed below {self._overbought} (overbought exit)"
+                )
+
+        return None
 
 
 class CombinedStrategy(BaseStrategy):
@@ -199,59 +328,67 @@ class CombinedStrategy(BaseStrategy):
         self._rsi_overbought = config.get("rsi_overbought", DEFAULT_RSI_OVERBOUGHT)
         self._rsi_oversold = config.get("rsi_oversold", DEFAULT_RSI_OVERSOLD)
 
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        ema = EMAIndicator(df["close"], window=self._ema_period)
-        sma = SMAIndicator(df["close"], window=self._sma_period)
-        rsi = RSIIndicator(df["close"], window=self._rsi_period)
-        df["ema"] = ema.ema_indicator()
-        df["sma"] = sma.sma_indicator()
-        df["rsi"] = rsi.rsi()
-        return df
+    def indicator_specs(self) -> dict:
+        return {
+            "ema": IndicatorSpec("ema", self._ema_period),
+            "sma": IndicatorSpec("sma", self._sma_period),
+            "rsi": IndicatorSpec("rsi", self._rsi_period),
+        }
 
-    def generate_signals(self, data, current_positions, index: Optional[int] = None) -> list:
-        signals = []
-        for symbol, df in data.items():
-            if index is None:
-                df = self.calculate_indicators(df)
-                if len(df) < 3:
-                    continue
-                last = df.iloc[-2]
-                prev = df.iloc[-3]
-            else:
-                if index < 2:
-                    continue
-                last = df.iloc[index - 1]
-                prev = df.iloc[index - 2]
-
-            required = ["ema", "sma", "rsi"]
-            if any(pd.isna(last[c]) or pd.isna(prev[c]) for c in required):
-                continue
-
-            has_position = (
-                symbol in current_positions
-                and current_positions[symbol] is not None
-            )
-
-            # Bullish crossover confirmed by RSI not overbought
-            if (prev["ema"] < prev["sma"] and last["ema"] > last["sma"]
-                    and last["rsi"] < self._rsi_overbought):
-                if not has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.BUY, 1.0,
-                        f"EMA/SMA crossover + RSI={last['rsi']:.1f} (confirmed)"
-                    ))
-
-            # Bearish crossover confirmed by RSI not oversold
-            elif (prev["ema"] > prev["sma"] and last["ema"] < last["sma"]
-                    and last["rsi"] > self._rsi_oversold):
-                if has_position:
-                    signals.append(Signal(
-                        symbol, OrderSide.SELL, 1.0,
-                        f"EMA/SMA bearish crossover + RSI={last['rsi']:.1f} (confirmed)"
-                    ))
+    def _new_indicator_stream(self) -> dict:
+        return {
+            "ema": StreamingEMA(self._ema_period),
+            "sma": StreamingSMA(self._sma_period),
+            "rsi": StreamingRSI(self._rsi_period),
+        }
 
-        return signals
+    def generate_signals(self, data, current_positions, index: Optional[int] = None) -> list:
+        return self._signals_from_data(data, current_positions, index)
+
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        last_ema, prev_ema = _lagged(df, "ema")
+        last_sma, prev_sma = _lagged(df, "sma")
+        last_rsi, prev_rsi = _lagged(df, "rsi")
+        valid = ~np.isnan(np.stack([last_ema, prev_ema, last_sma, prev_sma,
+                                    last_rsi, prev_rsi])).any(axis=0)
+        entry = (valid & (prev_ema < prev_sma) & (last_ema > last_sma)
+                 & (last_rsi < self._rsi_overbought))
+        exit_ = (valid & ~entry & (prev_ema > prev_sma) & (last_ema < last_sma)
+                 & (last_rsi > self._rsi_oversold))
+        return entry.astype(np.int8), exit_.astype(np.int8)
+
+    def _evaluate(self, symbol, last, prev, has_position) -> Optional[Signal]:
+        required = ["ema", "sma", "rsi"]
+        if any(pd.isna(last[c]) or pd.isna(prev[c]) for c in required):
+            return None
+
+        # Bullish crossover confirmed by RSI not overbought
+        if (prev["ema"] < prev["sma"] and last["ema"] > last["sma"]
+                and last["rsi"] < self._rsi_overbought):
+            if not has_position:
+                return Signal(
+                    symbol, OrderSide.BUY, 1.0,
+                    f"EMA/SMA crossover + RSI={last['rsi']:.1f} (confirmed)"
+                )
+
+        # Bearish crossover confirmed by RSI not oversold
+        elif (prev["ema"] > prev["sma"] and last["ema"] < last["sma"]
+                and last["rsi"] > self._rsi_oversold):
+            if has_position:
+                return Signal(
+                    symbol, OrderSide.SELL, 1.0,
+                    f"EMA/SMA bearish crossover + RSI={last['rsi']:.1f} (confirmed)"
+                )
+
+        return None
+
+
+# Strategy classes by the name used in config and API requests
+STRATEGIES = {
+    "ema_sma_crossover": EMASMACrossoverStrategy,
+    "rsi": RSIStrategy,
+    "combined": CombinedStrategy,
+}
 
 
 def create_strategy(config) -> BaseStrategy:
@@ -259,14 +396,8 @@ def create_strategy(config) -> BaseStrategy:
     strategy_name = config.get("strategy.active", DEFAULT_ACTIVE_STRATEGY)
     strategy_config = config.get(f"strategy.{strategy_name}", {})
 
-    strategies = {
-        "ema_sma_crossover": EMASMACrossoverStrategy,
-        "rsi": RSIStrategy,
-        "combined": CombinedStrategy,
-    }
-
-    cls = strategies.get(strategy_name)
+    cls = STRATEGIES.get(strategy_name)
     if cls is None:
         raise ValueError(f"Unknown strategy: {strategy_name}. "
-                         f"Available: {list(strategies.keys())}")
+                         f"Available: {list(STRATEGIES.keys())}")
     return cls(strategy_config)
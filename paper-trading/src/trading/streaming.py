@@ -0,0 +1,101 @@
+"""Streaming indicators — O(1) updates as each candle closes.
+
+Each indicator consumes one close at a time and returns its current value,
+NaN until it has seen `window` values. The outputs follow the `ta` batch
+definitions used by calculate_indicators:
+
+- EMA: ewm(span=window, adjust=False), seeded with the first close
+- SMA: rolling(window).mean()
+- Wilder smoothing: ewm(alpha=1/window, adjust=False)
+- RSI: Wilder-smoothed gains/losses, 100 when there are no losses
+"""
+
+import math
+from collections import deque
+
+
+class ExponentialSmoothing:
+    """Recursive y = alpha * x + (1 - alpha) * y_prev, seeded with the first value."""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self._alpha = alpha
+        self._min_periods = min_periods
+        self._count = 0
+        self._value = math.nan
+
+    def update(self, x: float) -> float:
+        if self._count == 0:
+            self._value = x
+        else:
+            self._value = (1 - self._alpha) * self._value + self._alpha * x
+        self._count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._value if self._count >= self._min_periods else math.nan
+
+
+class StreamingEMA(ExponentialSmoothing):
+    def __init__(self, window: int):
+        super().__init__(2 / (window + 1), window)
+
+
+class WilderSmoothing(ExponentialSmoothing):
+    def __init__(self, window: int):
+        super().__init__(1 / window, window)
+
+
+class StreamingSMA:
+    """Rolling mean over a fixed window using a running sum.
+
+    The sum is rebuilt from the window once every `window` updates so
+    floating-point drift cannot accumulate; that keeps updates amortized O(1).
+    """
+
+    def __init__(self, window: int):
+        self._window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+        self._since_rebuild = 0
+
+    def update(self, x: float) -> float:
+        if len(self._values) == self._window:
+            self._sum -= self._values[0]
+        self._values.append(x)
+        self._sum += x
+        self._since_rebuild += 1
+        if self._since_rebuild >= self._window:
+            self._sum = math.fsum(self._values)
+            self._since_rebuild = 0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self._values) < self._window:
+            return math.nan
+        return self._sum / self._window
+
+
+class StreamingRSI:
+    def __init__(self, window: int):
+        self._gain = WilderSmoothing(window)
+        self._loss = WilderSmoothing(window)
+        self._prev_close = None
+
+    def update(self, close: float) -> float:
+        # ta treats the first (undefined) change as no gain and no loss
+        change = 0.0 if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+        self._gain.update(change if change > 0 else 0.0)
+        self._loss.update(-change if change < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        gain, loss = self._gain.value, self._loss.value
+        if math.isnan(loss):
+            return math.nan
+        if loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + gain / loss))
@@ -0,0 +1,219 @@
+"""Parameter sweeps — run one backtest per combination of a parameter grid.
+
+Historical data is fetched once by the caller and handed to a process pool
+when more than one worker is configured, so combinations run on every core
+instead of one after another in a single thread.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
+
+from ..data.candle_store import enable_copy_on_write
+from .backtester import run_backtest_simulation
+from .indicator_cache import CountedCache, get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Sweep parameters that are passed as SL/TP overrides instead of strategy params
+RISK_PARAMS = ("stop_loss_pct", "take_profit_pct")
+
+# Data shared with every combination in a worker process, set by _init_worker
+_worker_state: dict = {}
+
+
+def expand_param_ranges(param_ranges: dict) -> list[dict]:
+    """Turn {name: {"min", "max", "step"}} into a list of {name: value} combos."""
+    param_names = list(param_ranges.keys())
+    param_value_lists = []
+    for name in param_names:
+        r = param_ranges[name]
+        min_val = r["min"]
+        max_val = r["max"]
+        step = r["step"]
+        values = []
+        v = min_val
+        while v <= max_val + 1e-9:
+            values.append(round(v, 6))
+            v += step
+        param_value_lists.append(values)
+
+    return [
+        dict(zip(param_names, combo))
+        for combo in itertools.product(*param_value_lists)
+    ]
+
+
+def resolve_workers(config, total_combos: int) -> int:
+    """Worker processes to use: backtesting.sweep_workers, 0 = one per CPU core."""
+    workers = config.get("backtesting.sweep_workers", 0) or os.cpu_count() or 1
+    return max(1, min(workers, total_combos))
+
+
+def run_combination(config, strategy_name: str, symbols: list[str],
+                    timeframe: str, days: int, initial_balance: float,
+                    stop_loss_pct: float, take_profit_pct: float,
+                    base_params: dict, combo_params: dict,
+                    historical_data: dict, indicator_cache=None) -> dict:
+    """Backtest one combination and return its summary row.
+
+    indicator_cache: Cache for the run's indicators; None = the shared cache.
+    """
+    current_sl = combo_params.get("stop_loss_pct", stop_loss_pct)
+    current_tp = combo_params.get("take_profit_pct", take_profit_pct)
+
+    # Construct strategy params (exclude SL/TP from here)
+    current_strat_params = base_params.copy()
+    for k, v in combo_params.items():
+        if k not in RISK_PARAMS:
+            current_strat_params[k] = v
+
+    res = run_backtest_simulation(
+        config=config,
+        strategy_name=strategy_name,
+        strategy_params=current_strat_params,
+        symbols=symbols,
+        timeframe=timeframe,
+        days=days,
+        initial_balance=initial_balance,
+        stop_loss_pct=current_sl,
+        take_profit_pct=current_tp,
+        historical_data=historical_data,
+        log_results=False,
+        indicator_cache=indicator_cache,
+    )
+
+    # Merge SL/TP into params for result reporting
+    reported_params = current_strat_params.copy()
+    reported_params["stop_loss_pct"] = current_sl
+    reported_params["take_profit_pct"] = current_tp
+
+    return {
+        "params": reported_params,
+        "total_return_pct": res.total_return_pct,
+        "win_rate": res.win_rate,
+        "max_drawdown_pct": res.max_drawdown_pct,
+        "total_trades": res.total_trades,
+        "avg_trade_pnl": res.avg_trade_pnl,
+        "strategy_name": strategy_name,
+    }
+
+
+def _init_worker(config, historical_data: dict, run_kwargs: dict):
+    enable_copy_on_write()  # spawned workers start with pandas defaults
+    _worker_state["config"] = config
+    _worker_state["historical_data"] = historical_data
+    _worker_state["run_kwargs"] = run_kwargs
+
+
+def _counted_cache(config) -> Optional[CountedCache]:
+    """A per-run view of the shared cache, so concurrent backtests don't skew stats."""
+    cache = get_shared_cache(config)
+    return CountedCache(cache) if cache else None
+
+
+def _counts(cache: Optional[CountedCache]) -> tuple[int, int]:
+    return (cache.hits, cache.misses) if cache else (0, 0)
+
+
+def _run_in_worker(combo_params: dict) -> tuple[dict, int, int]:
+    """Run one combination; also return this run's indicator cache hits/misses."""
+    config = _worker_state["config"]
+    cache = _counted_cache(config)
+    row = run_combination(
+        config,
+        combo_params=combo_params,
+        historical_data=_worker_state["historical_data"],
+        indicator_cache=cache,
+        **_worker_state["run_kwargs"],
+    )
+    return (row, *_counts(cache))
+
+
+def run_sweep(config, strategy_name: str, symbols: list[str], timeframe: str,
+              days: int, initial_balance: float, stop_loss_pct: float,
+              take_profit_pct: float, base_params: dict, combinations: list[dict],
+              historical_data: dict, workers: int = 1,
+              progress_callback=None, should_continue=None) -> tuple[list[dict], dict]:
+    """Run every combination and return (summary rows, indicator cache stats).
+
+    Rows are in combination order; combinations that raise are logged and
+    left out. With workers > 1 the combinations run in a spawned process pool
+    that receives historical_data once per worker; the rows are identical to
+    a serial run. Cache stats sum the hits/misses of every worker.
+
+    progress_callback: Optional callback(pct: float) as combinations finish.
+    should_continue: Optional callable; returning False stops the sweep early.
+    """
+    run_kwargs = {
+        "strategy_name": strategy_name,
+        "symbols": symbols,
+        "timeframe": timeframe,
+        "days": days,
+        "initial_balance": initial_balance,
+        "stop_loss_pct": stop_loss_pct,
+        "take_profit_pct": take_profit_pct,
+        "base_params": base_params,
+    }
+    total_combos = len(combinations)
+    rows: list = [None] * total_combos
+
+    if workers <= 1:
+        cache = _counted_cache(config)
+        for i, combo_params in enumerate(combinations):
+            if should_continue and not should_continue():
+                break
+            if progress_callback:
+                progress_callback((i / total_combos) * 100)
+            try:
+                rows[i] = run_combination(
+                    config, combo_params=combo_params,
+                    historical_data=historical_data, indicator_cache=cache,
+                    **run_kwargs,
+                )
+            except Exception as e:
+                logger.warning(f"Sweep combination {combo_params} failed: {e}")
+        return [r for r in rows if r is not None], _summarize_cache(*_counts(cache))
+
+    cache_hits = cache_misses = 0
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker,
+                             initargs=(config, historical_data, run_kwargs)) as pool:
+        futures = {
+            pool.submit(_run_in_worker, combo_params): i
+            for i, combo_params in enumerate(combinations)
+        }
+        pending = set(futures)
+        done_count = 0
+        while pending:
+            done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = futures[future]
+                done_count += 1
+                try:
+                    rows[i], hits, misses = future.result()
+                    cache_hits += hits
+                    cache_misses += misses
+                except Exception as e:
+                    logger.warning(f"Sweep combination {combinations[i]} failed: {e}")
+            if progress_callback and done:
+                progress_callback((done_count / total_combos) * 100)
+            if should_continue and not should_continue():
+                for future in pending:
+                    future.cancel()
+                break
+
+    return [r for r in rows if r is not None], _summarize_cache(cache_hits, cache_misses)
+
+
+def _summarize_cache(hits: int, misses: int) -> dict:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / lookups * 100) if lookups else 0.0,
+    }
@@ -0,0 +1,212 @@
+"""Array-based backtest engine.
+
+Replays the fill, fee and stop-loss/take-profit rules of Portfolio over NumPy
+arrays that are read once from the indicator frames, instead of doing per-bar
+iloc lookups and SQL writes. Portfolio state only changes on bars where a
+signal fires or an open position crosses its SL/TP, so the equity curve
+between those bars is filled in with array arithmetic.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ..data.models import OrderSide, TradeRecord
+from .strategy import BaseStrategy
+
+# First window scanned for an SL/TP hit; doubled until a hit or the end of data
+_EXIT_SCAN_CHUNK = 256
+
+
+def supports_vectorized(strategy: BaseStrategy) -> bool:
+    return strategy.supports_signal_arrays
+
+
+def compute_signal_arrays(strategy: BaseStrategy,
+                          df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Boolean (entry, exit) arrays for every bar of an indicator frame.
+
+    entry[i] / exit[i] match the BUY / SELL that strategy.generate_signals(...,
+    index=i) would emit before position filtering; see
+    BaseStrategy.generate_signal_arrays().
+    """
+    entry, exit_ = strategy.generate_signal_arrays(df)
+    return entry.astype(bool), exit_.astype(bool)
+
+
+def isoformat_timestamps(timestamps: pd.Series) -> list[str]:
+    """Format a timestamp column the way Timestamp.isoformat() would, in bulk."""
+    if pd.api.types.is_datetime64_any_dtype(timestamps) and timestamps.dt.tz is None:
+        values = timestamps.to_numpy(dtype="datetime64[ns]")
+        if not (values.view(np.int64) % 1_000_000_000).any():
+            return np.datetime_as_string(values, unit="s").tolist()
+    return [
+        ts.isoformat() if hasattr(ts, "isoformat") else str(ts)
+        for ts in timestamps
+    ]
+
+
+class _OpenPosition:
+    __slots__ = ("symbol", "quantity", "entry_price", "entry_bar",
+                 "stop_loss_price", "take_profit_price", "exit_bar")
+
+    def __init__(self, symbol: str, quantity: float, entry_price: float, entry_bar: int):
+        self.symbol = symbol
+        self.quantity = quantity
+        self.entry_price = entry_price
+        self.entry_bar = entry_bar
+        self.stop_loss_price: Optional[float] = None
+        self.take_profit_price: Optional[float] = None
+        self.exit_bar = 0
+
+
+def _first_exit_bar(close: np.ndarray, start: int, stop: int,
+                    stop_loss: Optional[float], take_profit: Optional[float]) -> int:
+    """First bar in [start, stop) where the SL/TP check fires, or stop."""
+    if not stop_loss and not take_profit:
+        return stop
+    chunk = _EXIT_SCAN_CHUNK
+    while start < stop:
+        end = min(start + chunk, stop)
+        window = close[start:end]
+        hit = np.zeros(len(window), dtype=bool)
+        if stop_loss:
+            hit |= window <= stop_loss
+        if take_profit:
+            hit |= window >= take_profit
+        if hit.any():
+            return start + int(hit.argmax())
+        start = end
+        chunk *= 2
+    return stop
+
+
+def simulate(closes: dict[str, np.ndarray], timestamps: dict[str, pd.Series],
+             entries: dict[str, np.ndarray], exits: dict[str, np.ndarray],
+             start: int, stop: int, initial_balance: float, fee_rate: float,
+             max_position_pct: float, max_open_positions: int,
+             stop_loss_pct: float, take_profit_pct: float, strategy_name: str,
+             progress_callback=None) -> tuple[list[TradeRecord], np.ndarray]:
+    """Simulate bars [start, stop) and return (trades in closing order, equity).
+
+    Mirrors run_backtest_simulation's loop step for step: SL/TP checks on open
+    positions in opening order, then signals in symbol order, then a snapshot.
+    """
+    symbols = list(closes)
+    equity = np.empty(stop - start)
+    trades: list[TradeRecord] = []
+    positions: dict[str, _OpenPosition] = {}
+    cash = initial_balance
+
+    candidates = np.zeros(stop - start, dtype=bool)
+    for symbol in symbols:
+        candidates |= entries[symbol][start:stop] | exits[symbol][start:stop]
+    signal_bars = (np.flatnonzero(candidates) + start).tolist()
+    next_signal = 0
+
+    total_steps = stop - start
+    last_progress = -1.0
+
+    def close_position(position: _OpenPosition, price: float, bar: int, name: str):
+        nonlocal cash
+        quantity = position.quantity
+        exit_fee = price * quantity * fee_rate
+        cash += price * quantity - exit_fee
+        entry_fee = position.entry_price * quantity * fee_rate
+        pnl = (price - position.entry_price) * quantity - entry_fee - exit_fee
+        pnl_pct = ((price / position.entry_price) - 1) * 100 if position.entry_price > 0 else 0.0
+        entry_time = timestamps[position.symbol].iloc[position.entry_bar].to_pydatetime()
+        exit_time = timestamps[position.symbol].iloc[bar].to_pydatetime()
+        trades.append(TradeRecord(
+            id=len(trades) + 1,
+            symbol=position.symbol,
+            side=OrderSide.BUY,
+            entry_price=position.entry_price,
+            exit_price=price,
+            quantity=quantity,
+            entry_time=entry_time,
+            exit_time=exit_time,
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            fees=entry_fee + exit_fee,
+            strategy_name=name,
+            duration_minutes=int((exit_time - entry_time).total_seconds() / 60),
+        ))
+        del positions[position.symbol]
+
+    bar = start
+    while bar < stop:
+        while next_signal < len(signal_bars) and signal_bars[next_signal] < bar:
+            next_signal += 1
+        event = signal_bars[next_signal] if next_signal < len(signal_bars) else stop
+        for position in positions.values():
+            event = min(event, position.exit_bar)
+
+        # Nothing changes before the next event: fill the equity curve in bulk
+        if event > bar:
+            if positions:
+                positions_value = None
+                for position in positions.values():
+                    held = closes[position.symbol][bar:event] * position.quantity
+                    positions_value = held if positions_value is None else positions_value + held
+                equity[bar - start:event - start] = cash + positions_value
+            else:
+                equity[bar - start:event - start] = cash
+            bar = event
+            if bar >= stop:
+                break
+
+        if progress_callback:
+            progress = ((bar - start) / total_steps) * 100
+            if progress - last_progress >= 1.0:
+                progress_callback(progress)
+                last_progress = progress
+
+        prices = {symbol: float(closes[symbol][bar]) for symbol in symbols}
+
+        # Portfolio.update_positions: SL/TP on open positions
+        for position in list(positions.values()):
+            price = prices[position.symbol]
+            if position.stop_loss_price and price <= position.stop_loss_price:
+                close_position(position, price, bar, "auto_stop_loss")
+            elif position.take_profit_price and price >= position.take_profit_price:
+                close_position(position, price, bar, "auto_take_profit")
+
+        # Strategy signals, evaluated against positions after SL/TP
+        for symbol in symbols:
+            price = prices[symbol]
+            if entries[symbol][bar] and symbol not in positions:
+                if len(positions) >= max_open_positions:
+                    continue
+                total_value = cash + sum(
+                    prices[p.symbol] * p.quantity for p in positions.values()
+                )
+                available = min(total_value * max_position_pct, cash)
+                available_after_fee = available / (1 + fee_rate)
+                quantity = available_after_fee / price if price > 0 else 0.0
+                if quantity <= 0:
+                    continue
+                fee = price * quantity * fee_rate
+                cost = price * quantity + fee
+                if cost > cash:
+                    continue  # Portfolio cancels the order
+                cash -= cost
+                position = _OpenPosition(symbol, quantity, price, bar)
+                position.stop_loss_price = price * (1 - stop_loss_pct)
+                position.take_profit_price = price * (1 + take_profit_pct)
+                position.exit_bar = _first_exit_bar(
+                    closes[symbol], bar + 1, stop,
+                    position.stop_loss_price, position.take_profit_price,
+                )
+                positions[symbol] = position
+            elif exits[symbol][bar] and symbol in positions:
+                close_position(positions[symbol], price, bar, strategy_name)
+
+        positions_value = 0.0
+        for position in positions.values():
+            positions_value += prices[position.symbol] * position.quantity
+        equity[bar - start] = cash + positions_value
+        bar += 1
+
+    return trades, equity
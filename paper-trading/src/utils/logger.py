@@ -13,18 +13,32 @@ class DashboardHandler(logging.Handler):
     def __init__(self, max_records=500):
         super().__init__()
         self._records = deque(maxlen=max_records)
+        self._emitted = 0  # records ever emitted: a cursor for get_records_since
         self._lock = threading.Lock()
 
     def emit(self, record):
         msg = self.format(record)
         with self._lock:
             self._records.append(msg)
+            self._emitted += 1
 
     def get_records(self, count=100):
         with self._lock:
             items = list(self._records)
         return items[-count:]
 
+    def get_records_since(self, cursor, count=100):
+        """(records emitted after `cursor`, at most `count` of them; the new cursor)."""
+        with self._lock:
+            new = min(self._emitted - cursor, len(self._records), count)
+            items = list(self._records)[-new:] if new > 0 else []
+            return items, self._emitted
+
+    @property
+    def cursor(self):
+        with self._lock:
+            return self._emitted
+
 
 def setup_logging(config):
     """Configure root logger with file, console, and dashboard handlers."""
@@ -0,0 +1,172 @@
+"""Rolling latency histograms for the engine, exposed at /api/metrics.
+
+Each series (a metric name plus label values) keeps its last `window`
+observations, in seconds; percentiles are computed over that window when
+read, so a regression shows up within `window` ticks and fades as fast.
+Counts and sums are totals since startup, as Prometheus expects.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_METRICS_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_PREFIX = "paper_trading_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RollingHistogram:
+    """The last `window` observations of one series, plus lifetime count and sum."""
+
+    def __init__(self, window: int = DEFAULT_METRICS_WINDOW):
+        self._samples: deque = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.sum += seconds
+
+    def summary(self) -> dict:
+        """count/sum since startup; quantiles and max over the window (None if empty)."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self.count, self.sum
+        summary = {"count": count, "sum": total}
+        for q in QUANTILES:
+            summary[_quantile_key(q)] = _nearest_rank(samples, q)
+        summary["max"] = samples[-1] if samples else None
+        return summary
+
+
+def _nearest_rank(samples: list, q: float):
+    if not samples:
+        return None
+    return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+
+def _quantile_key(q: float) -> str:
+    return f"p{round(q * 100):d}"
+
+
+class TimedLock:
+    """Wraps a lock for use in `with`; the wait of every acquisition is observed."""
+
+    def __init__(self, lock, histogram: RollingHistogram):
+        self._lock = lock
+        self._histogram = histogram
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self._lock.acquire()
+        self._histogram.observe(time.perf_counter() - start)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+class MetricsRegistry:
+    """Named histograms, each split into series by label values."""
+
+    def __init__(self, window: int = DEFAULT_METRICS_WINDOW):
+        self._window = window
+        self._help: dict[str, str] = {}
+        self._series: dict[str, dict[tuple, RollingHistogram]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "MetricsRegistry":
+        return cls(window=config.get("metrics.window", DEFAULT_METRICS_WINDOW))
+
+    def describe(self, name: str, help_text: str):
+        """Declare a metric; its series appear as they are first observed."""
+        with self._lock:
+            self._help[name] = help_text
+            self._series.setdefault(name, {})
+
+    def histogram(self, name: str, **labels) -> RollingHistogram:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = RollingHistogram(self._window)
+            return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the `with` block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _items(self) -> list:
+        with self._lock:
+            return [
+                (name, self._help.get(name, ""), list(series.items()))
+                for name, series in sorted(self._series.items())
+            ]
+
+    def snapshot(self) -> dict:
+        """{name: {"help", "series": [{"labels", count, sum, p50, p95, p99, max}]}}."""
+        return {
+            "window": self._window,
+            "metrics": {
+                name: {
+                    "help": help_text,
+                    "series": [
+                        {"labels": dict(key), **histogram.summary()}
+                        for key, histogram in sorted(series)
+                    ],
+                }
+                for name, help_text, series in self._items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format: one summary per metric."""
+        lines = []
+        for name, help_text, series in self._items():
+            full_name = PROMETHEUS_PREFIX + name
+            lines.append(f"# HELP {full_name} {_escape_help(help_text)}")
+            lines.append(f"# TYPE {full_name} summary")
+            for key, histogram in sorted(series):
+                summary = histogram.summary()
+                for q in QUANTILES:
+                    value = summary[_quantile_key(q)]
+                    labels = _format_labels(key + (("quantile", str(q)),))
+                    lines.append(f"{full_name}{labels} {_format_value(value)}")
+                labels = _format_labels(key)
+                lines.append(f"{full_name}_sum{labels} {_format_value(summary['sum'])}")
+                lines.append(f"{full_name}_count{labels} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(pairs: tuple) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value) -> str:
+    return "NaN" if value is None else repr(float(value))
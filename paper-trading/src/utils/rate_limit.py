@@ -0,0 +1,41 @@
+"""Request pacing shared by every thread that talks to the same exchange."""
+
+import threading
+import time
+import weakref
+
+_limiters = weakref.WeakKeyDictionary()
+_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    """Spaces requests at least `interval` seconds apart, across threads.
+
+    Each acquire() reserves the next free slot and sleeps until it comes up,
+    so concurrent callers queue behind one budget instead of each pacing
+    themselves independently.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self, cost: float = 1.0):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval * cost
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def limiter_for(exchange) -> RateLimiter:
+    """The process-wide limiter for an exchange instance, paced by its rateLimit (ms)."""
+    with _limiters_lock:
+        limiter = _limiters.get(exchange)
+        if limiter is None:
+            limiter = RateLimiter(getattr(exchange, "rateLimit", 0) / 1000)
+            _limiters[exchange] = limiter
+        return limiter
@@ -0,0 +1,41 @@
+"""Shared pytest setup.
+
+The strategy/backtest unit tests replace pandas, ta, ccxt and apscheduler in
+sys.modules with MagicMocks at import time. When the real packages are
+installed, import them (and the application modules) before any test module
+is collected, and put them back after each module is collected, so tests that
+run real pandas/NumPy code can share the session with the mocked ones.
+"""
+
+import importlib
+import sys
+
+_REAL_MODULE_NAMES = [
+    "numpy",
+    "pandas",
+    "ccxt",
+    "ta",
+    "ta.trend",
+    "ta.momentum",
+    "apscheduler",
+    "apscheduler.schedulers.background",
+]
+
+_real_modules = {}
+try:
+    for _name in _REAL_MODULE_NAMES:
+        _real_modules[_name] = importlib.import_module(_name)
+
+    # Bind the application modules to the real packages before a legacy test
+    # module swaps in its mocks; later imports of them reuse these.
+    for _name in ("src.trading.backtester", "src.trading.engine"):
+        importlib.import_module(_name)
+
+    # The app enables pandas copy-on-write at startup (main.py); so do the tests
+    importlib.import_module("src.data.candle_store").enable_copy_on_write()
+except ImportError:
+    _real_modules = {}
+
+
+def pytest_collectreport(report):
+    sys.modules.update(_real_modules)
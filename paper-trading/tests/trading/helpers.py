@@ -0,0 +1,95 @@
+"""Synthetic market data shared by the tests that run real pandas code."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MINUTE_MS = 60_000
+
+
+def make_ohlcv(n, seed, start_price=100.0):
+    """Deterministic random-walk 1m candles."""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="1min"),
+        "open": close,
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close,
+        "volume": rng.uniform(1, 10, n),
+    })
+
+
+class LocalExchange:
+    """Stand-in for a ccxt exchange serving 1m candles from listed_ms to now.
+
+    Records the `since` of every request and its start time (monotonic);
+    `latency` seconds are slept per request to mimic the network. `page_cap`
+    limits a page to fewer candles than requested, as some exchanges do.
+    """
+
+    id = "local"
+
+    def __init__(self, listed_ms, latency=0.0, rate_limit_ms=0, page_cap=None):
+        self.listed_ms = listed_ms
+        self.latency = latency
+        self.rateLimit = rate_limit_ms
+        self.page_cap = page_cap
+        self.calls = []
+        self.request_times = []
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=1000):
+        with self._lock:
+            self.calls.append(since)
+            self.request_times.append(time.monotonic())
+        if self.latency:
+            time.sleep(self.latency)
+        now = int(time.time() * 1000)
+        start = max(since, self.listed_ms)
+        start = -(-start // MINUTE_MS) * MINUTE_MS  # next minute boundary
+        return [
+            [ts, 1.0, 2.0, 0.5, ts / 1e9, 10.0]
+            for ts in range(start, now + 1, MINUTE_MS)
+        ][:min(limit, self.page_cap or limit)]
+
+
+class LocalExchangeFactory:
+    """Picklable exchange_factory for job processes: a LocalExchange per call."""
+
+    def __init__(self, listed_ms):
+        self.listed_ms = listed_ms
+
+    def __call__(self, config):
+        return LocalExchange(self.listed_ms)
+
+
+class ReplayExchange:
+    """Stand-in for a ccxt exchange replaying a make_ohlcv() frame as 1m candles.
+
+    Candles up to `cursor` (inclusive) exist; the one at `cursor` is still
+    forming. Timestamps are laid out to end at the current minute, and every
+    request is recorded in `calls` as (since, limit).
+    """
+
+    id = "replay"
+
+    def __init__(self, df, cursor):
+        self.df = df
+        self.cursor = cursor
+        self.calls = []
+        now_minute = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+        timestamps = now_minute - (len(df) - 1 - np.arange(len(df))) * MINUTE_MS
+        values = df[["open", "high", "low", "close", "volume"]].to_numpy().tolist()
+        self.rows = [[int(ts), *row] for ts, row in zip(timestamps, values)]
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append((since, limit))
+        rows = self.rows[:self.cursor + 1]
+        if since is not None:
+            rows = [row for row in rows if row[0] >= since]
+            return rows[:limit] if limit else rows
+        return rows[-limit:] if limit else rows
@@ -0,0 +1,214 @@
+import threading
+import time
+
+import pytest
+
+from src.dashboard.jobs import BacktestJobQueue, JobCancelled, QueueFull
+from src.data.database import Database
+from src.data.models import JobStatus
+
+
+class BlockingRunners:
+    """Runners that wait for release(); records the most jobs running at once."""
+
+    def __init__(self):
+        self.release_event = threading.Event()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+        self._lock = threading.Lock()
+
+    def run(self, job, config, exchange):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.started.append(job.id)
+        try:
+            job.report_progress(50.0)
+            while not self.release_event.wait(0.01):
+                job.report_progress(50.0)
+            return {"echo": job.params}
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def release(self):
+        self.release_event.set()
+
+    @property
+    def runners(self):
+        return {"backtest": self.run}
+
+
+def wait_for(queue, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status(job_id)
+        if status["status"] in statuses:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {queue.status(job_id)}")
+
+
+def test_concurrency_is_bounded_and_positions_reported(tmp_path):
+    blocking = BlockingRunners()
+    queue = BacktestJobQueue(Database(str(tmp_path / "trading.db")), {}, None,
+                             workers=2, runners=blocking.runners,
+                             isolation="thread")
+    ids = [queue.submit("backtest", {"n": i}) for i in range(5)]
+    wait_for(queue, ids[1], {"running"})
+    while len(blocking.started) < 2:
+        time.sleep(0.01)
+
+    assert [queue.status(i)["queue_position"] for i in ids] == [0, 0, 1, 2, 3]
+    assert queue.status(ids[0])["progress"] == 50.0
+    assert (queue.running_count, queue.queued_count) == (2, 3)
+
+    blocking.release()
+    for job_id, n in zip(ids, range(5)):
+        assert wait_for(queue, job_id, {"completed"})["result"] == {"echo": {"n": n}}
+    assert blocking.max_running == 2
+    assert set(blocking.started[:2]) == set(ids[:2])  # the first two submitted
+    queue.close()
+
+
+def test_submit_beyond_max_queued_is_refused(tmp_path):
+    blocking = BlockingRunners()
+    queue = BacktestJobQueue(Database(str(tmp_path / "trading.db")), {}, None,
+                             workers=1, max_queued=2, runners=blocking.runners, isolation="thread")
+    first = queue.submit("backtest", {})
+    wait_for(queue, first, {"running"})
+    queue.submit("backtest", {})
+    queue.submit("backtest", {})
+    with pytest.raises(QueueFull):
+        queue.submit("backtest", {})
+    with pytest.raises(ValueError, match="Unknown job kind"):
+        queue.submit("optimize", {})
+    blocking.release()
+    queue.close()
+
+
+def test_cancel_queued_and_running_jobs(tmp_path):
+    blocking = BlockingRunners()
+    db = Database(str(tmp_path / "trading.db"))
+    queue = BacktestJobQueue(db, {}, None, workers=1, runners=blocking.runners, isolation="thread")
+    running = queue.submit("backtest", {})
+    queued = queue.submit("backtest", {})
+    wait_for(queue, running, {"running"})
+
+    assert queue.cancel(queued)
+    assert queue.status(queued)["status"] == "cancelled"
+    assert queue.cancel(running)
+    assert wait_for(queue, running, {"cancelled", "completed"})["status"] == "cancelled"
+    assert queue.cancel(running) is False  # already finished
+    assert blocking.started == [running]
+    assert [j.status for j in db.get_backtest_jobs()] == [JobStatus.CANCELLED] * 2
+    queue.close()
+
+
+def test_results_are_persisted_not_kept_in_memory(tmp_path):
+    path = str(tmp_path / "trading.db")
+
+    def fails(job, config, exchange):
+        raise ValueError("No historical data available")
+
+    queue = BacktestJobQueue(Database(path), {}, None, isolation="thread", runners={
+        "backtest": lambda job, config, exchange: {"total_return_pct": 4.2},
+        "sweep": fails,
+    })
+    done = queue.submit("backtest", {"days": 30})
+    failed = queue.submit("sweep", {})
+    wait_for(queue, failed, {"error"})
+    assert queue._active == {}
+    queue.close()
+
+    reopened = BacktestJobQueue(Database(path), {}, None, runners={})
+    assert reopened.status(done)["result"] == {"total_return_pct": 4.2}
+    assert reopened.status(failed)["error_msg"] == "No historical data available"
+    assert reopened.status("missing") is None
+    [job, _] = reopened.recent()[::-1]
+    assert (job.id, job.params, job.result) == (done, {"days": 30}, None)
+    reopened.close()
+
+
+def test_unfinished_jobs_are_requeued_after_a_restart(tmp_path):
+    path = str(tmp_path / "trading.db")
+    blocking = BlockingRunners()
+    queue = BacktestJobQueue(Database(path), {}, None, runners=blocking.runners, isolation="thread")
+    running = queue.submit("backtest", {"n": 1})
+    queued = queue.submit("backtest", {"n": 2})
+    wait_for(queue, running, {"running"})
+    queue.close()  # process exits with both unfinished
+
+    restarted = BacktestJobQueue(Database(path), {}, None, isolation="thread", runners={
+        "backtest": lambda job, config, exchange: job.params,
+    })
+    assert wait_for(restarted, running, {"completed"})["result"] == {"n": 1}
+    assert wait_for(restarted, queued, {"completed"})["result"] == {"n": 2}
+    blocking.release()
+    restarted.close()
+
+
+def test_old_results_are_pruned(tmp_path):
+    db = Database(str(tmp_path / "trading.db"))
+    queue = BacktestJobQueue(db, {}, None, retention_hours=1, isolation="thread", runners={
+        "backtest": lambda job, config, exchange: {},
+    })
+    old = queue.submit("backtest", {})
+    wait_for(queue, old, {"completed"})
+    with db.transaction() as conn:
+        conn.execute("UPDATE backtest_jobs SET finished_at='2000-01-01T00:00:00'")
+    new = queue.submit("backtest", {})
+    assert queue.status(old) is None
+    assert wait_for(queue, new, {"completed"})
+    queue.close()
+
+
+def test_report_progress_raises_once_cancelled():
+    from src.dashboard.jobs import ActiveJob
+
+    job = ActiveJob("id", "backtest", {})
+    job.report_progress(10.0)
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.report_progress(20.0)
+    assert job.progress == 20.0
+
+
+def test_backtest_endpoint_runs_through_the_queue(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("apscheduler")
+    from src.dashboard.app import create_app
+    from src.trading.engine import TradingEngine
+    from src.utils.logger import DashboardHandler
+    from tests.trading.helpers import LocalExchangeFactory
+
+    config = {"trading.pairs": ["BTC/USDT"]}
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    app = create_app(engine, DashboardHandler(), config)
+    app.config["backtest_jobs"].close()
+    # Runs in a job process, downloading from its own exchange
+    app.config["backtest_jobs"] = BacktestJobQueue(
+        engine._db, config, LocalExchangeFactory(int(time.time() * 1000) - 3 * 86_400_000),
+        max_queued=0,
+    )
+    http = app.test_client()
+    try:
+        body = {"strategy": "rsi", "symbols": ["BTC/USDT"], "timeframe": "1m", "days": 1}
+        assert http.post("/api/backtest", json=body).status_code == 429
+
+        app.config["backtest_jobs"]._max_queued = 5
+        started = http.post("/api/backtest", json=body).get_json()
+        assert started["status"] in ("queued", "running")
+        status = wait_for(app.config["backtest_jobs"], started["task_id"],
+                          {"completed", "error"}, timeout=60)
+        assert status["status"] == "completed", status["error_msg"]
+        response = http.get(f"/api/backtest/status/{started['task_id']}").get_json()
+        assert response["result"]["strategy_name"] == "rsi"
+        assert response["progress"] == 100
+        [listed] = http.get("/api/backtest/jobs").get_json()
+        assert (listed["task_id"], listed["status"]) == (started["task_id"], "completed")
+        assert http.post(f"/api/backtest/cancel/{started['task_id']}").status_code == 404
+    finally:
+        app.config["backtest_jobs"].close()
+        engine.stop()
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from src.data.synthetic import synthetic_ohlcv
+from src.trading import benchmark
+from src.trading.benchmark import RESULTS_VERSION, compare_results, run_suite
+
+
+def test_datasets_are_fixed_and_nested():
+    small, again, large = synthetic_ohlcv(300), synthetic_ohlcv(300), synthetic_ohlcv(1000)
+
+    assert small.equals(again)
+    assert list(small.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+    assert len(small) == 300 and small["timestamp"].is_monotonic_increasing
+    assert (small["high"] >= small[["open", "close"]].max(axis=1)).all()
+    assert (small["low"] <= small[["open", "close"]].min(axis=1)).all()
+    # Both end at the same epoch; the larger one starts earlier on the same walk
+    assert small["timestamp"].iloc[-1] == large["timestamp"].iloc[-1]
+    np.testing.assert_array_equal(small["close"].to_numpy(), large["close"].to_numpy()[:300])
+
+
+def test_suite_reports_rates_per_case_and_size(monkeypatch):
+    monkeypatch.setattr(benchmark, "PER_BAR_MAX_BARS", 300)
+    monkeypatch.setattr(benchmark, "DATABASE_OPS", 20)
+    monkeypatch.setattr(benchmark, "DATABASE_READS", 5)
+    seen = []
+
+    results = run_suite(sizes=["200", "400"], min_seconds=0,
+                        pattern=r"rsi|portfolio|backtester_run|database/get_orders",
+                        progress_callback=lambda key, result: seen.append(key))
+
+    assert results["version"] == RESULTS_VERSION
+    assert sorted(results["results"]) == sorted(seen) == sorted([
+        "simulation/rsi/loop[200]", "simulation/rsi/vectorized[200]",
+        "simulation/rsi/vectorized[400]", "backtester_run/ema_sma_crossover/vectorized[200]",
+        "backtester_run/ema_sma_crossover/vectorized[400]", "indicators/rsi[200]",
+        "indicators/rsi[400]", "signals/rsi[200]", "signal_arrays/rsi[200]",
+        "signal_arrays/rsi[400]", "portfolio/fills[200]",
+        "database/get_orders",
+    ])  # per-bar cases skip the size above PER_BAR_MAX_BARS
+    for key, result in results["results"].items():
+        assert result["rate"] > 0
+        assert result["unit"] == ("ops/s" if key.startswith("database/") else "bars/s")
+    assert results["results"]["simulation/rsi/loop[200]"]["units"] == 200
+    assert results["results"]["database/get_orders"]["units"] == 5
+
+    with pytest.raises(ValueError, match="Unknown dataset size"):
+        run_suite(sizes=["huge"])
+
+
+def test_compare_flags_drops_beyond_the_threshold():
+    def run(rates):
+        return {"version": RESULTS_VERSION, "results": {
+            key: {"unit": "bars/s", "rate": rate} for key, rate in rates.items()
+        }}
+
+    baseline = run({"a[10k]": 1000.0, "b[10k]": 1000.0, "c[10k]": 1000.0,
+                    "gone[10k]": 1000.0, "a[100k]": 1000.0})
+    current = run({"a[10k]": 850.0, "b[10k]": 700.0, "c[10k]": 1500.0, "new[10k]": 1.0})
+    current["selection"] = {"sizes": ["10k"], "pattern": None, "all_sizes": False}
+
+    rows = {row["case"]: row for row in compare_results(current, baseline, threshold=0.2)}
+    # a[100k] was not selected by this 10k-only run, so it is not reported
+    assert {k: row["status"] for k, row in rows.items()} == {
+        "a[10k]": "compared", "b[10k]": "compared", "c[10k]": "compared",
+        "new[10k]": "new", "gone[10k]": "missing",
+    }
+    assert [rows[k]["regressed"] for k in ("a[10k]", "b[10k]", "c[10k]")] == [False, True, False]
+    assert rows["b[10k]"]["change"] == pytest.approx(-0.3)
+    assert not rows["gone[10k]"]["regressed"]
+
+    with pytest.raises(ValueError, match="Unsupported baseline version"):
+        compare_results(current, {"version": 0, "results": {}})
+
+
+def test_samples_repeat_short_cases_and_report_the_median():
+    durations = iter([0.3, 0.1, 0.2] * 10)
+    case = benchmark.BenchmarkCase("fake", "ops", lambda df: (100, next(durations)), sized=False)
+
+    result = benchmark._measure(case, None, repeat=3, min_seconds=0)
+    assert result["rate"] == 500.0  # median of 333, 1000 and 500 ops/s
+    assert result["units"] == 100
+
+    calls = []
+    quick = benchmark.BenchmarkCase("quick", "ops", lambda df: calls.append(1) or 1, sized=False)
+    benchmark._measure(quick, None, repeat=1, min_seconds=0.05)
+    assert len(calls) > 1
+
+
+def test_environment_differences():
+    env = {"python": "3.11.7", "cpus": 1}
+    assert benchmark.environment_differences({"environment": env}, {"environment": env}) == []
+    assert benchmark.environment_differences(
+        {"environment": {**env, "cpus": 8}}, {"environment": env}
+    ) == ["cpus: 1 -> 8"]
+
+
+def test_regressions_are_confirmed_by_re_measuring(monkeypatch):
+    def results(rates):
+        return {key: {"unit": "bars/s", "rate": rate, "relative_rate": rate / 10}
+                for key, rate in rates.items()}
+
+    baseline = {"version": RESULTS_VERSION,
+                "results": results({"noisy[10k]": 1000.0, "slow[10k]": 1000.0})}
+    current = {"version": RESULTS_VERSION,
+               "results": results({"noisy[10k]": 700.0, "slow[10k]": 700.0})}
+    reruns = []
+
+    def rerun(sizes, pattern, **kwargs):
+        key = pattern[1:-1].replace("\\", "")
+        reruns.append((key, sizes))
+        return {"results": results({key: 990.0 if key == "noisy[10k]" else 690.0})}
+
+    monkeypatch.setattr(benchmark, "run_suite", rerun)
+    rows = {row["case"]: row for row in benchmark.confirm_regressions(
+        current, baseline, threshold=0.2, attempts=2)}
+
+    assert not rows["noisy[10k]"]["regressed"]
+    assert current["results"]["noisy[10k]"]["rate"] == 990.0
+    assert rows["slow[10k]"]["regressed"]
+    assert rows["slow[10k]"]["change"] == pytest.approx(-0.3)  # the best of its measurements
+    assert reruns == [("noisy[10k]", ["10k"]), ("slow[10k]", ["10k"]), ("slow[10k]", ["10k"])]
@@ -0,0 +1,73 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.data.candle_buffer import CandleBuffer
+from src.data.database import Database
+from src.trading.engine import TradingEngine
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+
+def _candle(ts, close):
+    return [ts, close, close, close, close, 1.0]
+
+
+def test_wraps_around_and_stays_contiguous():
+    buffer = CandleBuffer(4)
+    assert buffer.last_timestamp is None
+
+    appended = buffer.update([_candle(ts, float(ts)) for ts in range(10)])
+
+    assert appended == 10
+    assert len(buffer) == 4
+    assert buffer.last_timestamp == 9
+    assert list(buffer.column("timestamp")) == [6, 7, 8, 9]
+    assert list(buffer.column("close")) == [6.0, 7.0, 8.0, 9.0]
+    assert np.shares_memory(buffer.view(), buffer._data)
+    assert not buffer.view().flags.writeable
+
+
+def test_forming_candle_is_overwritten_in_place():
+    buffer = CandleBuffer(3)
+    buffer.update([_candle(1, 1.0), _candle(2, 2.0)])
+    version = buffer.version
+
+    # Refetch from the last stored candle: it has new values, plus one new candle
+    assert buffer.update([_candle(1, 9.0), _candle(2, 2.5), _candle(3, 3.0)]) == 1
+
+    assert list(buffer.column("close")) == [1.0, 2.5, 3.0]
+    assert buffer.version == version + 1
+    assert buffer.update([]) == 0
+    assert buffer.version == version + 1
+
+
+def test_engine_fetches_only_new_candles(tmp_path):
+    config = {
+        "trading.pairs": ["BTC/USDT"],
+        "trading.default_timeframe": "1h",
+        "trading.candle_buffer_size": 50,
+    }
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    history = make_ohlcv(200, 4, 40000.0)
+    exchange = engine._exchange = ReplayExchange(history, cursor=99)
+
+    engine._fetch_all_data()
+    chart = engine.get_pair_data("BTC/USDT")
+    assert engine.get_pair_data("BTC/USDT") is chart  # no tick, no rebuild
+
+    for cursor in range(100, 200):
+        exchange.cursor = cursor
+        engine._fetch_all_data()
+
+    first_since, first_limit = exchange.calls[0]
+    assert first_since is None and first_limit == 50
+    # Later requests start at the last stored (still-forming) candle
+    assert all(since == exchange.rows[cursor - 1][0]
+               for (since, _), cursor in zip(exchange.calls[1:], range(100, 200)))
+
+    df = engine.get_pair_data("BTC/USDT")
+    assert df is not chart
+    assert len(df) == 50
+    assert list(df["close"]) == list(history["close"].iloc[150:200])
+    assert "ema" in df.columns
+    assert engine.current_prices["BTC/USDT"] == history["close"].iloc[199]
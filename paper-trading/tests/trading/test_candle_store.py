@@ -0,0 +1,68 @@
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.data.candle_store import CandleStore, merge_candles
+from src.trading.backtester import APP_DIR, Backtester
+from tests.trading.helpers import LocalExchange
+
+
+def make_backtester(tmp_path, listed_days_ago=30):
+    listed_ms = int(time.time() * 1000 - listed_days_ago * 86_400_000)
+    exchange = LocalExchange(listed_ms)
+    backtester = Backtester({}, exchange, candle_store=CandleStore(str(tmp_path)))
+    return backtester, exchange
+
+
+def test_merge_candles_prefers_new_rows():
+    existing = np.array([[1.0, 2.0, 3.0]] + [[0.0] * 3] * 5)
+    new = np.array([[3.0, 4.0]] + [[9.0] * 2] * 5)
+    merged = merge_candles(existing, new)
+    assert merged[0].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert merged[4].tolist() == [0.0, 0.0, 9.0, 9.0]
+
+
+def test_second_run_only_fetches_tail(tmp_path):
+    backtester, exchange = make_backtester(tmp_path)
+    first = backtester._fetch_historical_data("BTC/USDT", "1m", 1)
+    assert len(exchange.calls) == 2  # 1440 candles = two pages
+
+    exchange.calls.clear()
+    second = backtester._fetch_historical_data("BTC/USDT", "1m", 1)
+    last_ms = int(first["timestamp"].iloc[-1].timestamp() * 1000)
+    assert exchange.calls == [last_ms]
+    assert len(second) >= len(first)
+    assert second["timestamp"].is_monotonic_increasing
+
+
+def test_longer_range_fetches_missing_head(tmp_path):
+    backtester, exchange = make_backtester(tmp_path)
+    backtester._fetch_historical_data("BTC/USDT", "1m", 1)
+
+    exchange.calls.clear()
+    df = backtester._fetch_historical_data("BTC/USDT", "1m", 2)
+    assert len(exchange.calls) == 3  # two head pages + one tail request
+    assert df["timestamp"].diff().dropna().eq(df["timestamp"].diff().iloc[1]).all()
+    assert 2 * 1440 - 2 <= len(df) <= 2 * 1440 + 1
+
+
+def test_listing_date_not_refetched(tmp_path):
+    backtester, exchange = make_backtester(tmp_path, listed_days_ago=0.5)
+    backtester._fetch_historical_data("NEW/USDT", "1m", 1)
+
+    exchange.calls.clear()
+    df = backtester._fetch_historical_data("NEW/USDT", "1m", 1)
+    assert len(exchange.calls) == 1  # tail only
+    assert len(df) == pytest.approx(720, abs=2)
+
+
+def test_relative_cache_dir_resolves_against_the_app_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    relative = Backtester({"backtesting.candle_cache_dir": "data/candles"}, None)
+    assert relative._candle_store._root_dir == os.path.join(APP_DIR, "data", "candles")
+    absolute = Backtester({"backtesting.candle_cache_dir": str(tmp_path)}, None)
+    assert absolute._candle_store._root_dir == str(tmp_path)
+    assert Backtester({"backtesting.candle_cache_dir": ""}, None)._candle_store is None
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+ccxt = pytest.importorskip("ccxt")
+
+from src.data.database import Database
+from src.trading.engine import TradingEngine
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+PAIRS = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"]
+
+
+class FlakyExchange(ReplayExchange):
+    """ReplayExchange with per-symbol latency, hangs and errors."""
+
+    def __init__(self, latency=0.0, hang=(), fail=()):
+        super().__init__(make_ohlcv(200, 8, 100.0), cursor=150)
+        self.latency = latency
+        self.hang = set(hang)
+        self.fail = set(fail)
+        self.release = threading.Event()
+        self.symbol_calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.symbol_calls.append(symbol)
+        if symbol in self.hang:
+            self.release.wait(5)
+        if symbol in self.fail:
+            raise ccxt.NetworkError("connection reset")
+        time.sleep(self.latency)
+        return super().fetch_ohlcv(symbol, timeframe, since, limit)
+
+
+def _engine(tmp_path, exchange, **config):
+    config = {
+        "trading.pairs": PAIRS,
+        "trading.default_timeframe": "1h",
+        "trading.fetch_timeout_seconds": 0.5,
+        "trading.fetch_backoff_seconds": 60,
+        **config,
+    }
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    engine._exchange = exchange
+    return engine
+
+
+def test_pairs_are_fetched_concurrently(tmp_path):
+    engine = _engine(tmp_path, FlakyExchange(latency=0.3))
+
+    started = time.monotonic()
+    engine._fetch_all_data()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.3 * len(PAIRS) / 2
+    assert set(engine.current_prices) == set(PAIRS)
+
+
+def test_slow_and_failing_pairs_do_not_stall_the_tick(tmp_path):
+    exchange = FlakyExchange(hang={"ETH/USDT"}, fail={"SOL/USDT"})
+    engine = _engine(tmp_path, exchange)
+    try:
+        started = time.monotonic()
+        engine._fetch_all_data()
+        assert time.monotonic() - started < 1.0
+        assert set(engine.current_prices) == {"BTC/USDT", "XRP/USDT"}
+
+        # Next tick: the hung request is still out and the failed pair backs off
+        exchange.symbol_calls.clear()
+        engine._fetch_all_data()
+        assert sorted(exchange.symbol_calls) == ["BTC/USDT", "XRP/USDT"]
+        assert engine._fetch_failures["SOL/USDT"][0] == 1
+    finally:
+        exchange.release.set()
+
+
+def test_backoff_doubles_and_resets_on_success(tmp_path):
+    exchange = FlakyExchange(fail={"BTC/USDT"})
+    engine = _engine(tmp_path, exchange, **{"trading.fetch_backoff_seconds": 0})
+
+    engine._fetch_all_data()
+    engine._fetch_all_data()
+    assert engine._fetch_failures["BTC/USDT"][0] == 2
+
+    engine._fetch_failures["BTC/USDT"] = (2, 0.0)
+    engine._backoff_base = 10
+    engine._fetch_all_data()
+    failures, retry_at = engine._fetch_failures["BTC/USDT"]
+    assert failures == 3
+    assert retry_at - time.monotonic() == pytest.approx(40, abs=1)
+
+    exchange.fail.clear()
+    engine._fetch_failures["BTC/USDT"] = (3, 0.0)
+    engine._fetch_all_data()
+    assert "BTC/USDT" not in engine._fetch_failures
+    assert "BTC/USDT" in engine.current_prices
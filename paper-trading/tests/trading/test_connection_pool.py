@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from src.data.connection import ConnectionManager
+from src.data.database import Database
+from src.data.models import OrderStatus
+
+
+def test_file_database_uses_wal_and_one_writer(tmp_path):
+    connections = ConnectionManager(str(tmp_path / "trading.db"), synchronous="normal")
+    try:
+        assert connections.journal_mode == "wal"
+        with connections.write() as first:
+            first.execute("CREATE TABLE t (x INTEGER)")
+        with connections.write() as second:
+            second.execute("INSERT INTO t VALUES (1)")
+            assert second.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert first is second
+    finally:
+        connections.close()
+
+
+def test_nested_writes_commit_once_and_roll_back_together(tmp_path):
+    connections = ConnectionManager(str(tmp_path / "trading.db"))
+    try:
+        with connections.write() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(RuntimeError):
+            with connections.write() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                with connections.write() as inner:
+                    inner.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("tick failed")
+
+        with connections.write() as conn:
+            conn.execute("INSERT INTO t VALUES (3)")
+            with connections.write() as inner:
+                inner.execute("INSERT INTO t VALUES (4)")
+            # Not visible to readers until the outer block commits
+            with connections.read() as reader:
+                assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+        with connections.read() as reader:
+            rows = reader.execute("SELECT x FROM t ORDER BY x").fetchall()
+        assert [r["x"] for r in rows] == [3, 4]
+    finally:
+        connections.close()
+
+
+def test_read_pool_is_bounded_and_reused(tmp_path):
+    connections = ConnectionManager(str(tmp_path / "trading.db"), read_pool_size=2)
+    try:
+        seen = set()
+        barrier = threading.Barrier(4)
+
+        def reader():
+            barrier.wait()
+            for _ in range(20):
+                with connections.read() as conn:
+                    seen.add(id(conn))
+                    conn.execute("SELECT 1").fetchone()
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(seen) <= 2
+        assert connections._reader_count <= 2
+    finally:
+        connections.close()
+
+
+def test_unknown_synchronous_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unknown synchronous mode"):
+        ConnectionManager(str(tmp_path / "trading.db"), synchronous="sometimes")
+
+
+@pytest.mark.parametrize("path", [":memory:", "file"])
+def test_database_transaction_groups_writes(tmp_path, path):
+    db = Database(":memory:" if path == ":memory:" else str(tmp_path / "trading.db"))
+    try:
+        with db.transaction():
+            db.update_order_status(1, OrderStatus.FILLED, 1.0)
+            with db.transaction() as conn:
+                assert conn.in_transaction
+        assert db.get_pending_orders() == []
+    finally:
+        db.close()
+
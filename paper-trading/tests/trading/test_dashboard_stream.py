@@ -0,0 +1,202 @@
+import json
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.dashboard.stream import CLIENT_QUEUE_SIZE, RESYNC_MESSAGE, DeltaStream
+from src.data.database import Database
+from src.data.ledger import WriteBehindLedger
+from src.data.models import OrderSide, OrderType
+from src.trading.portfolio import Portfolio
+from src.utils.logger import DashboardHandler
+
+CONFIG = {"risk_management.max_position_pct": 0.3}
+
+
+def fake_engine(db):
+    portfolio = Portfolio(10000.0, 0.001, db=db, config=CONFIG)
+    return SimpleNamespace(
+        portfolio=portfolio, current_prices={}, is_running=True,
+        strategy=SimpleNamespace(name="rsi"), _timeframe="1h",
+    )
+
+
+def decode(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_deltas_carry_only_changes():
+    engine = fake_engine(Database(":memory:"))
+    stream = DeltaStream(engine)
+    client = stream.subscribe()
+
+    engine.current_prices = {"BTC/USDT": 100.0, "ETH/USDT": 10.0}
+    engine.portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, 100.0)
+    engine.portfolio.set_exit_levels("BTC/USDT", 90.0, 110.0)
+    stream.publish("tick")
+    event, first = decode(client.get_nowait())
+    assert event == "delta" and first["seq"] == 1
+    assert first["prices"] == {"BTC/USDT": 100.0, "ETH/USDT": 10.0}
+    [position] = first["positions"]["changed"]
+    assert position["take_profit_price"] == 110.0
+    assert [o["status"] for o in first["orders"]] == ["filled"]
+
+    stream.publish("price")  # nothing changed
+    _, idle = decode(client.get_nowait())
+    assert idle["kind"] == "price"
+    assert not {"prices", "positions", "orders", "trades", "performance"} & idle.keys()
+
+    engine.current_prices = {"BTC/USDT": 111.0, "ETH/USDT": 10.0}
+    engine.portfolio.update_positions(engine.current_prices)  # take-profit
+    stream.publish("price")
+    _, closed = decode(client.get_nowait())
+    assert closed["prices"] == {"BTC/USDT": 111.0}
+    assert closed["positions"] == {"changed": [], "closed": [position["id"]]}
+    assert [(o["side"], o["strategy_name"]) for o in closed["orders"]] == [
+        ("sell", "auto_take_profit")
+    ]
+    assert [t["symbol"] for t in closed["trades"]] == ["BTC/USDT"]
+    assert closed["trades"][0]["id"] is not None
+    assert closed["performance"]["total_trades"] == 1
+    assert closed["portfolio"]["open_positions"] == 0
+
+
+def test_performance_includes_trades_not_yet_written():
+    db = Database(":memory:")
+    engine = fake_engine(db)
+    ledger = WriteBehindLedger(db)
+    engine.portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    stream = DeltaStream(engine)
+    client = stream.subscribe()
+
+    engine.portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, 100.0)
+    engine.portfolio.commit()
+    ledger.flush()
+    # Hold the writer, as a slow disk would, until the delta is published
+    release = threading.Event()
+    ledger._queue(release.wait)
+    engine.portfolio.commit()
+    engine.portfolio.submit_order("BTC/USDT", OrderSide.SELL, OrderType.MARKET, 1.0, 110.0)
+    engine.portfolio.commit()
+    engine.current_prices = {"BTC/USDT": 110.0}
+    try:
+        stream.publish("tick")
+    finally:
+        release.set()
+    _, delta = decode(client.get_nowait())
+    ledger.close()
+
+    assert db.get_performance_stats()["total_trades"] == 1
+    assert delta["performance"] == db.get_performance_stats()
+
+
+def test_publish_cost_does_not_grow_with_clients():
+    db = Database(":memory:")
+    engine = fake_engine(db)
+    engine.current_prices = {"BTC/USDT": 100.0}
+    stream = DeltaStream(engine)
+    reads = []
+    read = db._connections.read
+    db._connections.read = lambda: (reads.append(1), read())[1]
+
+    def publish_with_fill(price):
+        portfolio = engine.portfolio
+        portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, price - 1)
+        portfolio.submit_order("BTC/USDT", OrderSide.SELL, OrderType.MARKET, 1.0, price)
+        engine.current_prices = {"BTC/USDT": price}
+        reads.clear()
+        stream.publish()
+        return len(reads)
+
+    publish_with_fill(100.0)
+    clients = [stream.subscribe()]
+    one_client = publish_with_fill(105.0)
+    clients[0].get_nowait()
+    clients += [stream.subscribe() for _ in range(49)]
+    many_clients = publish_with_fill(106.0)
+
+    assert many_clients == one_client
+    messages = {client.get_nowait() for client in clients}
+    assert len(messages) == 1  # encoded once, shared by every client
+
+
+def test_lagging_client_is_told_to_resync():
+    engine = fake_engine(Database(":memory:"))
+    stream = DeltaStream(engine)
+    slow = stream.subscribe()
+    for _ in range(CLIENT_QUEUE_SIZE + 1):
+        stream.publish()
+    assert slow.qsize() == 1
+    stream.publish()
+    assert slow.get_nowait() == RESYNC_MESSAGE
+    assert decode(slow.get_nowait())[1]["seq"] == CLIENT_QUEUE_SIZE + 2
+
+
+def test_log_lines_are_sent_once():
+    handler = DashboardHandler(max_records=5)
+    logger = logging.getLogger("test_dashboard_stream")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        logger.info("before the stream")
+        stream = DeltaStream(fake_engine(Database(":memory:")), handler)
+        client = stream.subscribe()
+        for i in range(8):
+            logger.info(f"line {i}")
+        stream.publish()
+        stream.publish()
+        assert decode(client.get_nowait())[1]["logs"] == [f"line {i}" for i in range(3, 8)]
+        assert "logs" not in decode(client.get_nowait())[1]
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_stream_endpoint_pushes_tick_deltas(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("apscheduler")
+    from src.dashboard.app import create_app
+    from src.trading.engine import TradingEngine
+
+    config = {"trading.pairs": ["BTC/USDT"], "trading.default_timeframe": "1h"}
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    app = create_app(engine, DashboardHandler(), config)
+    stream = app.config["stream"]
+    http = app.test_client()
+
+    response = http.get("/api/stream")
+    assert response.mimetype == "text/event-stream"
+    body = (chunk.decode() for chunk in response.response)
+    assert next(body).startswith("retry:")
+    assert stream.client_count == 1
+
+    engine._current_prices["BTC/USDT"] = 42000.0
+    engine._notify_listeners("price")
+    event, delta = decode(next(body))
+    assert event == "delta"
+    assert delta["prices"] == {"BTC/USDT": 42000.0}
+    assert delta["engine"]["timeframe"] == "1h"
+
+    response.close()
+    assert stream.client_count == 0
+
+    page = http.get("/").get_data(as_text=True)
+    assert "STREAM_ENABLED = true" in page
+    engine.stop()
+
+
+def test_stream_can_be_disabled(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("apscheduler")
+    from src.dashboard.app import create_app
+    from src.trading.engine import TradingEngine
+
+    config = {"trading.pairs": ["BTC/USDT"], "dashboard.stream": False}
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    http = create_app(engine, DashboardHandler(), config).test_client()
+    assert http.get("/api/stream").status_code == 404
+    assert "STREAM_ENABLED = false" in http.get("/").get_data(as_text=True)
+    assert engine._tick_listeners == []
+    engine.stop()
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from src.data.database import Database
+from src.trading import indicator_graph
+from src.trading.backtester import run_backtest_simulation, run_fanout_simulation
+from tests.trading.helpers import make_ohlcv
+
+RUNS = [
+    {"strategy_name": "ema_sma_crossover", "strategy_params": {"ema_period": 5, "sma_period": 12}},
+    {"strategy_name": "rsi", "strategy_params": {"period": 7, "overbought": 60, "oversold": 40}},
+    {"strategy_name": "combined", "strategy_params": {"ema_period": 5, "sma_period": 12,
+                                                       "rsi_period": 30}},
+    # Same strategy again with its own stop-loss: a second portfolio, no new indicators
+    {"strategy_name": "ema_sma_crossover", "strategy_params": {"ema_period": 5, "sma_period": 12},
+     "stop_loss_pct": 0.005},
+]
+CONFIG = {"risk_management.max_position_pct": 0.4, "backtesting.indicator_cache_mb": 0}
+
+
+def _data():
+    return {"BTC/USDT": make_ohlcv(1500, 1, 40000.0), "ETH/USDT": make_ohlcv(1500, 2, 2500.0)}
+
+
+def _summary(result):
+    return (result.strategy_name, result.stop_loss_pct, result.total_trades,
+            result.equity_curve,
+            [(t.symbol, t.entry_price, t.exit_price, t.pnl) for t in result.trades])
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_fanout_matches_separate_runs(engine):
+    data = _data()
+    args = (list(data), "1m", 1, 10000.0, 0.01, 0.015, data)
+
+    results = run_fanout_simulation(CONFIG, RUNS, *args, log_results=False, engine=engine)
+
+    assert len(results) == len(RUNS)
+    for run, result in zip(RUNS, results):
+        alone = run_backtest_simulation(
+            CONFIG, run["strategy_name"], run["strategy_params"], list(data), "1m", 1,
+            10000.0, run.get("stop_loss_pct", 0.01), 0.015, data,
+            log_results=False, engine=engine,
+        )
+        assert _summary(result) == _summary(alone)
+        assert result.total_trades > 3
+    # Runs with a longer warmup start their equity curve later
+    assert len(results[2].equity_curve) < len(results[0].equity_curve)
+    assert _summary(results[0]) != _summary(results[3])
+
+
+def test_indicators_are_computed_once_across_strategies(monkeypatch):
+    calls = []
+    for kind, kernel in list(indicator_graph.KERNELS.items()):
+        monkeypatch.setitem(indicator_graph.KERNELS, kind,
+                            lambda values, window, out=None, kind=kind, kernel=kernel:
+                            calls.append((kind, window)) or kernel(values, window, out=out))
+    data = _data()
+
+    run_fanout_simulation(CONFIG, RUNS, list(data), "1m", 1, 10000.0, None, None, data,
+                          log_results=False)
+
+    # ema(5), sma(12), rsi(7) and rsi(30), once per symbol
+    assert sorted(calls) == sorted([("ema", 5), ("sma", 12), ("rsi", 7), ("rsi", 30)] * 2)
+
+
+def test_runs_without_enough_data_get_empty_results():
+    data = {"BTC/USDT": make_ohlcv(40, 1)}
+    runs = [RUNS[1], {"strategy_name": "rsi", "strategy_params": {"period": 50}}]
+
+    short, too_long = run_fanout_simulation(CONFIG, runs, ["BTC/USDT"], "1m", 1, 10000.0,
+                                            None, None, data, log_results=False)
+
+    # Warmup is the longest period among the defaults too (sma_period=20) + 5
+    assert short.strategy_name == "rsi" and len(short.equity_curve) == 40 - 25
+    assert too_long.strategy_name == "" and too_long.equity_curve == []
+
+
+def test_compare_endpoint_ranks_strategies(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("apscheduler")
+    from src.dashboard.app import create_app
+    from src.dashboard.jobs import BacktestJobQueue
+    from src.trading.engine import TradingEngine
+    from src.utils.logger import DashboardHandler
+    from tests.trading.helpers import LocalExchangeFactory
+    from tests.trading.test_backtest_jobs import wait_for
+
+    config = {"trading.pairs": ["BTC/USDT"]}
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    app = create_app(engine, DashboardHandler(), config)
+    app.config["backtest_jobs"].close()
+    app.config["backtest_jobs"] = BacktestJobQueue(
+        engine._db, config, LocalExchangeFactory(int(time.time() * 1000) - 3 * 86_400_000),
+        isolation="thread",
+    )
+    http = app.test_client()
+    try:
+        assert http.post("/api/backtest/compare", json={"days": 1}).status_code == 400
+        for strategies in ({"strategy": "rsi"}, ["rsi"], [{"strategy": "macd"}],
+                           [{"strategy": "rsi", "params": [14]}]):
+            response = http.post("/api/backtest/compare", json={"strategies": strategies})
+            assert response.status_code == 400, strategies
+        assert "Unknown strategy: macd" in http.post(
+            "/api/backtest/compare", json={"strategies": [{"strategy": "macd"}]}
+        ).get_json()["error"]
+
+        body = {"strategies": [{"strategy": "rsi"}, {"strategy": "combined"},
+                               {"strategy": "ema_sma_crossover", "params": {"ema_period": 5}}],
+                "symbols": ["BTC/USDT"], "timeframe": "1m", "days": 1}
+        started = http.post("/api/backtest/compare", json=body).get_json()
+        status = wait_for(app.config["backtest_jobs"], started["task_id"],
+                          {"completed", "error"}, timeout=60)
+        assert status["status"] == "completed", status["error_msg"]
+
+        result = http.get(f"/api/backtest/status/{started['task_id']}").get_json()["result"]
+        names = [r["strategy_name"] for r in result["results"]]
+        assert names == ["rsi", "combined", "ema_sma_crossover"]
+        assert result["results"][2]["strategy_params"] == {"ema_period": 5}
+        returns = [result["results"][i]["total_return_pct"] for i in result["leaderboard"]]
+        assert sorted(result["leaderboard"]) == [0, 1, 2]
+        assert returns == sorted(returns, reverse=True)
+    finally:
+        app.config["backtest_jobs"].close()
+        engine.stop()
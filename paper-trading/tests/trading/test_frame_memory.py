@@ -0,0 +1,102 @@
+import gc
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.data.candle_store import ohlcv_frame
+from src.data.synthetic import synthetic_ohlcv
+from src.trading.backtester import run_backtest_simulation
+from src.trading.indicator_graph import IndicatorGraphs
+from src.trading.strategy import CombinedStrategy, EMASMACrossoverStrategy, RSIStrategy
+
+BARS = 200_000
+BACKTEST_BARS = 100_000
+
+
+def _traced(fn):
+    """(result, bytes still allocated after fn, peak bytes during fn)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def test_indicator_frames_share_the_ohlcv_and_each_other():
+    df = synthetic_ohlcv(BARS)
+    data_bytes = df.memory_usage(index=False).sum()
+    graphs = IndicatorGraphs()
+    strategies = [EMASMACrossoverStrategy({}), RSIStrategy({}), CombinedStrategy({})]
+    for strategy in strategies:
+        strategy.indicator_graphs = graphs
+
+    frames, retained, peak = _traced(
+        lambda: [strategy.calculate_indicators(df, "BTC/USDT") for strategy in strategies]
+    )
+
+    # Three frames hold the three unique indicator arrays and nothing else
+    node_bytes = 3 * BARS * 8
+    assert node_bytes <= retained < node_bytes + 256 * 1024
+    # Roughly one data-sized working set (RSI's gain/loss temporaries) at a time
+    assert peak < 1.1 * data_bytes
+    for frame in frames:
+        for column in ("timestamp", "open", "close", "volume"):
+            assert np.shares_memory(frame[column].to_numpy(), df[column].to_numpy())
+    assert np.shares_memory(frames[0]["ema"].to_numpy(), frames[2]["ema"].to_numpy())
+    assert np.shares_memory(frames[1]["rsi"].to_numpy(), frames[2]["rsi"].to_numpy())
+
+    # Writes copy on write: the shared buffers stay as they were
+    close, ema = df["close"].iloc[50], frames[2]["ema"].iloc[50]
+    frames[0].loc[50, ["close", "ema"]] = -1.0
+    assert df["close"].iloc[50] == frames[2]["close"].iloc[50] == close
+    assert frames[2]["ema"].iloc[50] == ema
+    assert frames[0]["ema"].iloc[50] == -1.0
+
+
+def test_frames_from_candle_arrays_are_one_copy():
+    rows = synthetic_ohlcv(BARS)
+    candles = np.vstack([rows["timestamp"].to_numpy().astype(np.int64).astype(np.float64),
+                         rows[["open", "high", "low", "close", "volume"]].to_numpy().T])
+    data_bytes = rows.memory_usage(index=False).sum()
+
+    wrapped, retained, _ = _traced(lambda: ohlcv_frame(candles, copy=False))
+    # Only the timestamp column is new; prices are the array's rows
+    assert retained < data_bytes / 6 + 64 * 1024
+    assert np.shares_memory(wrapped["close"].to_numpy(), candles)
+
+    copied, retained, peak = _traced(lambda: ohlcv_frame(candles))
+    assert retained < data_bytes + 64 * 1024 and peak < 1.2 * data_bytes
+    assert not np.shares_memory(copied["close"].to_numpy(), candles)
+    assert copied.equals(rows) and wrapped.equals(rows)
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_backtest_memory_beyond_the_equity_curve(engine):
+    df = synthetic_ohlcv(BACKTEST_BARS, "SYN000/USDT")
+    data_bytes = df.memory_usage(index=False).sum()
+    config = {"backtesting.indicator_cache_mb": 0}  # nothing kept across runs
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run_backtest_simulation(
+            config, "combined", {}, ["SYN000/USDT"], "1m", 0, 10000.0, None, None,
+            {"SYN000/USDT": df}, log_results=False, engine=engine,
+        )
+        with_curve, peak = tracemalloc.get_traced_memory()
+        # One dict per bar: by far the largest part of a result, and unbounded
+        result.equity_curve = None
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    curve_bytes = with_curve - retained
+
+    # Indicators and signal arrays: about one and a half data-sized working sets
+    assert peak - curve_bytes < 2 * data_bytes
+    # Afterwards only the trades remain
+    assert result.trades
+    assert retained < 1024 * len(result.trades) + 256 * 1024
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.trading.backtester import Backtester
+from tests.trading.helpers import LocalExchange
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+
+
+def test_symbols_and_pages_download_concurrently():
+    listed_ms = int(time.time() * 1000) - 30 * 86_400_000
+    exchange = LocalExchange(listed_ms, latency=0.1, rate_limit_ms=10)
+    backtester = Backtester({}, exchange)
+    progress = []
+
+    started = time.monotonic()
+    data = backtester.fetch_historical_data(SYMBOLS, "1m", 1, progress_callback=progress.append)
+    elapsed = time.monotonic() - started
+
+    # 3 symbols x 2 pages; one after another would take at least 6 x 0.1s
+    assert len(exchange.calls) == 6
+    assert elapsed < 0.4
+    assert max(progress) == 100
+
+    # One shared budget: request starts are spaced by rateLimit across threads
+    starts = sorted(exchange.request_times)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.009
+
+    for symbol in SYMBOLS:
+        df = data[symbol]
+        assert 1440 <= len(df) <= 1441
+        assert df["timestamp"].is_monotonic_increasing
+        assert df["timestamp"].is_unique
+
+
+def test_failed_page_truncates_instead_of_leaving_a_hole():
+    listed_ms = int(time.time() * 1000) - 30 * 86_400_000
+    exchange = LocalExchange(listed_ms)
+    fetch = exchange.fetch_ohlcv
+
+    def flaky_fetch(symbol, timeframe, since=None, limit=1000):
+        if len(exchange.calls) == 1:
+            exchange.calls.append(since)
+            raise RuntimeError("boom")
+        return fetch(symbol, timeframe, since=since, limit=limit)
+
+    exchange.fetch_ohlcv = flaky_fetch
+    backtester = Backtester({}, exchange)
+    candles, complete = backtester._fetch_range("BTC/USDT", "1m", listed_ms, listed_ms + 3000 * 60_000)
+
+    assert not complete
+    assert len(candles) == 1000
+
+
+def test_capped_pages_are_continued_without_holes():
+    listed_ms = int(time.time() * 1000) - 30 * 86_400_000
+    exchange = LocalExchange(listed_ms, page_cap=500)
+    backtester = Backtester({}, exchange)
+
+    df = backtester._fetch_historical_data("BTC/USDT", "1m", 3)
+
+    assert 4320 <= len(df) <= 4321
+    gaps = df["timestamp"].diff().dropna().dt.total_seconds()
+    assert (gaps == 60).all()
@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.trading.indicator_cache import CountedCache, IndicatorCache, fingerprint
+from src.trading.strategy import CombinedStrategy
+from tests.trading.helpers import make_ohlcv
+
+
+def test_hit_and_miss_counters():
+    cache = IndicatorCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(4.0)
+
+    first = cache.get_or_compute("BTC/USDT", "fp", "ema", {"window": 10}, compute)
+    second = cache.get_or_compute("BTC/USDT", "fp", "ema", {"window": 10}, compute)
+    cache.get_or_compute("BTC/USDT", "fp", "ema", {"window": 11}, compute)
+
+    assert second is first
+    assert not first.flags.writeable
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_counted_cache_counts_only_its_own_lookups():
+    cache = IndicatorCache()
+    run = CountedCache(cache)
+    compute = lambda: np.arange(4.0)  # noqa: E731
+
+    cache.get_or_compute("BTC/USDT", "fp", "ema", {"window": 10}, compute)
+    run.get_or_compute("BTC/USDT", "fp", "ema", {"window": 10}, compute)
+    run.get_or_compute("BTC/USDT", "fp", "ema", {"window": 11}, compute)
+    # Another backtest sharing the cache meanwhile
+    cache.get_or_compute("ETH/USDT", "fp", "ema", {"window": 10}, compute)
+
+    assert (run.hits, run.misses) == (1, 1)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_lru_eviction_by_bytes():
+    cache = IndicatorCache(max_bytes=2 * 8 * 100)
+
+    def get(window):
+        cache.get_or_compute("BTC/USDT", "fp", "sma", {"window": window}, lambda: np.zeros(100))
+
+    get(1)
+    get(2)
+    get(1)  # window=2 is now least recently used
+    get(3)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    get(1)
+    assert cache.stats()["hits"] == 2
+    get(2)
+    assert cache.stats()["misses"] == 4
+
+
+def test_fingerprint_tracks_content():
+    df = make_ohlcv(200, 1)
+    assert fingerprint(df) == fingerprint(df.copy())
+    changed = df.copy()
+    changed.loc[10, "close"] += 1.0
+    assert fingerprint(changed) != fingerprint(df)
+
+
+def test_cached_indicators_match_uncached():
+    df = make_ohlcv(500, 4)
+    plain = CombinedStrategy({}).calculate_indicators(df, "BTC/USDT")
+
+    strategy = CombinedStrategy({})
+    strategy.indicator_cache = IndicatorCache()
+    strategy.calculate_indicators(df, "BTC/USDT")
+    cached = strategy.calculate_indicators(df, "BTC/USDT")
+
+    assert strategy.indicator_cache.stats()["hits"] == 3
+    for column in ("ema", "sma", "rsi"):
+        np.testing.assert_array_equal(cached[column].to_numpy(), plain[column].to_numpy())
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.database import Database
+from src.trading import indicators
+from src.trading.engine import TradingEngine
+from src.trading.indicator_cache import IndicatorCache
+from src.trading.indicator_graph import IndicatorGraph, IndicatorGraphs, IndicatorSpec
+from src.trading.strategy import CombinedStrategy, EMASMACrossoverStrategy, RSIStrategy
+from src.utils.config import Config
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+
+def test_strategies_share_nodes_on_the_same_frame():
+    df = make_ohlcv(400, 3, 40000.0)
+    graphs = IndicatorGraphs()
+    strategies = [EMASMACrossoverStrategy({}), RSIStrategy({}), CombinedStrategy({})]
+    for strategy in strategies:
+        strategy.indicator_graphs = graphs
+
+    frames = [strategy.calculate_indicators(df, "BTC/USDT") for strategy in strategies]
+
+    graph = graphs.get(df, "BTC/USDT")
+    # ema, sma, rsi once each; Combined reuses all three
+    assert graph.stats() == {"nodes": 3, "computed": 3, "reused": 3}
+    close = df["close"].to_numpy()
+    np.testing.assert_array_equal(frames[2]["ema"], indicators.ema(close, 10))
+    np.testing.assert_array_equal(frames[0]["sma"], frames[2]["sma"])
+    np.testing.assert_array_equal(frames[1]["rsi"], frames[2]["rsi"])
+    assert "ema" not in df.columns  # the input frame is left alone
+
+    # A different frame object starts a new graph
+    assert graphs.get(df.copy(), "BTC/USDT") is not graph
+
+
+def test_specs_over_other_specs_skip_their_warmup():
+    df = make_ohlcv(300, 5)
+    rsi = IndicatorSpec("rsi", 14)
+    smoothed = IndicatorSpec("sma", 5, rsi)
+    graph = IndicatorGraph(df)
+
+    values = graph.values(smoothed)
+
+    expected = pd.Series(graph.values(rsi)).rolling(5).mean().to_numpy()
+    np.testing.assert_allclose(values, expected, atol=1e-9)
+    assert np.isnan(values[:17]).all() and not np.isnan(values[17:]).any()
+    assert not values.flags.writeable
+    assert graph.stats()["computed"] == 2
+    assert smoothed.label == "sma(rsi(close, 14), 5)"
+
+
+def test_cache_is_used_for_close_nodes_only():
+    df = make_ohlcv(200, 1)
+    cache = IndicatorCache()
+    specs = {"ema": IndicatorSpec("ema", 10), "vol": IndicatorSpec("sma", 10, "volume")}
+
+    IndicatorGraph(df, "BTC/USDT", cache).columns(specs)
+    IndicatorGraph(df, "BTC/USDT", cache).columns(specs)
+
+    # The cache fingerprints closes, so the volume SMA is never stored in it
+    assert cache.stats()["entries"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_invalid_specs_are_rejected():
+    with pytest.raises(ValueError, match="Unknown indicator: macd"):
+        IndicatorSpec("macd", 10)
+    with pytest.raises(ValueError, match="window"):
+        IndicatorSpec("ema", 0)
+
+
+def test_engine_computes_each_node_once_per_frame(tmp_path):
+    # A real Config: change_strategy() edits its data
+    path = tmp_path / "config.yaml"
+    path.write_text("trading: {pairs: [BTC/USDT], default_timeframe: 1h, candle_buffer_size: 80}\n")
+    engine = TradingEngine(Config(str(path)), Database(str(tmp_path / "trading.db")))
+    engine._exchange = ReplayExchange(make_ohlcv(200, 4, 40000.0), cursor=150)
+    engine._fetch_all_data()
+
+    # The tick's signal pass and the dashboard chart read the same nodes
+    engine._strategy.generate_signals(engine.ohlcv_data, {})
+    engine.get_pair_data("BTC/USDT")
+    graph = engine._indicator_graphs.get(engine.ohlcv_data["BTC/USDT"], "BTC/USDT")
+    assert graph.stats() == {"nodes": 2, "computed": 2, "reused": 2}
+
+    # A swapped-in strategy only computes the nodes it adds
+    engine.change_strategy("combined")
+    assert "rsi" in engine.get_pair_data("BTC/USDT").columns
+    assert graph.stats() == {"nodes": 3, "computed": 3, "reused": 4}
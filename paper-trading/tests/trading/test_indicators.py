@@ -0,0 +1,79 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("ta")
+
+from ta.momentum import RSIIndicator
+from ta.trend import EMAIndicator, SMAIndicator
+
+from src.data.synthetic import synthetic_ohlcv
+from src.trading import indicators
+from tests.trading.helpers import make_ohlcv
+
+TOLERANCE = 1e-9
+
+
+def _golden(close, window):
+    """{kernel: ta's output} for a close Series."""
+    return {
+        indicators.ema: EMAIndicator(close, window=window).ema_indicator(),
+        indicators.sma: SMAIndicator(close, window=window).sma_indicator(),
+        indicators.rsi: RSIIndicator(close, window=window).rsi(),
+        indicators.wilder: close.ewm(alpha=1 / window, adjust=False, min_periods=window).mean(),
+    }
+
+
+def _assert_matches(values, expected, rtol=0.0):
+    expected = np.asarray(expected, dtype=float)
+    assert np.array_equal(np.isnan(values), np.isnan(expected))
+    valid = ~np.isnan(expected)
+    assert np.all(np.abs(values[valid] - expected[valid])
+                  <= TOLERANCE + rtol * np.abs(expected[valid]))
+
+
+# 2000 bars span several kernel blocks; windows around the block size too
+@pytest.mark.parametrize("window", [1, 2, 10, 14, 50, 255, 256, 300])
+def test_kernels_match_ta(window):
+    close = make_ohlcv(2000, 5, 40000.0)["close"]
+    values = close.to_numpy()
+
+    for kernel, expected in _golden(close, window).items():
+        _assert_matches(kernel(values, window), expected)
+
+
+@pytest.mark.parametrize("bars", [1, 3, 256, 257])
+def test_short_inputs_match_ta(bars):
+    close = make_ohlcv(bars, 2, 100.0)["close"]
+    for kernel, expected in _golden(close, 14).items():
+        _assert_matches(kernel(close.to_numpy(), 14), expected)
+
+
+def test_long_series_stays_within_relative_tolerance():
+    # A 200k-bar walk ranges over prices a hundred times apart
+    close = synthetic_ohlcv(200_000)["close"] * 40000
+    for kernel, expected in _golden(close, 20).items():
+        _assert_matches(kernel(close.to_numpy(), 20), expected, rtol=TOLERANCE)
+
+
+def test_flat_prices_rsi_is_100():
+    values = indicators.rsi(np.full(6, 100.0), 3)
+    assert np.isnan(values[:2]).all()
+    assert (values[2:] == 100.0).all()
+
+
+def test_kernels_write_into_output_buffers():
+    close = make_ohlcv(600, 7, 2500.0)["close"].to_numpy()
+    for kernel in (indicators.ema, indicators.sma, indicators.rsi, indicators.wilder):
+        out = np.full(len(close), -1.0)
+        assert kernel(close, 12, out=out) is out
+        np.testing.assert_array_equal(out, kernel(close, 12))
+
+    with pytest.raises(ValueError, match="shape"):
+        indicators.ema(close, 12, out=np.empty(len(close) - 1))
+    with pytest.raises(ValueError, match="float64"):
+        indicators.sma(close, 12, out=np.empty(len(close), dtype=np.float32))
+    with pytest.raises(ValueError, match="overlap"):
+        indicators.sma(close, 12, out=close)
+    with pytest.raises(ValueError, match="window"):
+        indicators.rsi(close, 0)
+    assert len(indicators.ema(np.empty(0), 5)) == 0
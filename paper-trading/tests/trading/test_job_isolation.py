@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("apscheduler")
+
+from src.dashboard.jobs import BacktestJobQueue  # noqa: E402
+from src.data.database import Database  # noqa: E402
+from src.trading.backtester import DOWNLOAD_PROGRESS_SHARE  # noqa: E402
+from src.trading.engine import TradingEngine  # noqa: E402
+from tests.trading.helpers import LocalExchangeFactory, ReplayExchange, make_ohlcv  # noqa: E402
+from tests.trading.test_backtest_jobs import wait_for  # noqa: E402
+
+CONFIG = {
+    "trading.pairs": ["BTC/USDT"],
+    "trading.default_timeframe": "1m",
+    # Pure-Python bar loop, serial: the sweep holds a core the whole time
+    "backtesting.engine": "loop",
+    "backtesting.sweep_workers": 1,
+}
+
+SWEEP = {
+    "strategy_name": "rsi", "symbols": ["BTC/USDT"], "timeframe": "1m", "days": 7,
+    "initial_balance": 10000.0, "stop_loss_pct": None, "take_profit_pct": None,
+    "param_ranges": {"period": {"min": 5, "max": 200, "step": 1}}, "base_params": {},
+}
+
+
+def exchange_factory():
+    return LocalExchangeFactory(int(time.time() * 1000) - 8 * 86_400_000)
+
+
+def tick_latencies(engine, seconds, period=0.05):
+    """Run engine._tick() every `period`; ms from each scheduled start to its end."""
+    latencies = []
+    start = time.monotonic()
+    for k in range(1, int(seconds / period) + 1):
+        scheduled = start + k * period
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        engine._tick()
+        latencies.append((time.monotonic() - scheduled) * 1000)
+    return np.array(latencies)
+
+
+def crash(job, config, exchange):
+    os._exit(3)
+
+
+def echo(job, config, exchange):
+    logging.getLogger("tests.job_process").info(f"echo from {os.getpid()}")
+    job.set_progress(100)
+    return {"pid": os.getpid(), "params": job.params}
+
+
+def test_tick_latency_is_unchanged_while_a_sweep_runs(tmp_path):
+    engine = TradingEngine(CONFIG, Database(str(tmp_path / "trading.db")))
+    engine._exchange = ReplayExchange(make_ohlcv(300, 6, 40000.0), cursor=150)
+    engine._running = True
+    engine._tick()
+    queue = BacktestJobQueue(Database(str(tmp_path / "jobs.db")), CONFIG, exchange_factory())
+    try:
+        baseline = tick_latencies(engine, 2.0)
+
+        job_id = queue.submit("sweep", SWEEP)
+        deadline = time.monotonic() + 60
+        while queue.status(job_id)["progress"] <= DOWNLOAD_PROGRESS_SHARE:
+            assert time.monotonic() < deadline, queue.status(job_id)
+            time.sleep(0.05)
+        progress = queue.status(job_id)["progress"]
+        during = tick_latencies(engine, 2.0)
+        status = queue.status(job_id)
+        assert status["status"] == "running" and status["progress"] > progress
+
+        # In a worker thread the sweep holds the GIL and p95 grows ~15x
+        assert np.percentile(during, 95) <= 2 * np.percentile(baseline, 95) + 2.0, (
+            np.percentile(baseline, [50, 95]), np.percentile(during, [50, 95])
+        )
+        assert queue.cancel(job_id)
+        assert wait_for(queue, job_id, {"cancelled"}, timeout=10)
+    finally:
+        queue.close()
+        engine.stop()
+
+
+def test_job_process_is_reused_and_forwards_logs(tmp_path, caplog):
+    caplog.set_level(logging.INFO)  # job processes log at the root level
+    queue = BacktestJobQueue(Database(str(tmp_path / "jobs.db")), {}, None,
+                             runners={"backtest": echo})
+    try:
+        first = queue.submit("backtest", {"n": 1})
+        second = queue.submit("backtest", {"n": 2})
+        first_result = wait_for(queue, first, {"completed"}, timeout=60)["result"]
+        second_result = wait_for(queue, second, {"completed"}, timeout=10)["result"]
+    finally:
+        queue.close()
+    assert first_result["params"] == {"n": 1}
+    assert first_result["pid"] == second_result["pid"] != os.getpid()
+    assert f"echo from {first_result['pid']}" in caplog.messages
+
+
+def test_a_crashed_job_process_fails_the_job_and_is_replaced(tmp_path):
+    queue = BacktestJobQueue(Database(str(tmp_path / "jobs.db")), {}, None,
+                             runners={"backtest": echo, "sweep": crash})
+    try:
+        crashed = queue.submit("sweep", {})
+        after = queue.submit("backtest", {"n": 1})
+        status = wait_for(queue, crashed, {"error"}, timeout=60)
+        assert "exit code 3" in status["error_msg"]
+        assert wait_for(queue, after, {"completed"}, timeout=60)["result"]["params"] == {"n": 1}
+    finally:
+        queue.close()
+
+
+def test_unknown_isolation_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown job isolation"):
+        BacktestJobQueue(Database(str(tmp_path / "jobs.db")), {}, None, isolation="fiber")
@@ -0,0 +1,52 @@
+import pytest
+
+from src.data.database import Database
+from src.data.ledger import DatabaseLedger, InMemoryLedger
+from src.data.models import OrderSide, OrderType
+from src.trading.portfolio import Portfolio
+
+CONFIG = {"risk_management.max_position_pct": 0.5}
+
+
+def round_trips(portfolio, count):
+    for i in range(count):
+        price = 100.0 + (i % 7)
+        qty = portfolio.calculate_position_size("BTC/USDT", OrderSide.BUY, price)
+        portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, qty, price, strategy_name="test")
+        portfolio.set_exit_levels("BTC/USDT", price * 0.9, price * 1.1)
+        portfolio.update_positions({"BTC/USDT": price + 1})
+        portfolio.submit_order("BTC/USDT", OrderSide.SELL, OrderType.MARKET, qty, price + 1, strategy_name="test")
+
+
+@pytest.mark.parametrize("ledger_factory", [
+    InMemoryLedger,
+    lambda: DatabaseLedger(Database(":memory:")),
+])
+def test_portfolio_records_trades(ledger_factory):
+    ledger = ledger_factory()
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    round_trips(portfolio, 3)
+
+    trades = portfolio.get_trade_history()
+    assert len(trades) == 3
+    assert [t.entry_price for t in trades] == [102.0, 101.0, 100.0]  # newest first
+    assert ledger.get_open_positions() == []
+    stats = portfolio.get_performance_stats()
+    assert stats["total_trades"] == 3
+    assert stats["total_pnl"] == pytest.approx(sum(t.pnl for t in trades))
+
+
+def test_in_memory_and_database_ledgers_agree():
+    memory = Portfolio(10000.0, 0.001, config=CONFIG, ledger=InMemoryLedger())
+    database = Portfolio(10000.0, 0.001, db=Database(":memory:"), config=CONFIG)
+    round_trips(memory, 20)
+    round_trips(database, 20)
+
+    assert memory.get_cash_balance() == database.get_cash_balance()
+    assert memory.get_performance_stats() == pytest.approx(database.get_performance_stats())
+
+
+def test_in_memory_ledger_has_no_trade_cap():
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=InMemoryLedger())
+    round_trips(portfolio, 10050)
+    assert len(portfolio._ledger.get_trade_records(limit=None)) == 10050
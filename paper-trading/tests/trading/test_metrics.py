@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from src.data.connection import ConnectionManager
+from src.data.database import Database
+from src.utils.metrics import MetricsRegistry, RollingHistogram
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+CONFIG = {
+    "trading.pairs": ["BTC/USDT", "ETH/USDT"],
+    "trading.default_timeframe": "1h",
+    "risk_management.max_position_pct": 0.3,
+}
+
+
+class SlowPairExchange(ReplayExchange):
+    """ReplayExchange where one pair answers `delay` seconds late."""
+
+    def __init__(self, df, cursor, slow_symbol, delay):
+        super().__init__(df, cursor)
+        self.slow_symbol = slow_symbol
+        self.delay = delay
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        if symbol == self.slow_symbol:
+            time.sleep(self.delay)
+        return super().fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+
+def series(snapshot, name):
+    return {tuple(sorted(s["labels"].items())): s for s in snapshot["metrics"][name]["series"]}
+
+
+def test_percentiles_cover_the_window_and_totals_do_not():
+    histogram = RollingHistogram(window=100)
+    for value in range(1, 201):
+        histogram.observe(float(value))
+    summary = histogram.summary()
+    assert (summary["p50"], summary["p95"], summary["p99"], summary["max"]) == (150, 195, 199, 200)
+    assert (summary["count"], summary["sum"]) == (200, 20100.0)
+    assert RollingHistogram().summary()["p99"] is None
+
+
+@pytest.fixture
+def engine(tmp_path):
+    pytest.importorskip("apscheduler")
+    from src.trading.engine import TradingEngine
+
+    metrics = MetricsRegistry(window=50)
+    path = str(tmp_path / "trading.db")
+    db = Database(path, ConnectionManager(path, metrics=metrics))
+    engine = TradingEngine(CONFIG, db, metrics=metrics)
+    engine._exchange = SlowPairExchange(make_ohlcv(200, 6, 40000.0), cursor=150,
+                                        slow_symbol="ETH/USDT", delay=0.05)
+    engine._running = True
+    yield engine
+    engine.stop()
+
+
+def test_tick_phases_pairs_writes_and_lock_waits_are_timed(engine):
+    for _ in range(3):
+        engine._tick()
+    snapshot = engine.metrics.snapshot()
+
+    phases = series(snapshot, "tick_phase_seconds")
+    assert {dict(key)["phase"] for key in phases} == {
+        "fetch", "update_positions", "check_pending_orders", "generate_signals",
+        "execute", "snapshot", "commit", "notify",
+    }
+    assert all(s["count"] == 3 for s in phases.values())
+    [tick] = series(snapshot, "tick_seconds").values()
+    fetch = phases[(("kind", "tick"), ("phase", "fetch"))]
+    assert tick["count"] == 3 and tick["p50"] >= fetch["p50"] >= 0.05
+
+    pairs = series(snapshot, "fetch_seconds")
+    slow, fast = pairs[(("symbol", "ETH/USDT"),)], pairs[(("symbol", "BTC/USDT"),)]
+    assert slow["p95"] >= 0.05 > fast["p95"]
+
+    assert series(snapshot, "db_write_seconds")[()]["count"] >= 3  # a snapshot per tick
+    assert series(snapshot, "portfolio_lock_wait_seconds")[()]["count"] > 0
+
+
+def test_lock_wait_shows_contention(engine):
+    engine._tick()
+    held = threading.Event()
+
+    def hold_lock():
+        with engine.portfolio._lock:
+            held.set()
+            time.sleep(0.1)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait()
+    engine.portfolio.update_positions(engine.current_prices)
+    holder.join()
+    waits = series(engine.metrics.snapshot(), "portfolio_lock_wait_seconds")[()]
+    assert waits["max"] >= 0.09
+
+
+def test_metrics_endpoint_serves_json_and_prometheus(engine):
+    pytest.importorskip("flask")
+    from src.dashboard.app import create_app
+    from src.utils.logger import DashboardHandler
+
+    engine._tick()
+    http = create_app(engine, DashboardHandler(), CONFIG).test_client()
+
+    body = http.get("/api/metrics").get_json()
+    assert body["window"] == 50
+    assert set(body["metrics"]) >= {"tick_phase_seconds", "fetch_seconds", "db_write_seconds"}
+
+    response = http.get("/api/metrics?format=prometheus")
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    assert "# TYPE paper_trading_tick_phase_seconds summary" in text
+    assert 'paper_trading_tick_phase_seconds{kind="tick",phase="fetch",quantile="0.95"} ' in text
+    assert 'paper_trading_fetch_seconds_count{symbol="ETH/USDT"} 1\n' in text
+
+    assert http.get("/api/metrics?format=xml").status_code == 400
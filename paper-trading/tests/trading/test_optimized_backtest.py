@@ -22,30 +22,25 @@ sys.modules["ta.momentum"] = MagicMock()
 sys.modules["apscheduler"] = MagicMock()
 sys.modules["apscheduler.schedulers.background"] = MagicMock()
 
-import pytest
-from src.trading.backtester import run_backtest_simulation, BacktestResult
-from src.trading.strategy import BaseStrategy
+from src.trading.backtester import run_backtest_simulation
+
+def mock_columns(n):
+    """df[column] for a mock frame of n candles, all closing at 100.0."""
+    import numpy as np
+    ts = MagicMock()
+    ts.isoformat.return_value = "2023-01-01T00:00:00"
+    close, timestamp = MagicMock(), MagicMock()
+    close.to_numpy.return_value = np.full(n, 100.0)
+    timestamp.iloc.__getitem__.side_effect = lambda rows: [ts] * len(range(n)[rows])
+    return {"close": close, "timestamp": timestamp}.__getitem__
 
 def test_optimized_backtest_calls():
     # Setup mocks
     mock_df = MagicMock()
     mock_df.__len__.return_value = 100 # 100 candles
 
-    # Mock iloc to return a MagicMock that returns a float for "close"
-    # and a string for "timestamp"
-    def mock_getitem(key):
-        if key == "close": return 100.0
-        if key == "timestamp":
-            ts = MagicMock()
-            ts.isoformat.return_value = "2023-01-01T00:00:00"
-            return ts
-        return 0.0
-
-    mock_row = MagicMock()
-    mock_row.__getitem__.side_effect = mock_getitem
-
-    # Allow df.iloc[i] to return mock_row
-    mock_df.iloc.__getitem__.return_value = mock_row
+    # The loop reads the "close" and "timestamp" columns once as arrays
+    mock_df.__getitem__.side_effect = mock_columns(100)
 
     historical_data = {"BTC/USDT": mock_df}
 
@@ -61,11 +56,12 @@ def test_optimized_backtest_calls():
         mock_strategy.calculate_indicators.return_value = mock_df # Return same mock df
         mock_strategy.generate_signals.return_value = [] # No signals for now
         mock_strategy.name = "mock_strategy"
+        mock_strategy.supports_signal_arrays = False  # per-bar generate_signals path
 
         mock_create_strategy.return_value = mock_strategy
 
         # Run backtest
-        result = run_backtest_simulation(
+        run_backtest_simulation(
             config=config,
             strategy_name="ema_sma_crossover",
             strategy_params={"ema_period": 10, "sma_period": 20},
@@ -99,17 +95,7 @@ def test_progress_callback():
     mock_df = MagicMock()
     mock_df.__len__.return_value = 50
 
-    def mock_getitem(key):
-        if key == "close": return 100.0
-        if key == "timestamp":
-            ts = MagicMock()
-            ts.isoformat.return_value = "2023-01-01T00:00:00"
-            return ts
-        return 0.0
-
-    mock_row = MagicMock()
-    mock_row.__getitem__.side_effect = mock_getitem
-    mock_df.iloc.__getitem__.return_value = mock_row
+    mock_df.__getitem__.side_effect = mock_columns(50)
 
     historical_data = {"BTC/USDT": mock_df}
 
@@ -121,6 +107,7 @@ def test_progress_callback():
         mock_strategy = MagicMock()
         mock_strategy.calculate_indicators.return_value = mock_df
         mock_strategy.generate_signals.return_value = []
+        mock_strategy.supports_signal_arrays = False
         mock_create_strategy.return_value = mock_strategy
 
         run_backtest_simulation(
@@ -0,0 +1,134 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("apscheduler")
+
+from src.dashboard.app import create_app  # noqa: E402
+from src.data.database import Database  # noqa: E402
+from src.data.models import OrderSide, OrderType  # noqa: E402
+from src.trading.engine import TradingEngine  # noqa: E402
+from src.utils.config import Config  # noqa: E402
+from src.utils.logger import DashboardHandler  # noqa: E402
+from tests.trading.helpers import ReplayExchange, make_ohlcv  # noqa: E402
+
+CONFIG = {
+    "trading.pairs": ["BTC/USDT"],
+    "trading.default_timeframe": "1h",
+    "risk_management.max_position_pct": 0.3,
+}
+
+
+@pytest.fixture
+def dashboard(tmp_path):
+    # A real Config: change_strategy() edits its data
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "trading: {pairs: [BTC/USDT], default_timeframe: 1h}\n"
+        "risk_management: {max_position_pct: 0.3}\n"
+    )
+    db = Database(str(tmp_path / "trading.db"))
+    engine = TradingEngine(Config(str(path)), db)
+    engine._exchange = ReplayExchange(make_ohlcv(200, 6, 40000.0), cursor=150)
+    engine._running = True
+    engine._tick()
+    app = create_app(engine, DashboardHandler(), engine._config)
+    yield engine, db, app.test_client(), app.config["response_cache"]
+    engine.stop()
+
+
+def count_calls(obj, name):
+    calls = []
+    original = getattr(obj, name)
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    setattr(obj, name, counted)
+    return calls
+
+
+def test_unchanged_poll_is_304_without_recomputing(dashboard):
+    engine, db, http, cache = dashboard
+    pandas_work = count_calls(engine, "get_pair_data")
+    db_reads = count_calls(db._connections, "read")
+
+    first = http.get("/api/chart/BTC/USDT")
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert len(pandas_work) == 1
+
+    revalidated = http.get("/api/chart/BTC/USDT", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b""
+    cached = http.get("/api/chart/BTC/USDT")  # no ETag sent: the stored body
+    assert cached.get_data() == first.get_data()
+    assert len(pandas_work) == 1
+
+    http.get("/api/performance")
+    http.get("/api/trades?limit=50")
+    reads = len(db_reads)
+    for url in ("/api/performance", "/api/trades?limit=50"):
+        etag = http.get(url).headers["ETag"]
+        assert http.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert len(db_reads) == reads
+    assert cache.stats()["not_modified"] == 3
+
+
+def test_tick_and_fill_invalidate(dashboard):
+    engine, db, http, cache = dashboard
+    etag = http.get("/api/trades").headers["ETag"]
+    assert http.get("/api/trades").get_json() == []
+
+    engine.portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 0.01, 40000.0)
+    engine.portfolio.submit_order("BTC/USDT", OrderSide.SELL, OrderType.MARKET, 0.01, 41000.0)
+    after_fill = http.get("/api/trades", headers={"If-None-Match": etag})
+    assert after_fill.status_code == 200
+    assert [t["exit_price"] for t in after_fill.get_json()] == [41000.0]
+
+    etag = after_fill.headers["ETag"]
+    engine._tick()
+    assert http.get("/api/trades", headers={"If-None-Match": etag}).status_code == 200
+
+    chart = http.get("/api/chart/BTC/USDT").headers["ETag"]
+    engine.change_strategy("rsi")
+    response = http.get("/api/chart/BTC/USDT", headers={"If-None-Match": chart})
+    assert response.status_code == 200
+    assert "rsi" in response.get_json()["indicators"]
+
+
+def test_write_behind_fill_moves_the_version_once_written(tmp_path):
+    db = Database(str(tmp_path / "trading.db"))
+    engine = TradingEngine(dict(CONFIG, **{"database.write_behind": True}), db)
+    http = create_app(engine, DashboardHandler(), engine._config).test_client()
+    try:
+        etag = http.get("/api/orders").headers["ETag"]
+        engine.portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 0.01, 40000.0)
+        # Queued, not written: still the same state for the dashboard
+        assert http.get("/api/orders", headers={"If-None-Match": etag}).status_code == 304
+
+        engine.portfolio._ledger.flush()
+        response = http.get("/api/orders", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert [o["status"] for o in response.get_json()] == ["filled"]
+    finally:
+        engine.stop()
+
+
+def test_etags_do_not_survive_a_restart(dashboard):
+    engine, db, http, cache = dashboard
+    etag = http.get("/api/performance").headers["ETag"]
+    restarted = create_app(engine, DashboardHandler(), engine._config).test_client()
+    response = restarted.get("/api/performance", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_cache_can_be_disabled(tmp_path):
+    engine = TradingEngine(dict(CONFIG, **{"dashboard.response_cache_size": 0}),
+                           Database(str(tmp_path / "trading.db")))
+    http = create_app(engine, DashboardHandler(), engine._config).test_client()
+    try:
+        response = http.get("/api/trades")
+        assert response.status_code == 200 and not response.headers.get("ETag")
+    finally:
+        engine.stop()
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("apscheduler")
+
+from src.data.database import Database
+from src.data.models import OrderSide, OrderType
+from src.trading import engine as engine_module
+from src.trading.engine import TradingEngine, next_candle_close
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+BOUNDARY = datetime(2024, 1, 1, 12, 15, tzinfo=timezone.utc).timestamp()
+
+
+def _engine(tmp_path, **config):
+    config = {"trading.pairs": ["BTC/USDT"], "trading.default_timeframe": "15m", **config}
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    engine._exchange = ReplayExchange(make_ohlcv(200, 6, 40000.0), cursor=150)
+    return engine
+
+
+@pytest.mark.parametrize("now, expected", [
+    (BOUNDARY - 60, BOUNDARY + 5),        # before the close
+    (BOUNDARY + 2, BOUNDARY + 5),         # closed, still settling
+    (BOUNDARY + 5, BOUNDARY + 900 + 5),   # exactly at the settled close
+    (BOUNDARY + 300, BOUNDARY + 900 + 5),
+])
+def test_next_candle_close(now, expected):
+    assert next_candle_close(900, 5, now).timestamp() == expected
+
+
+def test_candle_close_mode_schedules_strategy_and_price_jobs(tmp_path):
+    engine = _engine(tmp_path, **{
+        "scheduler.mode": "candle_close",
+        "scheduler.settle_seconds": 3,
+        "scheduler.price_interval_seconds": 20,
+    })
+    engine.start()
+    try:
+        jobs = {job.id: job for job in engine._scheduler.get_jobs()}
+        tick, price = jobs["trading_tick"], jobs["price_tick"]
+        assert tick.trigger.interval.total_seconds() == 900
+        assert tick.next_run_time.timestamp() % 900 == 3
+        assert price.trigger.interval.total_seconds() == 20
+    finally:
+        engine.stop()
+
+
+def test_unknown_scheduler_mode(tmp_path):
+    engine = _engine(tmp_path, **{"scheduler.mode": "hourly"})
+    with pytest.raises(ValueError, match="Unknown scheduler mode"):
+        engine.start()
+    assert not engine.is_running
+    assert engine._exchange.calls == []
+
+
+def test_price_tick_triggers_stop_loss_without_candle_fetch(tmp_path):
+    engine = _engine(tmp_path)
+    exchange = engine._exchange
+    engine._running = True
+    engine._fetch_all_data()
+    price = engine.current_prices["BTC/USDT"]
+    engine.portfolio.submit_order(
+        symbol="BTC/USDT", side=OrderSide.BUY, order_type=OrderType.MARKET,
+        quantity=0.01, price=price, strategy_name="test",
+    )
+    engine.portfolio.set_exit_levels("BTC/USDT", price * 0.97, price * 1.06)
+    candle_requests = len(exchange.calls)
+    exchange.fetch_tickers = lambda symbols: {"BTC/USDT": {"last": price * 0.95}}
+
+    engine._price_tick()
+
+    assert engine.portfolio.get_position("BTC/USDT") is None
+    assert engine.current_prices["BTC/USDT"] == price * 0.95
+    assert len(exchange.calls) == candle_requests
+
+
+def test_price_fetch_waits_for_the_rate_limiter(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    requests = []
+
+    class RecordingLimiter:
+        def acquire(self, cost=1.0):
+            requests.append("acquire")
+
+    monkeypatch.setattr(engine_module, "limiter_for", lambda exchange: RecordingLimiter())
+    engine._exchange.fetch_tickers = lambda symbols: requests.append("tickers") or {}
+
+    engine._fetch_prices()
+
+    assert requests == ["acquire", "tickers"]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.data.models import OrderSide
+from src.trading import backtester
+from src.trading.backtester import _create_strategy, run_backtest_simulation
+from src.trading.strategy import BaseStrategy, RSIStrategy
+from tests.trading.helpers import make_ohlcv
+
+STRATEGIES = [
+    ("ema_sma_crossover", {"ema_period": 5, "sma_period": 12}),
+    ("rsi", {"period": 7, "overbought": 60, "oversold": 40}),
+    ("combined", {"ema_period": 5, "sma_period": 12, "rsi_period": 7,
+                  "rsi_overbought": 70, "rsi_oversold": 30}),
+]
+
+
+@pytest.mark.parametrize("strategy_name,params", STRATEGIES)
+def test_arrays_match_per_bar_signals(strategy_name, params):
+    strategy = _create_strategy(strategy_name, params)
+    df = strategy.calculate_indicators(make_ohlcv(600, 4))
+    data = {"BTC/USDT": df}
+
+    entry, exit_ = strategy.generate_signal_arrays(df)
+
+    assert entry.dtype == exit_.dtype == np.int8
+    assert len(entry) == len(exit_) == len(df)
+    flat, holding = {}, {"BTC/USDT": object()}
+    for i in range(len(df)):
+        assert bool(entry[i]) == _fired(strategy, data, i, flat, OrderSide.BUY)
+        assert bool(exit_[i]) == _fired(strategy, data, i, holding, OrderSide.SELL)
+    assert entry.sum() > 3 and exit_.sum() > 3
+    assert not (entry & exit_).any()
+
+
+def _fired(strategy, data, index, positions, side):
+    return [s.side for s in strategy.generate_signals(data, positions, index=index)] == [side]
+
+
+def test_subclasses_that_change_the_rules_fall_back_to_per_bar():
+    class CustomEvaluate(RSIStrategy):
+        def _evaluate(self, symbol, last, prev, has_position):
+            return None
+
+    class CustomBoth(CustomEvaluate):
+        def generate_signal_arrays(self, df):
+            zeros = np.zeros(len(df), dtype=np.int8)
+            return zeros, zeros
+
+    class PerBarOnly(BaseStrategy):
+        def generate_signals(self, data, current_positions, index=None):
+            return []
+
+    assert RSIStrategy({}).supports_signal_arrays
+    assert not CustomEvaluate({}).supports_signal_arrays
+    assert CustomBoth({}).supports_signal_arrays
+    assert not PerBarOnly("custom", {}).supports_signal_arrays
+    with pytest.raises(NotImplementedError):
+        PerBarOnly("custom", {}).generate_signal_arrays(make_ohlcv(10, 1))
+
+
+@pytest.mark.parametrize("strategy_name,params", STRATEGIES)
+def test_loop_engine_array_path_matches_per_bar_path(monkeypatch, strategy_name, params):
+    data = {
+        "BTC/USDT": make_ohlcv(1200, 1, 40000.0),
+        "ETH/USDT": make_ohlcv(1200, 2, 2500.0),
+    }
+    config = {"risk_management.max_position_pct": 0.4}
+
+    def run():
+        return run_backtest_simulation(
+            config, strategy_name, params, list(data), "1m", 1, 10000.0, 0.01, 0.015,
+            data, log_results=False, engine="loop",
+        )
+
+    fast = run()
+
+    def per_bar(name, strategy_params):
+        strategy = _create_strategy(name, strategy_params)
+
+        class PerBar(type(strategy)):
+            def generate_signals(self, *args, **kwargs):
+                return super().generate_signals(*args, **kwargs)
+
+        assert not PerBar(strategy_params).supports_signal_arrays
+        return PerBar(strategy_params)
+
+    monkeypatch.setattr(backtester, "_create_strategy", per_bar)
+    slow = run()
+
+    assert fast.total_trades == slow.total_trades > 5
+    assert fast.equity_curve == slow.equity_curve
+    assert [(t.symbol, t.entry_price, t.exit_price, t.pnl) for t in fast.trades] == \
+        [(t.symbol, t.entry_price, t.exit_price, t.pnl) for t in slow.trades]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data.database import Database, bucket_start
+from src.data.models import PortfolioSnapshot
+
+
+def snapshot(timestamp, value):
+    return PortfolioSnapshot(
+        id=None, timestamp=timestamp, cash_balance=1000.0, positions_value=value - 1000.0,
+        total_value=value, total_pnl=value - 10000.0, total_pnl_pct=(value / 10000.0 - 1) * 100,
+    )
+
+
+def three_hours_ago():
+    return bucket_start(datetime.now() - timedelta(hours=3), 3600)
+
+
+def test_bucket_start():
+    ts = datetime(2024, 5, 3, 13, 47, 29, 500)
+    assert bucket_start(ts, 900) == datetime(2024, 5, 3, 13, 45)
+    assert bucket_start(ts, 3600) == datetime(2024, 5, 3, 13, 0)
+    assert bucket_start(ts, 86400) == datetime(2024, 5, 3)
+
+
+def test_rollups_hold_ohlc_of_total_value():
+    db = Database(":memory:")
+    start = three_hours_ago()
+    values = [10000.0 + (i * 37) % 101 for i in range(120)]
+    for i, value in enumerate(values):
+        db.insert_snapshot(snapshot(start + timedelta(minutes=i), value))
+
+    quarters = db.get_snapshot_rollups("15m", hours=4)
+    assert len(quarters) == 8
+    for n, row in enumerate(quarters):
+        chunk = values[n * 15:(n + 1) * 15]
+        assert (row["open"], row["high"], row["low"], row["close"], row["samples"]) == (
+            chunk[0], max(chunk), min(chunk), chunk[-1], 15
+        )
+
+    hours = db.get_snapshot_rollups("1h", hours=4)
+    assert [(r["open"], r["close"], r["samples"]) for r in hours] == [
+        (values[0], values[59], 60), (values[60], values[119], 60),
+    ]
+    # Snapshot view of a tier: bucket start valued at the close
+    curve = db.get_snapshots(hours=4, max_points=8)
+    assert [s.total_value for s in curve] == [r["close"] for r in quarters]
+    assert curve[1].timestamp == start + timedelta(minutes=15)
+
+
+@pytest.mark.parametrize("hours, max_points, tier", [
+    (24, None, "raw"),
+    (24 * 7, 500, "15m"),
+    (24 * 7, 100, "1h"),
+    (24 * 30, 100, "1h"),
+    (24 * 365, 100, "1d"),
+    (24 * 365, 5000, "1h"),     # 15m no longer covers a year
+    (24 * 365 * 5, 100, "1d"),  # only 1d is kept that long
+])
+def test_tier_selection(hours, max_points, tier):
+    assert Database(":memory:").snapshot_tier(hours, max_points) == tier
+
+
+def test_retention_prunes_old_rows():
+    db = Database(":memory:", snapshot_retention_days={"raw": 1, "15m": 2})
+    start = bucket_start(datetime.now() - timedelta(days=5), 3600)
+    for day in range(6):
+        for minute in range(0, 60, 20):
+            db.insert_snapshot(snapshot(start + timedelta(days=day, minutes=minute), 10000.0 + day))
+
+    with db._connections.read() as conn:
+        raw = conn.execute("SELECT MIN(timestamp) FROM portfolio_snapshots").fetchone()[0]
+        counts = dict(conn.execute(
+            "SELECT tier, COUNT(*) FROM snapshot_rollups GROUP BY tier"
+        ).fetchall())
+    assert datetime.fromisoformat(raw) >= start + timedelta(days=4)
+    assert counts["15m"] <= 3 * 3  # the last 2 days plus the bucket on the cutoff
+    assert counts["1h"] == 6
+    assert counts["1d"] == 6
+
+
+def test_existing_snapshots_are_backfilled(tmp_path):
+    path = str(tmp_path / "trading.db")
+    db = Database(path)
+    start = three_hours_ago()
+    for i in range(30):
+        db.insert_snapshot(snapshot(start + timedelta(minutes=i), 10000.0 + i))
+    with db._connections.write() as conn:
+        conn.execute("DELETE FROM snapshot_rollups")  # a database from before rollups
+    db.close()
+
+    reopened = Database(path)
+    rows = reopened.get_snapshot_rollups("15m", hours=4)
+    assert [(r["open"], r["close"]) for r in rows] == [(10000.0, 10014.0), (10015.0, 10029.0)]
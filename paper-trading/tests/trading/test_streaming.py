@@ -0,0 +1,111 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("ta")
+
+from ta.momentum import RSIIndicator
+from ta.trend import EMAIndicator, SMAIndicator
+
+from src.data.database import Database
+from src.trading.engine import TradingEngine
+from src.trading.strategy import (
+    CombinedStrategy, EMASMACrossoverStrategy, RSIStrategy,
+)
+from src.trading.streaming import (
+    StreamingEMA, StreamingRSI, StreamingSMA, WilderSmoothing,
+)
+from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+TOLERANCE = 1e-9
+
+
+def _stream(indicator, closes):
+    return np.array([indicator.update(float(c)) for c in closes])
+
+
+def _assert_matches(streamed, batch):
+    batch = np.asarray(batch, dtype=float)
+    assert np.array_equal(np.isnan(streamed), np.isnan(batch))
+    valid = ~np.isnan(batch)
+    assert np.max(np.abs(streamed[valid] - batch[valid])) < TOLERANCE
+
+
+@pytest.mark.parametrize("window", [2, 10, 50])
+def test_streaming_values_match_ta(window):
+    close = make_ohlcv(2000, 5, 40000.0)["close"]
+
+    _assert_matches(_stream(StreamingEMA(window), close),
+                    EMAIndicator(close, window=window).ema_indicator())
+    _assert_matches(_stream(StreamingSMA(window), close),
+                    SMAIndicator(close, window=window).sma_indicator())
+    _assert_matches(_stream(StreamingRSI(window), close),
+                    RSIIndicator(close, window=window).rsi())
+    _assert_matches(_stream(WilderSmoothing(window), close),
+                    close.ewm(alpha=1 / window, adjust=False, min_periods=window).mean())
+
+
+def test_streaming_rsi_flat_prices():
+    values = _stream(StreamingRSI(3), [100.0] * 5)
+    assert np.isnan(values[:2]).all()
+    assert (values[2:] == 100.0).all()
+
+
+@pytest.mark.parametrize("strategy", [
+    EMASMACrossoverStrategy({"ema_period": 5, "sma_period": 12}),
+    RSIStrategy({"period": 7, "overbought": 60, "oversold": 40}),
+    CombinedStrategy({"ema_period": 5, "sma_period": 12, "rsi_period": 7,
+                      "rsi_overbought": 80, "rsi_oversold": 20}),
+])
+@pytest.mark.parametrize("held", [False, True])
+def test_on_candle_signals_match_batch(strategy, held):
+    symbol = "BTC/USDT"
+    df = make_ohlcv(1500, 9, 40000.0)
+    data = {symbol: strategy.calculate_indicators(df, symbol)}
+    positions = {symbol: object() if held else None}
+    strategy.reset_stream()
+
+    batch, streamed = [], []
+    for i in range(1, len(df)):
+        # Candle i - 1 has just closed; batch evaluates rows i-1 and i-2
+        batch.append(strategy.generate_signals(data, positions, index=i))
+        streamed.append(strategy.on_candle(symbol, df["close"].iloc[i - 1], positions))
+
+    def describe(signals):
+        return [[(s.side, s.reason) for s in bar] for bar in signals]
+
+    assert describe(streamed) == describe(batch)
+    assert any(streamed)
+
+
+def test_engine_feeds_each_closed_candle_once(tmp_path):
+    config = {
+        "trading.pairs": ["BTC/USDT"],
+        "trading.default_timeframe": "1h",
+        "strategy.active": "ema_sma_crossover",
+        "strategy.ema_sma_crossover": {"ema_period": 5, "sma_period": 12},
+    }
+    engine = TradingEngine(config, Database(str(tmp_path / "trading.db")))
+    history = make_ohlcv(400, 3, 40000.0)
+    engine._exchange = ReplayExchange(history, cursor=99)
+    strategy = engine.strategy
+    fed = []
+    update_stream = strategy.update_stream
+    strategy.update_stream = lambda symbol, closes: (
+        fed.extend(closes), update_stream(symbol, closes)
+    )
+
+    for cursor in range(99, 400):
+        engine._exchange.cursor = cursor
+        engine._fetch_all_data()
+        engine._stream_signals({"BTC/USDT": None})
+        if cursor % 50 == 0:
+            engine._stream_signals({"BTC/USDT": None})  # repeat tick, no new candle
+
+    # Candle 399 is still forming
+    assert fed == list(history["close"].iloc[:399])
+
+    # A gap longer than the buffer reseeds from the buffer
+    fed.clear()
+    engine._streamed_until["BTC/USDT"] = 0.0
+    engine._stream_signals({"BTC/USDT": None})
+    assert fed == list(history["close"].iloc[300:399])
@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.trading.sweep import expand_param_ranges, resolve_workers, run_sweep
+from tests.trading.helpers import make_ohlcv
+
+CONFIG = {
+    "trading.fee_rate": 0.001,
+    "backtesting.engine": "vectorized",
+}
+
+
+def test_expand_param_ranges():
+    combos = expand_param_ranges({
+        "ema_period": {"min": 5, "max": 7, "step": 1},
+        "stop_loss_pct": {"min": 0.01, "max": 0.02, "step": 0.01},
+    })
+    assert combos == [
+        {"ema_period": 5, "stop_loss_pct": 0.01},
+        {"ema_period": 5, "stop_loss_pct": 0.02},
+        {"ema_period": 6, "stop_loss_pct": 0.01},
+        {"ema_period": 6, "stop_loss_pct": 0.02},
+        {"ema_period": 7, "stop_loss_pct": 0.01},
+        {"ema_period": 7, "stop_loss_pct": 0.02},
+    ]
+
+
+def test_resolve_workers_caps_at_combinations():
+    assert resolve_workers({"backtesting.sweep_workers": 8}, 3) == 3
+    assert resolve_workers({"backtesting.sweep_workers": 2}, 10) == 2
+    assert resolve_workers({}, 1) == 1
+
+
+def test_parallel_sweep_matches_serial():
+    historical_data = {
+        "BTC/USDT": make_ohlcv(800, 1, 40000.0),
+        "ETH/USDT": make_ohlcv(800, 2, 2500.0),
+    }
+    combinations = expand_param_ranges({
+        "ema_period": {"min": 5, "max": 8, "step": 1},
+        "take_profit_pct": {"min": 0.01, "max": 0.03, "step": 0.01},
+    })
+    kwargs = dict(
+        config=CONFIG,
+        strategy_name="ema_sma_crossover",
+        symbols=list(historical_data),
+        timeframe="1m",
+        days=1,
+        initial_balance=10000.0,
+        stop_loss_pct=0.01,
+        take_profit_pct=None,
+        base_params={"sma_period": 15},
+        combinations=combinations,
+        historical_data=historical_data,
+    )
+    progress = []
+
+    serial, serial_cache = run_sweep(workers=1, **kwargs)
+    parallel, parallel_cache = run_sweep(workers=2, progress_callback=progress.append, **kwargs)
+
+    assert len(serial) == len(combinations)
+    assert parallel == serial
+    assert progress[-1] == 100
+    # 4 EMA periods + 1 SMA per symbol are computed at most once per process
+    lookups = len(combinations) * 2 * 2
+    assert serial_cache["hits"] + serial_cache["misses"] == lookups
+    assert parallel_cache["hits"] + parallel_cache["misses"] == lookups
+    assert parallel_cache["hits"] > 0
@@ -0,0 +1,84 @@
+import ccxt
+import numpy as np
+import pytest
+
+from src.data.synthetic import BLOCK_SIZE, CACHED_BLOCKS, SyntheticExchange, make_pairs
+
+NOW_MS = 1_700_000_000_000
+MINUTE_MS = 60_000
+
+
+def make_exchange(**kwargs):
+    kwargs.setdefault("history", 1000)
+    return SyntheticExchange(make_pairs(3), now_ms=NOW_MS, **kwargs)
+
+
+def test_walks_are_deterministic_per_seed_and_pair():
+    a, b = make_exchange(), make_exchange()
+    assert a.fetch_ohlcv("SYN001/USDT", "1m") == b.fetch_ohlcv("SYN001/USDT", "1m")
+    assert a.fetch_ohlcv("SYN001/USDT", "1m") != a.fetch_ohlcv("SYN002/USDT", "1m")
+    assert a.fetch_ohlcv("SYN001/USDT", "1m") != make_exchange(seed=1).fetch_ohlcv(
+        "SYN001/USDT", "1m")
+
+
+def test_any_window_matches_the_full_history():
+    exchange = make_exchange()
+    start = exchange.head_timestamp - 1000 * MINUTE_MS
+    full = np.array(exchange.fetch_ohlcv("SYN000/USDT", "1m", since=start, limit=2000))
+    assert len(full) == 1001 and full[-1][0] == exchange.head_timestamp
+    assert np.all(np.diff(full[:, 0]) == MINUTE_MS)
+
+    # Pages crossing block boundaries, and the since=None tail, agree with it
+    pages = [exchange.fetch_ohlcv("SYN000/USDT", "1m", since=start + i * 100 * MINUTE_MS,
+                                  limit=100) for i in range(11)]
+    assert np.array_equal(np.concatenate(pages), full)
+    assert np.array_equal(exchange.fetch_ohlcv("SYN000/USDT", "1m", limit=300), full[-300:])
+
+    _, open_, high, low, close, volume = full.T
+    assert np.allclose(open_[1:], close[:-1])  # continuous across blocks
+    assert np.all(high >= np.maximum(open_, close)) and np.all(low <= np.minimum(open_, close))
+    assert np.all(volume > 0)
+    assert all(len(blocks) <= CACHED_BLOCKS for blocks in exchange._blocks.values())
+
+
+def test_advance_closes_one_candle():
+    exchange = make_exchange(history=BLOCK_SIZE - 1)  # the next candle starts a block
+    forming = exchange.head_timestamp
+    assert [c[0] for c in exchange.fetch_ohlcv("SYN000/USDT", "1m", since=forming)] == [forming]
+
+    exchange.advance()
+    candles = exchange.fetch_ohlcv("SYN000/USDT", "1m", since=forming)
+    assert [c[0] for c in candles] == [forming, forming + MINUTE_MS]
+    ticker = exchange.fetch_tickers(["SYN000/USDT"])["SYN000/USDT"]
+    assert ticker["last"] == candles[-1][4]
+    assert exchange.fetch_ohlcv("SYN000/USDT", "1m", since=forming + 2 * MINUTE_MS) == []
+
+
+def test_unknown_markets_raise_ccxt_errors():
+    exchange = make_exchange()
+    with pytest.raises(ccxt.BadSymbol):
+        exchange.fetch_ohlcv("BTC/USDT", "1m")
+    with pytest.raises(ccxt.BadRequest):
+        exchange.fetch_ohlcv("SYN000/USDT", "1h")
+
+
+def test_backtester_downloads_from_it():
+    from src.trading.backtester import Backtester
+
+    exchange = SyntheticExchange(["SYN000/USDT"], history=3 * 1440)
+    backtester = Backtester({"backtesting.candle_cache_dir": ""}, exchange)
+    data = backtester.fetch_historical_data(["SYN000/USDT"], "1m", 1)
+    assert 1439 <= len(data["SYN000/USDT"]) <= 1441
+
+
+def test_load_test_drives_the_engine():
+    pytest.importorskip("apscheduler")
+    from src.trading.loadtest import run_load_test
+
+    result = run_load_test(pairs=20, ticks=30)
+    assert (result["pairs"], result["ticks"]) == (20, 30)
+    assert result["exchange_requests"] == 20 * 30  # one request per pair per tick
+    assert result["ticks_per_sec"] > 0
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+    assert {"fetch", "generate_signals", "execute", "snapshot"} <= set(result["phases_ms"])
+    assert run_load_test(pairs=20, ticks=30)["open_positions"] == result["open_positions"]
@@ -0,0 +1,80 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.trading.backtester import run_backtest_simulation
+from tests.trading.helpers import make_ohlcv
+
+
+CONFIG = {
+    "trading.fee_rate": 0.001,
+    "risk_management.max_position_pct": 0.4,
+    "risk_management.max_open_positions": 2,
+}
+
+STRATEGIES = [
+    ("ema_sma_crossover", {"ema_period": 5, "sma_period": 12}),
+    ("rsi", {"period": 7, "overbought": 60, "oversold": 40}),
+    ("combined", {"ema_period": 5, "sma_period": 12, "rsi_period": 7,
+                  "rsi_overbought": 70, "rsi_oversold": 30}),
+]
+
+
+def run(engine, strategy_name, params, data, sl=0.01, tp=0.015):
+    return run_backtest_simulation(
+        config=CONFIG,
+        strategy_name=strategy_name,
+        strategy_params=params,
+        symbols=list(data),
+        timeframe="1m",
+        days=1,
+        initial_balance=10000.0,
+        stop_loss_pct=sl,
+        take_profit_pct=tp,
+        historical_data=data,
+        log_results=False,
+        engine=engine,
+    )
+
+
+@pytest.fixture(scope="module")
+def historical_data():
+    return {
+        "BTC/USDT": make_ohlcv(1500, 1, 40000.0),
+        "ETH/USDT": make_ohlcv(1500, 2, 2500.0),
+        "SOL/USDT": make_ohlcv(1500, 3, 100.0),
+    }
+
+
+@pytest.mark.parametrize("strategy_name,params", STRATEGIES)
+@pytest.mark.parametrize("sl,tp", [(0.01, 0.015), (0.5, 0.5)])
+def test_vectorized_matches_loop(historical_data, strategy_name, params, sl, tp):
+    loop = run("loop", strategy_name, params, historical_data, sl, tp)
+    fast = run("vectorized", strategy_name, params, historical_data, sl, tp)
+
+    assert loop.total_trades > 5
+    assert fast.equity_curve == loop.equity_curve
+    assert fast.total_trades == loop.total_trades
+    assert fast.win_rate == loop.win_rate
+    assert fast.max_drawdown_pct == loop.max_drawdown_pct
+    assert fast.total_return_pct == loop.total_return_pct
+
+    def key(t):
+        return (t.symbol, t.side, t.entry_price, t.exit_price, t.quantity,
+                t.pnl, t.pnl_pct, t.fees, t.strategy_name)
+
+    assert [key(t) for t in fast.trades] == [key(t) for t in loop.trades]
+
+
+def test_vectorized_trade_times_use_bar_timestamps(historical_data):
+    result = run("vectorized", *STRATEGIES[0], historical_data)
+    trade = result.trades[-1]
+    timestamps = set(historical_data[trade.symbol]["timestamp"])
+    assert trade.entry_time in timestamps
+    assert trade.exit_time in timestamps
+    assert trade.duration_minutes == int((trade.exit_time - trade.entry_time).total_seconds() / 60)
+
+
+def test_unknown_engine_rejected(historical_data):
+    with pytest.raises(ValueError):
+        run("gpu", *STRATEGIES[0], historical_data)
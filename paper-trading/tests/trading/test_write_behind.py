@@ -0,0 +1,212 @@
+import pytest
+
+from src.data.database import Database
+from src.data.ledger import DatabaseLedger, InMemoryLedger, LedgerWriteError, WriteBehindLedger
+from src.data.models import OrderSide, OrderType, PositionStatus
+from src.trading.portfolio import Portfolio
+
+CONFIG = {"risk_management.max_position_pct": 0.3}
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+
+
+def tick(portfolio, i):
+    """One tick's worth of portfolio activity, committed at the end."""
+    prices = {s: 100.0 + (i * 3 + n) % 11 for n, s in enumerate(SYMBOLS)}
+    portfolio.update_positions(prices)
+    for symbol in SYMBOLS:
+        price = prices[symbol]
+        if portfolio.get_position(symbol) is None:
+            qty = portfolio.calculate_position_size(symbol, OrderSide.BUY, price)
+            portfolio.submit_order(symbol, OrderSide.BUY, OrderType.MARKET, qty, price,
+                                   strategy_name="test")
+            portfolio.set_exit_levels(symbol, price * 0.95, price * 1.04)
+        elif i % 4 == 0:
+            qty = portfolio.get_position(symbol).quantity
+            portfolio.submit_order(symbol, OrderSide.SELL, OrderType.MARKET, qty, price,
+                                   strategy_name="test")
+    portfolio.take_snapshot(prices)
+    portfolio.commit()
+
+
+def state(portfolio):
+    positions = sorted(
+        (p.id, p.symbol, p.quantity, p.entry_price, p.stop_loss_price, p.take_profit_price)
+        for p in portfolio.get_all_positions()
+    )
+    return positions, round(portfolio.get_cash_balance(), 9)
+
+
+def records(db):
+    return (
+        [(t.id, t.symbol, t.pnl) for t in db.get_trade_records(limit=-1)],
+        [(o.id, o.status) for o in db.get_orders(limit=-1)],
+        len(db.get_snapshots(hours=1)),
+    )
+
+
+def test_write_behind_matches_synchronous_ledger(tmp_path):
+    sync_db = Database(str(tmp_path / "sync.db"))
+    behind_db = Database(str(tmp_path / "behind.db"))
+    sync = Portfolio(10000.0, 0.001, config=CONFIG, ledger=DatabaseLedger(sync_db))
+    behind = Portfolio(10000.0, 0.001, config=CONFIG, ledger=WriteBehindLedger(behind_db))
+
+    for i in range(30):
+        tick(sync, i)
+        tick(behind, i)
+    behind.close()
+
+    assert state(behind) == state(sync)
+    assert records(behind_db) == records(sync_db)
+
+
+def test_writes_reach_disk_only_at_commit(tmp_path):
+    db = Database(str(tmp_path / "trading.db"))
+    ledger = WriteBehindLedger(db)
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    transactions = []
+    transaction = db.transaction
+    db.transaction = lambda: (transactions.append(1), transaction())[1]
+
+    portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, 100.0)
+    portfolio.set_exit_levels("BTC/USDT", 95.0, 110.0)
+    portfolio.take_snapshot({"BTC/USDT": 100.0})
+    ledger.flush()  # commit() + wait
+    assert len(transactions) == 1
+    assert db.get_open_positions()[0].stop_loss_price == 95.0
+
+    portfolio.update_positions({"BTC/USDT": 111.0})  # take-profit closes it
+    assert db.get_open_positions() != []  # not committed yet
+    ledger.close()
+    assert len(transactions) == 2
+    assert db.get_open_positions() == []
+    assert len(db.get_trade_records()) == 1
+
+
+def test_crash_recovery_restores_last_committed_tick(tmp_path):
+    path = str(tmp_path / "trading.db")
+    ledger = WriteBehindLedger(Database(path))
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    for i in range(13):
+        tick(portfolio, i)
+    ledger.flush()
+    committed_positions = state(portfolio)[0]
+
+    # Activity after the last commit is lost in the crash
+    portfolio.update_positions({s: 50.0 for s in SYMBOLS})  # stop-losses fire
+    assert portfolio.get_all_positions() == []
+
+    restored_db = Database(path)
+    restored = Portfolio(10000.0, 0.001, config=CONFIG, ledger=WriteBehindLedger(restored_db))
+    assert state(restored)[0] == committed_positions
+
+    # The restored ledger continues the id sequence: a collision would fail
+    # (and roll back) the whole batch
+    orders_before = len(restored_db.get_orders(limit=-1))
+    tick(restored, 13)
+    restored.close()
+    orders = {o.id: o for o in restored_db.get_orders(limit=-1)}
+    assert len(orders) > orders_before
+    assert state(restored)[0] == sorted(
+        (p.id, p.symbol, p.quantity, p.entry_price, p.stop_loss_price, p.take_profit_price)
+        for p in restored_db.get_open_positions()
+    )
+    for position in restored_db.get_open_positions():
+        assert position.status == PositionStatus.OPEN
+        assert orders[position.entry_order_id].status.value == "filled"
+
+
+def test_failed_batch_is_rolled_back_whole(tmp_path):
+    db = Database(str(tmp_path / "trading.db"))
+    ledger = WriteBehindLedger(db, retry_delay=0)
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, 100.0)
+
+    def fail():
+        raise RuntimeError("disk full")
+
+    ledger._queue(fail)
+    with pytest.raises(LedgerWriteError, match="disk full"):
+        ledger.flush()
+    assert db.get_orders() == []
+    assert db.get_open_positions() == []
+
+    # Later writes depend on the lost batch: they are refused, not written
+    portfolio.take_snapshot({"BTC/USDT": 100.0})
+    with pytest.raises(LedgerWriteError):
+        portfolio.commit()
+    ledger.close()
+    assert db.get_snapshots(hours=1) == []
+
+
+def test_synchronous_ledgers_report_no_error(tmp_path):
+    assert DatabaseLedger(Database(str(tmp_path / "trading.db"))).error is None
+    assert InMemoryLedger().error is None
+
+
+def test_failed_batch_is_retried(tmp_path):
+    db = Database(str(tmp_path / "trading.db"))
+    ledger = WriteBehindLedger(db, attempts=3, retry_delay=0)
+    portfolio = Portfolio(10000.0, 0.001, config=CONFIG, ledger=ledger)
+    portfolio.submit_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, 1.0, 100.0)
+    failures = []
+
+    def flaky():
+        if len(failures) < 2:
+            failures.append(1)
+            raise RuntimeError("database is locked")
+
+    ledger._queue(flaky)
+    ledger.close()
+    assert ledger.error is None
+    assert len(db.get_open_positions()) == 1
+
+
+def test_engine_stop_flushes(tmp_path):
+    pytest.importorskip("numpy")
+    pytest.importorskip("apscheduler")
+    from src.trading.engine import TradingEngine
+    from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+    db = Database(str(tmp_path / "trading.db"))
+    engine = TradingEngine({
+        "trading.pairs": ["BTC/USDT"],
+        "trading.default_timeframe": "1h",
+        "database.write_behind": True,
+    }, db)
+    assert isinstance(engine.portfolio._ledger, WriteBehindLedger)
+    engine._exchange = ReplayExchange(make_ohlcv(200, 6, 40000.0), cursor=150)
+
+    engine.start()
+    engine.portfolio.take_snapshot(engine.current_prices)  # after the last tick's commit
+    engine.stop()
+
+    assert len(db.get_snapshots(hours=1)) == 2
+
+
+def test_engine_halts_when_writes_fail(tmp_path):
+    pytest.importorskip("numpy")
+    pytest.importorskip("apscheduler")
+    from src.trading.engine import TradingEngine
+    from tests.trading.helpers import ReplayExchange, make_ohlcv
+
+    db = Database(str(tmp_path / "trading.db"))
+    engine = TradingEngine({
+        "trading.pairs": ["BTC/USDT"],
+        "trading.default_timeframe": "1h",
+        "database.write_behind": True,
+    }, db)
+    engine.portfolio._ledger._retry_delay = 0
+    engine._exchange = ReplayExchange(make_ohlcv(200, 6, 40000.0), cursor=150)
+    engine.start()
+
+    def fail(*args):
+        raise RuntimeError("disk full")
+
+    db.insert_snapshot = fail
+    engine._tick()  # its snapshot fails to write
+    engine.portfolio._ledger._batches.join()
+    engine._tick()  # commit() reports the failure
+
+    assert not engine.is_running
+    assert "disk full" in engine.ledger_error
+    engine.stop()